@@ -4,7 +4,7 @@ Provides modular, configurable components for API data ingestion with state mana
 """
 
 from .config_loader import ConfigLoader, ConfigurationError, EnvironmentError
-from .database_manager import DatabaseManager, DatabaseConnectionError
+from .database_manager import DatabaseManager, DatabaseConnectionError, ConnectionPool
 from .state_manager import StateManager, ProcessingState
 from .http_client import HTTPClient, PermanentAPIError, APIRequest, APIResponse
 from .payload_validator import PayloadValidator
@@ -21,6 +21,7 @@ __all__ = [
     'EnvironmentError',
     'DatabaseManager',
     'DatabaseConnectionError',
+    'ConnectionPool',
     'StateManager',
     'ProcessingState',
     'HTTPClient',
@@ -2,10 +2,14 @@
 DatabaseManager module for handling DuckDB database operations and connections
 """
 
+import atexit
 import duckdb
 import json
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import ClassVar, Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 
@@ -14,16 +18,118 @@ class DatabaseConnectionError(Exception):
     pass
 
 
+class ConnectionPool:
+    """
+    Keeps DuckDB connections to one database file open for reuse across DatabaseManager instances
+    
+    DuckDB takes an exclusive file lock for as long as any connection to a
+    file is open, so while a pool holds idle connections no other process
+    can open that database. The orchestrator keeps its pools for the whole
+    flow and releases them with close_all when the flow ends; readers such
+    as ad hoc queries against the state database must wait until then.
+    """
+    
+    # Idle connections kept open per database file
+    DEFAULT_CONNECTION_LIMIT = 4
+    
+    _pools: ClassVar[Dict[Path, 'ConnectionPool']] = {}
+    _pools_lock: ClassVar[threading.Lock] = threading.Lock()
+    
+    def __init__(self, db_path: Path, connection_limit: int = DEFAULT_CONNECTION_LIMIT):
+        self.db_path = db_path
+        self.schema_ready = False
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=connection_limit)
+    
+    @classmethod
+    def for_path(cls, db_path: Path) -> 'ConnectionPool':
+        """
+        Get the process-wide pool for a database file, creating it on first use
+        
+        Args:
+            db_path: Path to the database file
+            
+        Returns:
+            ConnectionPool shared by every caller using the same file
+        """
+        key = db_path.resolve()
+        with cls._pools_lock:
+            if key not in cls._pools:
+                cls._pools[key] = cls(db_path)
+            return cls._pools[key]
+    
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        Close every idle connection in every shared pool and forget the pools
+        """
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        
+        for pool in pools:
+            pool.close()
+    
+    def get_connection(self) -> duckdb.DuckDBPyConnection:
+        """
+        Take an idle connection, or open a new one if none is idle
+        
+        Returns:
+            DuckDB connection for exclusive use until it is released
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            # Ensure parent directory exists
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            return duckdb.connect(str(self.db_path))
+    
+    def release_connection(self, connection: duckdb.DuckDBPyConnection) -> None:
+        """
+        Return a connection to the pool, closing it if the pool is already full
+        
+        Args:
+            connection: Connection previously taken with get_connection
+        """
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+    
+    def close(self) -> None:
+        """
+        Close all idle connections, releasing the database file
+        """
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            
+            try:
+                connection.close()
+            except Exception:
+                pass  # Connection might already be closed
+        self.schema_ready = False
+
+
+# Checkpoint and release pooled database files when the interpreter exits
+atexit.register(ConnectionPool.close_all)
+
+
 class DatabaseManager:
     """Manages DuckDB database connections and operations with transaction support"""
     
-    def __init__(self):
+    def __init__(self, connection_pool: Optional[ConnectionPool] = None):
         self._connection: Optional[duckdb.DuckDBPyConnection] = None
+        self._connection_pool = connection_pool
     
     def create_connection(self, db_path: Path) -> duckdb.DuckDBPyConnection:
         """
         Create DuckDB database connection with proper error handling
         
+        With a connection pool the connection is taken from the pool, which
+        must be for the same database file, and close_connection returns it.
+        
         Args:
             db_path: Path to the database file
             
@@ -36,7 +142,14 @@ class DatabaseManager:
         if self._connection is not None:
             raise DatabaseConnectionError("Connection already exists. Close existing connection first.")
         
+        if self._connection_pool is not None and db_path.resolve() != self._connection_pool.db_path.resolve():
+            raise DatabaseConnectionError(f"Connection pool is for {self._connection_pool.db_path}, not {db_path}")
+        
         try:
+            if self._connection_pool is not None:
+                self._connection = self._connection_pool.get_connection()
+                return self._connection
+            
             # Ensure parent directory exists
             db_path.parent.mkdir(parents=True, exist_ok=True)
             
@@ -44,17 +157,20 @@ class DatabaseManager:
             self._connection = duckdb.connect(str(db_path))
             
             return self._connection
-            
+        
         except Exception as e:
             raise DatabaseConnectionError(f"Failed to create database connection: {e}")
     
     def close_connection(self) -> None:
         """
-        Close database connection and release resources
+        Close database connection and release resources, or return it to the connection pool
         """
         if self._connection:
             try:
-                self._connection.close()
+                if self._connection_pool is not None:
+                    self._connection_pool.release_connection(self._connection)
+                else:
+                    self._connection.close()
             except Exception:
                 pass  # Connection might already be closed
             finally:
@@ -64,12 +180,17 @@ class DatabaseManager:
         """
         Create all required database tables with proper DuckDB schema
         
+        Runs once per connection pool, since pooled connections share a database.
+        
         Raises:
             DatabaseConnectionError: If no active connection exists
         """
         if not self._connection:
             raise DatabaseConnectionError("No active database connection")
         
+        if self._connection_pool is not None and self._connection_pool.schema_ready:
+            return
+        
         # Create api_responses table
         api_responses_sql = """
         CREATE TABLE IF NOT EXISTS api_responses (
@@ -111,21 +232,48 @@ class DatabaseManager:
             total_results INTEGER,
             pages_processed INTEGER DEFAULT 0,
             completed BOOLEAN DEFAULT FALSE,
-            processed_items JSON DEFAULT '[]',
-            file_names JSON DEFAULT '[]',
-            file_hashes JSON DEFAULT '{}',
-            errors JSON DEFAULT '[]',
+            file_names VARCHAR[] DEFAULT [],
+            file_hashes MAP(VARCHAR, VARCHAR) DEFAULT MAP {},
             created_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             PRIMARY KEY (load_id, entity_id)
         )
         """
         
+        # Create processing_state_items table, one row per processed item so
+        # recording an item is an insert rather than a rewrite of a growing list
+        state_items_sql = """
+        CREATE TABLE IF NOT EXISTS processing_state_items (
+            load_id VARCHAR NOT NULL,
+            entity_id VARCHAR NOT NULL,
+            item VARCHAR NOT NULL,
+            seq BIGINT NOT NULL,
+            PRIMARY KEY (load_id, entity_id, item)
+        )
+        """
+        
+        # Create processing_state_errors table, one row per logged error so
+        # recording an error is an insert rather than a rewrite of a growing list
+        state_errors_sql = """
+        CREATE TABLE IF NOT EXISTS processing_state_errors (
+            load_id VARCHAR NOT NULL,
+            entity_id VARCHAR NOT NULL,
+            seq BIGINT NOT NULL,
+            error JSON NOT NULL,
+            PRIMARY KEY (load_id, entity_id, seq)
+        )
+        """
+        
         try:
             # Create tables
             self._connection.execute(api_responses_sql)
             self._connection.execute(manifests_sql)
             self._connection.execute(state_sql)
+            self._connection.execute(state_items_sql)
+            self._connection.execute("CREATE SEQUENCE IF NOT EXISTS processing_state_items_seq")
+            self._connection.execute(state_errors_sql)
+            self._connection.execute("CREATE SEQUENCE IF NOT EXISTS processing_state_errors_seq")
+            self._migrate_state_columns()
             
             # Create indexes for performance
             self._connection.execute(
@@ -140,10 +288,110 @@ class DatabaseManager:
             self._connection.execute(
                 "CREATE INDEX IF NOT EXISTS idx_state_data_source ON processing_state (data_source)"
             )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_state_entity ON processing_state (entity_id)"
+            )
+            
+            # DuckDB never scans a multi-column index, so the earlier (load_id, entity_id) one only slowed inserts
+            self._connection.execute("DROP INDEX IF EXISTS idx_state_items_entity")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_state_items_entity_id ON processing_state_items (entity_id)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_state_errors_entity_id ON processing_state_errors (entity_id)"
+            )
             
+            if self._connection_pool is not None:
+                self._connection_pool.schema_ready = True
+        
         except Exception as e:
             raise DatabaseConnectionError(f"Failed to create tables: {e}")
     
+    def _migrate_state_columns(self) -> None:
+        """
+        Bring processing_state columns from earlier schemas up to date
+        
+        Databases created before the native types were adopted store list and
+        map columns as JSON text, and older ones keep processed items and errors
+        in list columns rather than processing_state_items and
+        processing_state_errors. DuckDB refuses to alter a table while indexes
+        depend on it, so the state indexes are dropped here and recreated by
+        create_tables.
+        """
+        column_types = dict(self._connection.execute(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'processing_state'"
+        ).fetchall())
+        
+        native_types = {
+            'file_names': 'VARCHAR[]',
+            'file_hashes': 'MAP(VARCHAR, VARCHAR)'
+        }
+        legacy_columns = [column for column in native_types if column_types.get(column) == 'JSON']
+        has_item_column = 'processed_items' in column_types
+        has_error_column = 'errors' in column_types
+        if not legacy_columns and not has_item_column and not has_error_column:
+            return
+        
+        self._connection.execute("DROP INDEX IF EXISTS idx_state_completed")
+        self._connection.execute("DROP INDEX IF EXISTS idx_state_data_source")
+        self._connection.execute("DROP INDEX IF EXISTS idx_state_entity")
+        
+        if has_item_column:
+            # Works for both JSON and VARCHAR[] columns, keeping each list in order
+            self._connection.execute("""
+            INSERT INTO processing_state_items (load_id, entity_id, item, seq)
+            SELECT load_id, entity_id, item, nextval('processing_state_items_seq')
+            FROM (
+                SELECT load_id, entity_id, unnest(CAST(processed_items AS VARCHAR[])) AS item
+                FROM processing_state
+            )
+            ON CONFLICT DO NOTHING
+            """)
+            self._connection.execute("ALTER TABLE processing_state DROP COLUMN processed_items")
+        
+        if has_error_column:
+            # Keeps each entity's errors in their logged order
+            self._connection.execute("""
+            INSERT INTO processing_state_errors (load_id, entity_id, seq, error)
+            SELECT load_id, entity_id, nextval('processing_state_errors_seq'), error
+            FROM (
+                SELECT load_id, entity_id, unnest(CAST(errors AS JSON[])) AS error
+                FROM processing_state
+            )
+            """)
+            self._connection.execute("ALTER TABLE processing_state DROP COLUMN errors")
+        
+        for column in legacy_columns:
+            native_type = native_types[column]
+            self._connection.execute(
+                f"ALTER TABLE processing_state ALTER COLUMN {column} TYPE {native_type} "
+                f"USING CAST({column} AS {native_type})"
+            )
+    
+    @contextmanager
+    def transaction(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """
+        Run the enclosed statements in one transaction with automatic rollback on failure
+        
+        Yields:
+            The active DuckDB connection
+            
+        Raises:
+            DatabaseConnectionError: If no active connection
+            Exception: If any statement fails
+        """
+        if not self._connection:
+            raise DatabaseConnectionError("No active database connection")
+        
+        try:
+            self._connection.begin()
+            yield self._connection
+            self._connection.commit()
+        
+        except Exception as e:
+            self._connection.rollback()
+            raise e
+    
     def execute_with_transaction(self, query: str, params: Tuple = ()) -> Any:
         """
         Execute query within a transaction with automatic rollback on failure
@@ -159,18 +407,23 @@ class DatabaseManager:
             DatabaseConnectionError: If no active connection
             Exception: If query execution fails
         """
-        if not self._connection:
-            raise DatabaseConnectionError("No active database connection")
+        with self.transaction() as connection:
+            return connection.execute(query, params)
+    
+    def execute_many_with_transaction(self, query: str, params_list: List[Tuple]) -> None:
+        """
+        Execute a parameterised query once per parameter set within a single transaction
         
-        try:
-            self._connection.begin()
-            result = self._connection.execute(query, params)
-            self._connection.commit()
-            return result
+        Args:
+            query: SQL query to execute
+            params_list: Parameter tuples, one per row
             
-        except Exception as e:
-            self._connection.rollback()
-            raise e
+        Raises:
+            DatabaseConnectionError: If no active connection
+            Exception: If query execution fails
+        """
+        with self.transaction() as connection:
+            connection.executemany(query, params_list)
     
     def upsert_api_response(self, response_data: Dict[str, Any]) -> None:
         """
@@ -295,6 +548,6 @@ class DatabaseManager:
             
             # All records should have valid data
             return valid_count == count
-            
+        
         except Exception:
             return False
\ No newline at end of file
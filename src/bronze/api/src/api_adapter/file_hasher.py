@@ -3,21 +3,46 @@ FileHasher module for content deduplication
 """
 import hashlib
 import json
+import os
 from typing import Dict, Any
 
 
 class FileHasher:
     """Utility class for generating consistent file hashes for deduplication"""
     
+    # Environment variable selecting the hashlib algorithm used for content hashes
+    HASH_ALGORITHM_ENV_VAR = 'DEDUP_HASH'
+    
+    # MD5 remains the default for compatibility with hashes already recorded in state
+    DEFAULT_HASH_ALGORITHM = 'md5'
+    
     @staticmethod
     def generate_content_hash(data: Dict[str, Any]) -> str:
-        """Generate MD5 hash of content for deduplication"""
+        """
+        Generate hash of content for deduplication
+        
+        The algorithm is read from the DEDUP_HASH environment variable and
+        dispatched through hashlib.new, so OpenSSL's hardware-accelerated
+        implementations (e.g. SHA-NI for 'sha256') are used where available.
+        """
+        algorithm = os.environ.get(FileHasher.HASH_ALGORITHM_ENV_VAR, FileHasher.DEFAULT_HASH_ALGORITHM)
         content_str = json.dumps(data, sort_keys=True)
-        return hashlib.md5(content_str.encode('utf-8')).hexdigest()
+        return hashlib.new(algorithm, content_str.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def generate_bytes_hash(content: bytes) -> str:
+        """
+        Generate hash of raw serialised content with the configured algorithm
+        
+        Matches generate_content_hash for content already in canonical
+        (sort_keys) JSON form, without parsing it first.
+        """
+        algorithm = os.environ.get(FileHasher.HASH_ALGORITHM_ENV_VAR, FileHasher.DEFAULT_HASH_ALGORITHM)
+        return hashlib.new(algorithm, content).hexdigest()
     
     @staticmethod
     def compare_file_hashes(hash1: str, hash2: str) -> bool:
         """Compare two file hashes for equality"""
         if hash1 is None or hash2 is None:
             return False
-        return hash1 == hash2
\ No newline at end of file
+        return hash1 == hash2
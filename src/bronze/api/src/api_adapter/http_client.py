@@ -14,7 +14,7 @@ class PermanentAPIError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class APIRequest:
     """Represents a single API request"""
     url: str
@@ -23,7 +23,7 @@ class APIRequest:
     method: str = "GET"
 
 
-@dataclass  
+@dataclass(slots=True, frozen=True)
 class APIResponse:
     """Standardised API response wrapper"""
     raw_data: Dict[str, Any]
@@ -3,6 +3,7 @@ PaginationStrategy module for handling different API pagination patterns
 """
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict, Any, Optional, Protocol
 from dataclasses import dataclass
 
@@ -35,6 +36,8 @@ class OffsetLimitPagination:
         self.start_param = config['start_param']
         self.count_param = config.get('count_param', 'count')
         self.total_results_path = config.get('total_results_path', '')
+        # Split the dotted path once rather than on every response
+        self._total_path_keys = tuple(self.total_results_path.split('.'))
     
     def get_next_page_params(self, current_params: Dict[str, Any], 
                            response: Optional[APIResponse], page_num: int) -> Optional[Dict[str, Any]]:
@@ -56,14 +59,10 @@ class OffsetLimitPagination:
         """Extract total results from response using configured path"""
         try:
             data = response.raw_data
-            path_parts = self.total_results_path.split('.')
             
-            for part in path_parts:
-                if ':' in part:
-                    # Handle namespaced keys like 'opensearch:totalResults'
-                    data = data[part]
-                else:
-                    data = data[part]
+            # Namespaced keys like 'opensearch:totalResults' are plain dict keys
+            for key in self._total_path_keys:
+                data = data[key]
             
             return int(data)
         except (KeyError, ValueError, TypeError):
@@ -78,6 +77,7 @@ class PageBasedPagination:
         self.page_param = config['page_param']
         self.size_param = config.get('size_param', 'size')
         self.total_results_path = config.get('total_results_path', '')
+        self._total_path_keys = tuple(self.total_results_path.split('.'))
     
     def get_next_page_params(self, current_params: Dict[str, Any], 
                            response: Optional[APIResponse], page_num: int) -> Optional[Dict[str, Any]]:
@@ -100,10 +100,9 @@ class PageBasedPagination:
         """Extract total results from response"""
         try:
             data = response.raw_data
-            path_parts = self.total_results_path.split('.')
             
-            for part in path_parts:
-                data = data[part]
+            for key in self._total_path_keys:
+                data = data[key]
             
             return int(data)
         except (KeyError, ValueError, TypeError):
@@ -118,6 +117,7 @@ class CursorBasedPagination:
         self.cursor_param = config['cursor_param']
         self.limit_param = config.get('limit_param', 'limit')
         self.next_cursor_path = config.get('next_cursor_path', '')
+        self._cursor_path_keys = tuple(self.next_cursor_path.split('.'))
         self.current_cursor = None
     
     def get_next_page_params(self, current_params: Dict[str, Any], 
@@ -137,10 +137,9 @@ class CursorBasedPagination:
         # Extract next cursor from response
         try:
             data = response.raw_data
-            path_parts = self.next_cursor_path.split('.')
             
-            for part in path_parts:
-                data = data[part]
+            for key in self._cursor_path_keys:
+                data = data[key]
             
             next_cursor = data
             if not next_cursor:
@@ -163,19 +162,46 @@ class CursorBasedPagination:
 class PaginationFactory:
     """Factory for creating appropriate pagination strategy based on config"""
     
-    STRATEGIES = {
+    STRATEGIES: Dict[str, type] = {
         'offset_limit': OffsetLimitPagination,
         'page_based': PageBasedPagination,
         'cursor_based': CursorBasedPagination
     }
     
+    STATELESS_STRATEGIES = frozenset({OffsetLimitPagination, PageBasedPagination})
+    
     @classmethod
     def create_strategy(cls, pagination_config: Dict[str, Any]) -> PaginationStrategy:
         """Create pagination strategy instance based on configuration"""
         strategy_type = pagination_config['strategy']
         
-        if strategy_type not in cls.STRATEGIES:
-            raise ValueError(f"Unsupported pagination strategy: {strategy_type}")
+        try:
+            strategy_class = cls.STRATEGIES[strategy_type]
+        except KeyError:
+            raise ValueError(f"Unsupported pagination strategy: {strategy_type}") from None
+        
+        # Cursor strategies carry the current cursor between pages, so never share them
+        if strategy_class not in cls.STATELESS_STRATEGIES:
+            return strategy_class(pagination_config)
+        
+        try:
+            config_items = frozenset(pagination_config.items())
+        except TypeError:
+            return strategy_class(pagination_config)  # Unhashable config values
+        
+        return _build_shared_strategy(strategy_class, config_items)
+
+
+@lru_cache(maxsize=64)
+def _build_shared_strategy(strategy_class: type, config_items: frozenset) -> PaginationStrategy:
+    """
+    Build a stateless strategy once per distinct configuration
+    
+    Args:
+        strategy_class: Stateless pagination strategy class to instantiate
+        config_items: Frozen pagination configuration items
         
-        strategy_class = cls.STRATEGIES[strategy_type]
-        return strategy_class(pagination_config)
\ No newline at end of file
+    Returns:
+        Shared strategy instance for this configuration
+    """
+    return strategy_class(dict(config_items))
\ No newline at end of file
@@ -2,10 +2,17 @@
 PayloadValidator module for validating API response data quality
 """
 
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from api_adapter.http_client import APIResponse
 
 
+@lru_cache(maxsize=32)
+def _split_path(path: str) -> Tuple[str, ...]:
+    """Split a dotted field path into keys, once per distinct path"""
+    return tuple(path.split('.'))
+
+
 class PayloadValidator:
     """Validates API responses based on configurable validation rules"""
     
@@ -23,23 +30,17 @@ class PayloadValidator:
         Returns:
             True if all enabled validations pass, False otherwise
         """
-        validations = []
-        
-        # Check each validation if enabled
-        if config.get('response_completeness', False):
-            validations.append(self.validate_response_completeness(response, config))
-        
-        if config.get('rate_limit_headers', False):
-            validations.append(self.validate_rate_limit_headers(response, config))
-        
-        if config.get('empty_response_detection', False):
-            validations.append(not self.detect_empty_response(response))  # Invert - empty is bad
-        
-        if config.get('json_structure_validation', False):
-            validations.append(self.validate_json_structure(response))
-        
-        # All enabled validations must pass
-        return all(validations) if validations else True
+        # Ordered cheapest first so a failing response skips the nested path walk
+        return (
+            (not config.get('rate_limit_headers', False)
+             or self.validate_rate_limit_headers(response, config))
+            and (not config.get('json_structure_validation', False)
+                 or self.validate_json_structure(response))
+            and (not config.get('empty_response_detection', False)
+                 or not self.detect_empty_response(response))  # Invert - empty is bad
+            and (not config.get('response_completeness', False)
+                 or self.validate_response_completeness(response, config))
+        )
     
     def validate_response_completeness(self, response: APIResponse, config: Dict[str, Any]) -> bool:
         """
@@ -58,22 +59,22 @@ class PayloadValidator:
             if not total_results_path:
                 return False
             
-            # Navigate the nested path
-            data = response.raw_data
-            path_parts = total_results_path.split('.')
+            # Walk to the node holding the total once and count items from that same node
+            path_keys = _split_path(total_results_path)
+            container = response.raw_data
+            
+            for key in path_keys[:-1]:
+                container = container[key]
             
-            for part in path_parts:
-                if ':' in part:
-                    # Handle namespaced keys like 'opensearch:totalResults'
-                    data = data[part]
-                else:
-                    data = data[part]
+            total_results = int(container[path_keys[-1]])
             
-            total_results = int(data)
+            actual_count = None
+            if container is not response.raw_data:
+                actual_count = self._count_container_items(container)
             
-            # Extract actual items count
-            # Try common patterns for items array
-            actual_count = self._extract_items_count(response.raw_data)
+            if actual_count is None:
+                # Items live elsewhere - try common patterns for items array
+                actual_count = self._extract_items_count(response.raw_data)
             
             return actual_count == total_results
             
@@ -176,6 +177,23 @@ class PayloadValidator:
             # If we can't parse the response, consider it empty
             return True
     
+    def _count_container_items(self, container: Dict[str, Any]) -> Optional[int]:
+        """
+        Count items held alongside the total results field
+        
+        Args:
+            container: Dictionary node that holds the total results field
+            
+        Returns:
+            Count of items in the first recognised items array, or None if there is none
+        """
+        for key in ('entry', 'data', 'items'):
+            items = container.get(key)
+            if isinstance(items, list):
+                return len(items)
+        
+        return None
+    
     def _extract_items_count(self, raw_data: Dict[str, Any]) -> int:
         """
         Extract the actual count of items from response data
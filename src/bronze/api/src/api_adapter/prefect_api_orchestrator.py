@@ -32,7 +32,7 @@ from prefect.tasks import task_input_hash
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from api_adapter.config_loader import ConfigLoader, ConfigurationError, EnvironmentError
-from api_adapter.database_manager import DatabaseManager, DatabaseConnectionError
+from api_adapter.database_manager import DatabaseManager, DatabaseConnectionError, ConnectionPool
 from api_adapter.state_manager import StateManager, ProcessingState
 from api_adapter.manifest_generator import ManifestGenerator
 from api_adapter.rate_limit_tracker import RateLimitTracker
@@ -250,7 +250,7 @@ def check_incomplete_entities(entities: List[str], load_id: str,
     
     try:
         # Create database manager and state manager
-        db_manager = DatabaseManager()
+        db_manager = DatabaseManager(ConnectionPool.for_path(Path(state_db_path)))
         db_manager.create_connection(Path(state_db_path))
         db_manager.create_tables()  # Ensure tables exist
         
@@ -316,12 +316,12 @@ def process_single_entity(entity_id: str, config_path: str, load_id: str,
     try:
         config = ConfigLoader.load_toml_config(Path(config_path))
         
-        # Database managers
-        api_db_manager = DatabaseManager()
+        # Database managers, reusing connections opened for earlier entities
+        api_db_manager = DatabaseManager(ConnectionPool.for_path(Path(api_data_db_path)))
         api_db_manager.create_connection(Path(api_data_db_path))
         api_db_manager.create_tables()
         
-        state_db_manager = DatabaseManager()
+        state_db_manager = DatabaseManager(ConnectionPool.for_path(Path(state_db_path)))
         state_db_manager.create_connection(Path(state_db_path))
         state_db_manager.create_tables()
         
@@ -378,8 +378,8 @@ def process_single_entity(entity_id: str, config_path: str, load_id: str,
         if not rate_limit_tracker.check_weekly_limit(config.name):
             raise Exception("Weekly API rate limit would be exceeded")
         
-        # Check for existing state
-        existing_state = state_manager.load_state(entity_id, load_id)
+        # Check for existing progress, without reading the JSON state columns
+        existing_state = state_manager.load_progress(entity_id, load_id)
         if existing_state and not existing_state.completed:
             logger.info(f"Resuming processing for entity {entity_id} from page {existing_state.last_page + 1}")
             entity_result['pages_processed'] = existing_state.pages_processed
@@ -454,17 +454,15 @@ def process_single_entity(entity_id: str, config_path: str, load_id: str,
                 # Update processing state
                 state_manager.update_page_progress(entity_id, load_id, page_num)
                 
-                # Extract and track processed items
+                # Extract and track processed items with one state update per page
                 items = _extract_items_from_response(response.raw_data)
-                for item in items:
-                    item_id = item.get('prism:doi') or item.get('dc:identifier', '')
-                    if item_id:
-                        state_manager.add_processed_item(entity_id, load_id, item_id)
+                item_ids = [item.get('prism:doi') or item.get('dc:identifier', '') for item in items]
+                state_manager.add_processed_items(entity_id, load_id, [item_id for item_id in item_ids if item_id])
                 
                 # Record file hash
                 filename = f"{config.name}_author_{entity_id}_page{page_num}_{datetime.now().strftime('%Y%m%d')}.json"
                 file_hash = FileHasher.generate_content_hash(response.raw_data)
-                state_manager.record_file_hash(entity_id, load_id, filename, file_hash)
+                state_manager.queue_file_hash(entity_id, load_id, filename, file_hash)
                 
                 entity_result['pages_processed'] += 1
                 logger.info(f"Processed page {page_num} for entity {entity_id}")
@@ -479,7 +477,7 @@ def process_single_entity(entity_id: str, config_path: str, load_id: str,
                 }
                 entity_result['errors'].append(error_entry)
                 
-                state_manager.log_processing_error(entity_id, load_id, page_error, page_num)
+                state_manager.queue_processing_error(entity_id, load_id, page_error, page_num)
                 logger.error(f"Error processing page {page_num} for entity {entity_id}: {page_error}")
                 
                 # Determine if we should continue or stop
@@ -510,6 +508,13 @@ def process_single_entity(entity_id: str, config_path: str, load_id: str,
     finally:
         entity_result['end_time'] = datetime.now(timezone.utc)
         
+        # Persist queued state writes before the state connection closes
+        try:
+            if 'state_manager' in locals():
+                state_manager.flush_pending_writes()
+        except Exception as flush_error:
+            logger.error(f"Failed to flush state writes for entity {entity_id}: {flush_error}")
+        
         # Cleanup connections
         try:
             if 'api_db_manager' in locals():
@@ -520,6 +525,8 @@ def process_single_entity(entity_id: str, config_path: str, load_id: str,
                 http_client.close_connection()
             if 'cache_manager' in locals() and cache_manager:
                 cache_manager.release_lock()
+            if 'rate_limit_tracker' in locals():
+                rate_limit_tracker.close()
         except:
             pass  # Ignore cleanup errors
     
@@ -713,6 +720,10 @@ def api_ingestion_flow(config_path: str, entity_file_path: str,
             'load_id': None,
             'data_source': None
         }
+    
+    finally:
+        # Release the database files held open by the per-entity connection pools
+        ConnectionPool.close_all()
 
 
 # ===================================================================
@@ -2,19 +2,56 @@
 RateLimitTracker module for tracking API usage across sessions
 """
 
-import json
+import bisect
+import mmap
+import os
+import time
+import weakref
+import orjson
+from array import array
 from pathlib import Path
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional
 from datetime import datetime, timedelta
 
 
 class RateLimitTracker:
     """Tracks API request usage across sessions for weekly limit monitoring"""
     
-    def __init__(self, tracking_file: Path, weekly_limits: Optional[Dict[str, int]] = None):
+    # Number of tracked requests held in memory before the log is written to disk
+    DEFAULT_MAX_BATCH_SIZE = 128
+    
+    # Minimum log size before a flush rewrites it with only in-window entries
+    COMPACTION_THRESHOLD_BYTES = 1024 * 1024
+    
+    # Growth over the size left by the last compaction that triggers the next one
+    COMPACTION_GROWTH_FACTOR = 2
+    
+    # Write buffer for the log file handle kept open between flushes
+    LOG_BUFFER_SIZE = 64 * 1024
+    
+    # Expired entries tolerated in memory before they are trimmed in one slice
+    LAZY_TRIM_THRESHOLD = 1024
+    
+    # Rolling usage window, with its length in seconds for epoch comparisons
+    _SEVEN_DAYS = timedelta(days=7)
+    _SEVEN_DAYS_SECONDS = _SEVEN_DAYS.total_seconds()
+    
+    def __init__(self, tracking_file: Path, weekly_limits: Optional[Dict[str, int]] = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
         self.tracking_file = tracking_file
         self.weekly_limits = weekly_limits or {}
+        self.max_batch_size = max_batch_size
+        self._needs_compaction = False
+        self._compacted_size = 0
         self._request_log = self._load_request_log()
+        self._pending_lines: List[bytes] = []
+        self._log_handle: Optional[BinaryIO] = None
+        
+        # Persist any partial batch when the tracker is collected or the interpreter
+        # exits, holding only the pending list so the tracker itself can be freed
+        self._finalizer = weakref.finalize(
+            self, RateLimitTracker._persist_pending_lines, tracking_file, self._pending_lines
+        )
     
     def track_request(self, data_source: str, timestamp: datetime) -> None:
         """
@@ -26,16 +63,45 @@ class RateLimitTracker:
         """
         # Initialise data source if not exists
         if data_source not in self._request_log:
-            self._request_log[data_source] = []
+            self._request_log[data_source] = array('d')
+        
+        # Add request timestamp as epoch seconds, keeping each source in time order
+        epoch = timestamp.timestamp()
+        timestamps = self._request_log[data_source]
+        if not timestamps or epoch >= timestamps[-1]:
+            timestamps.append(epoch)
+        else:
+            bisect.insort(timestamps, epoch)
+        
+        # Trim old entries once enough have expired
+        self._count_within_window(data_source)
         
-        # Add request timestamp
-        self._request_log[data_source].append(timestamp.isoformat())
+        # Append to the log once a full batch has accumulated
+        self._pending_lines.append(orjson.dumps({'src': data_source, 'ts': epoch}))
+        if len(self._pending_lines) >= self.max_batch_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        """
+        Append any tracked requests not yet persisted to the tracking log
+        """
+        if not self._pending_lines and not self._needs_compaction:
+            return
         
-        # Clean old entries before saving
-        self._cleanup_old_entries(data_source)
+        if self._needs_compaction:
+            self._compact_request_log()
+        else:
+            self._append_request_log()
         
-        # Persist to file
-        self._save_request_log()
+        # Emptied in place, since the finalizer holds this list
+        self._pending_lines.clear()
+    
+    def close(self) -> None:
+        """
+        Flush pending requests and release the tracking log file handle
+        """
+        self.flush()
+        self._close_log_handle()
     
     def check_weekly_limit(self, data_source: str) -> bool:
         """
@@ -47,14 +113,12 @@ class RateLimitTracker:
         Returns:
             True if within limit or no limit configured, False if at/over limit
         """
-        # If no limit configured for this source, allow unlimited
-        if data_source not in self.weekly_limits:
+        # If no limit configured for this source, allow unlimited without counting usage
+        weekly_limit = self.weekly_limits.get(data_source)
+        if weekly_limit is None:
             return True
         
-        weekly_limit = self.weekly_limits[data_source]
-        current_usage = self.get_current_usage(data_source)
-        
-        return current_usage < weekly_limit
+        return self.get_current_usage(data_source) < weekly_limit
     
     def get_current_usage(self, data_source: str) -> int:
         """
@@ -69,65 +133,237 @@ class RateLimitTracker:
         if data_source not in self._request_log:
             return 0
         
-        # Clean old entries first
-        self._cleanup_old_entries(data_source)
-        
-        # Count remaining entries (all should be within 7 days)
-        return len(self._request_log[data_source])
+        return self._count_within_window(data_source)
     
-    def _load_request_log(self) -> Dict[str, list]:
+    def _load_request_log(self) -> Dict[str, array]:
         """
         Load request log from persistent storage
         
+        The log is JSON Lines with one {"src", "ts"} entry per request. Files
+        written in the earlier whole-document format are still read, and are
+        rewritten as JSON Lines on the next flush.
+        
+        Timestamps are held as packed C doubles rather than lists of float
+        objects, so large logs cost 8 bytes per request in memory.
+        
         Returns:
-            Dictionary of data source to list of timestamp strings
+            Dictionary of data source to sorted array of epoch timestamps
         """
         if not self.tracking_file.exists():
             return {}
         
         try:
-            with open(self.tracking_file, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
-            # Corrupted or unreadable file, start fresh
+            with open(self.tracking_file, 'rb') as f:
+                # Treat the loaded log as freshly compacted, so it must grow before it is rewritten
+                self._compacted_size = os.fstat(f.fileno()).st_size
+                if self._compacted_size == 0:
+                    return {}
+                
+                # Map the log read-only and walk it line by line without copying it whole
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Entries written by this version always carry "src"
+                    if b'"src"' not in mm.readline():
+                        legacy_log = self._parse_legacy_request_log(mm[:])
+                        if legacy_log is not None:
+                            self._needs_compaction = True
+                            return legacy_log
+                    
+                    mm.seek(0)
+                    request_log = self._parse_request_lines(iter(mm.readline, b''))
+        except OSError:
+            # Unreadable file, start fresh
             return {}
+        
+        return {
+            data_source: array('d', sorted(timestamps))
+            for data_source, timestamps in request_log.items()
+        }
     
-    def _save_request_log(self) -> None:
+    def _parse_request_lines(self, lines: Iterator[bytes]) -> Dict[str, List[float]]:
         """
-        Save request log to persistent storage
+        Parse JSON Lines log entries, skipping those already outside the 7 day window
+        
+        Args:
+            lines: Raw log lines
+            
+        Returns:
+            Dictionary of data source to list of epoch timestamps
+        """
+        cutoff = time.time() - self._SEVEN_DAYS_SECONDS
+        request_log = {}
+        for line in lines:
+            if not line.strip():
+                continue
+            
+            try:
+                entry = orjson.loads(line)
+                epoch = float(entry['ts'])
+                source_log = request_log.setdefault(entry['src'], [])
+            except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+                # Corrupted line, skip it and rewrite the log on next flush
+                self._needs_compaction = True
+                continue
+            
+            if epoch >= cutoff:
+                source_log.append(epoch)
+        
+        return request_log
+    
+    def _parse_legacy_request_log(self, content: bytes) -> Optional[Dict[str, array]]:
+        """
+        Parse a whole-document log mapping data source to ISO timestamp strings
+        
+        Args:
+            content: Raw tracking file content
+            
+        Returns:
+            Dictionary of data source to sorted array of epoch timestamps, or None if not legacy format
         """
+        try:
+            document = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return None
+        
+        if not isinstance(document, dict) or not all(isinstance(v, list) for v in document.values()):
+            return None
+        
+        request_log = {}
+        for data_source, timestamps in document.items():
+            epochs = []
+            for timestamp_str in timestamps:
+                try:
+                    epochs.append(datetime.fromisoformat(timestamp_str).timestamp())
+                except (TypeError, ValueError):
+                    # Invalid timestamp format, skip it
+                    continue
+            request_log[data_source] = array('d', sorted(epochs))
+        
+        return request_log
+    
+    def _append_request_log(self) -> None:
+        """
+        Append pending entries to persistent storage in a single write
+        """
+        try:
+            if self._log_handle is None:
+                # Ensure parent directory exists
+                self.tracking_file.parent.mkdir(parents=True, exist_ok=True)
+                self._log_handle = open(self.tracking_file, 'ab', buffering=self.LOG_BUFFER_SIZE)
+            
+            self._log_handle.write(b''.join(line + b'\n' for line in self._pending_lines))
+            self._log_handle.flush()
+            log_size = self._log_handle.tell()
+        except OSError:
+            # Failed to write, continue without persistence
+            return
+        
+        # Compact only once the log has grown well past its live content, so a
+        # window holding more than the threshold is not rewritten on every flush
+        compaction_size = max(self.COMPACTION_THRESHOLD_BYTES, self.COMPACTION_GROWTH_FACTOR * self._compacted_size)
+        if log_size > compaction_size:
+            self._compact_request_log()
+    
+    def _compact_request_log(self) -> None:
+        """
+        Rewrite persistent storage with only entries inside the 7 day window
+        """
+        cutoff = time.time() - self._SEVEN_DAYS_SECONDS
+        for data_source in self._request_log:
+            self._cleanup_old_entries(data_source, cutoff)
+        
+        content = b''.join(
+            orjson.dumps({'src': data_source, 'ts': epoch}) + b'\n'
+            for data_source, timestamps in self._request_log.items()
+            for epoch in timestamps
+        )
+        
+        # The open handle would keep appending to the replaced file
+        self._close_log_handle()
+        
+        temp_file = self.tracking_file.with_name(self.tracking_file.name + '.tmp')
         try:
             # Ensure parent directory exists
             self.tracking_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.tracking_file, 'w') as f:
-                json.dump(self._request_log, f, indent=2)
+            with open(temp_file, 'wb', buffering=self.LOG_BUFFER_SIZE) as f:
+                f.write(content)
+            
+            # Swap atomically so a crash never leaves a half-written log
+            os.replace(temp_file, self.tracking_file)
+            self._needs_compaction = False
+            self._compacted_size = len(content)
         except OSError:
             # Failed to write, continue without persistence
             pass
     
-    def _cleanup_old_entries(self, data_source: str) -> None:
+    @staticmethod
+    def _persist_pending_lines(tracking_file: Path, pending_lines: List[bytes]) -> None:
         """
-        Remove request entries older than 7 days for a data source
+        Append requests that were never flushed, for a tracker that was not closed
         
         Args:
-            data_source: Name of the API to clean up
+            tracking_file: Path of the tracking log
+            pending_lines: Serialised entries still waiting to be written
         """
-        if data_source not in self._request_log:
+        if not pending_lines:
             return
         
-        # Calculate cutoff time (7 days ago)
-        cutoff_time = datetime.now() - timedelta(days=7)
+        try:
+            tracking_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tracking_file, 'ab') as f:
+                f.write(b''.join(line + b'\n' for line in pending_lines))
+        except OSError:
+            # Failed to write, continue without persistence
+            pass
+        pending_lines.clear()
+    
+    def _close_log_handle(self) -> None:
+        """
+        Close the tracking log file handle if one is open
+        """
+        if self._log_handle is None:
+            return
         
-        # Filter entries to keep only those within the last 7 days
-        filtered_entries = []
-        for timestamp_str in self._request_log[data_source]:
-            try:
-                timestamp = datetime.fromisoformat(timestamp_str)
-                if timestamp >= cutoff_time:
-                    filtered_entries.append(timestamp_str)
-            except ValueError:
-                # Invalid timestamp format, skip it
-                continue
+        try:
+            self._log_handle.close()
+        except OSError:
+            pass
+        self._log_handle = None
+    
+    def _count_within_window(self, data_source: str) -> int:
+        """
+        Count requests inside the 7 day window, trimming expired entries lazily
+        
+        Args:
+            data_source: Name of the API to count
+            
+        Returns:
+            Number of requests made in the past 7 days
+        """
+        timestamps = self._request_log[data_source]
+        
+        # Calculate cutoff time (7 days ago) as epoch seconds and binary search for it
+        cutoff = time.time() - self._SEVEN_DAYS_SECONDS
+        expired = bisect.bisect_left(timestamps, cutoff)
+        
+        if expired > self.LAZY_TRIM_THRESHOLD:
+            del timestamps[:expired]
+            return len(timestamps)
+        
+        return len(timestamps) - expired
+    
+    def _cleanup_old_entries(self, data_source: str, cutoff: float) -> None:
+        """
+        Remove request entries older than the cutoff for a data source
+        
+        Args:
+            data_source: Name of the API to clean up
+            cutoff: Epoch seconds marking the start of the 7 day window
+        """
+        if data_source not in self._request_log:
+            return
         
-        self._request_log[data_source] = filtered_entries
\ No newline at end of file
+        # Entries are in time order, so expired ones form a prefix - drop it in one slice
+        expired = bisect.bisect_left(self._request_log[data_source], cutoff)
+        if expired:
+            del self._request_log[data_source][:expired]
\ No newline at end of file
@@ -2,9 +2,11 @@
 RecoveryManager module for handling partial failure restart logic
 """
 
-import json
+import os
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 from api_adapter.state_manager import StateManager
 from api_adapter.file_hasher import FileHasher
 
@@ -12,6 +14,9 @@ from api_adapter.file_hasher import FileHasher
 class RecoveryManager:
     """Handles partial failure restart logic from original script"""
     
+    # Upper bound on threads used to verify file hashes concurrently
+    MAX_VALIDATION_WORKERS = 8
+    
     def __init__(self, state_manager: StateManager, file_hasher: FileHasher):
         self.state_manager = state_manager
         self.file_hasher = file_hasher
@@ -32,12 +37,7 @@ class RecoveryManager:
             return []
         
         # Extract unique page numbers from error log
-        failed_pages = set()
-        for error in state.errors:
-            if 'page_number' in error:
-                failed_pages.add(error['page_number'])
-        
-        return sorted(list(failed_pages))
+        return sorted({error['page_number'] for error in state.errors if 'page_number' in error})
     
     def validate_existing_files(self, entity_id: str, load_id: str) -> bool:
         """
@@ -54,21 +54,32 @@ class RecoveryManager:
         if not state or not state.file_names:
             return True  # No files to validate
         
-        # Check each file exists and has correct hash
+        # Check each file exists and collect those with a hash to verify
+        file_paths = []
+        expected_hashes = []
+        directory_listings: Dict[Path, Set[str]] = {}
         for file_name in state.file_names:
             file_path = Path(file_name)  # Assume file_name includes full path
             
-            # Check file exists
-            if not file_path.exists():
+            # Check file exists against one listing per directory rather than a stat per file
+            if file_path.parent not in directory_listings:
+                directory_listings[file_path.parent] = self._list_directory(file_path.parent)
+            if file_path.name not in directory_listings[file_path.parent]:
                 return False
             
             # Check file integrity if hash available
             expected_hash = state.file_hashes.get(file_name)
             if expected_hash:
-                if not self._validate_file_integrity(file_path, expected_hash):
-                    return False
+                file_paths.append(file_path)
+                expected_hashes.append(expected_hash)
         
-        return True
+        if not file_paths:
+            return True
+        
+        # Integrity checks are I/O bound, so overlap file reads across a thread pool
+        max_workers = min(self.MAX_VALIDATION_WORKERS, len(file_paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return all(executor.map(self._validate_file_integrity, file_paths, expected_hashes))
     
     def restart_from_page(self, entity_id: str, load_id: str, page_num: int) -> None:
         """
@@ -94,6 +105,22 @@ class RecoveryManager:
         # Save updated state
         self.state_manager.save_state(state)
     
+    def _list_directory(self, directory: Path) -> Set[str]:
+        """
+        List entry names in a directory with a single scan
+        
+        Args:
+            directory: Directory to list
+            
+        Returns:
+            Set of entry names, empty if the directory cannot be read
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name for entry in entries}
+        except OSError:
+            return set()
+    
     def _validate_file_integrity(self, file_path: Path, expected_hash: str) -> bool:
         """
         Validate that a file's content matches its expected hash
@@ -107,8 +134,14 @@ class RecoveryManager:
         """
         try:
             # Read file content
-            with open(file_path, 'r') as f:
-                file_content = json.load(f)
+            with open(file_path, 'rb') as f:
+                raw_content = f.read()
+            
+            # Files written in canonical form match on their raw bytes without parsing
+            if self.file_hasher.generate_bytes_hash(raw_content) == expected_hash:
+                return True
+            
+            file_content = orjson.loads(raw_content)
             
             # Generate hash of current content
             current_hash = self.file_hasher.generate_content_hash(file_content)
@@ -116,7 +149,7 @@ class RecoveryManager:
             # Compare with expected hash
             return current_hash == expected_hash
             
-        except (OSError, json.JSONDecodeError, ValueError):
+        except (OSError, ValueError):
             # File unreadable or corrupted
             return False
     
@@ -128,30 +161,27 @@ class RecoveryManager:
             state: ProcessingState object to modify
             restart_page: Page number to start clearing from
         """
-        # Filter file names to keep only those before restart page
-        # Assume file names contain page information that can be extracted
+        # Filter file names to keep only those before restart page; every name is
+        # checked, since nothing guarantees file names are recorded in page order
         valid_files = []
-        valid_hashes = {}
-        
         for file_name in state.file_names:
             # Extract page number from file name (assuming pattern like 'page{num}')
             page_num = self._extract_page_number_from_filename(file_name)
             if page_num is not None and page_num < restart_page:
                 valid_files.append(file_name)
-                if file_name in state.file_hashes:
-                    valid_hashes[file_name] = state.file_hashes[file_name]
         
         state.file_names = valid_files
-        state.file_hashes = valid_hashes
+        state.file_hashes = {
+            file_name: state.file_hashes[file_name]
+            for file_name in valid_files
+            if file_name in state.file_hashes
+        }
         
         # Filter errors to keep only those from valid pages
-        valid_errors = []
-        for error in state.errors:
-            error_page = error.get('page_number')
-            if error_page is not None and error_page < restart_page:
-                valid_errors.append(error)
-        
-        state.errors = valid_errors
+        state.errors = [
+            error for error in state.errors
+            if error.get('page_number') is not None and error['page_number'] < restart_page
+        ]
         
         # Note: processed_items might need more sophisticated filtering
         # depending on how items map to pages - for now, keep all items
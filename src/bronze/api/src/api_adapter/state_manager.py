@@ -2,14 +2,132 @@
 StateManager module for handling processing state persistence and recovery
 """
 
-import json
-from typing import List, Optional, Dict, Any
+import orjson
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 from api_adapter.database_manager import DatabaseManager
 
 
-@dataclass
+_UPSERT_STATE_SQL = """
+INSERT INTO processing_state (
+    load_id, entity_id, data_source, last_page, last_start_index,
+    total_results, pages_processed, completed,
+    file_names, file_hashes, created_timestamp, last_updated
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (load_id, entity_id) DO UPDATE SET
+    data_source = EXCLUDED.data_source,
+    last_page = EXCLUDED.last_page,
+    last_start_index = EXCLUDED.last_start_index,
+    total_results = EXCLUDED.total_results,
+    pages_processed = EXCLUDED.pages_processed,
+    completed = EXCLUDED.completed,
+    file_names = EXCLUDED.file_names,
+    file_hashes = EXCLUDED.file_hashes,
+    last_updated = EXCLUDED.last_updated
+"""
+
+# DuckDB only scans an index for a single column equality filter, so point
+# lookups narrow by entity_id in a materialized CTE, which uses the entity_id
+# indexes, and then by load_id among that entity's few rows
+_LOAD_STATE_SQL = """
+WITH entity_state AS MATERIALIZED (
+    SELECT * FROM processing_state WHERE entity_id = $2
+),
+entity_items AS MATERIALIZED (
+    SELECT load_id, item, seq FROM processing_state_items WHERE entity_id = $2
+),
+entity_errors AS MATERIALIZED (
+    SELECT load_id, error, seq FROM processing_state_errors WHERE entity_id = $2
+)
+SELECT load_id, entity_id, data_source, last_page, last_start_index,
+       total_results, pages_processed, completed,
+       (SELECT list(item ORDER BY seq)
+        FROM entity_items AS items
+        WHERE items.load_id = state.load_id) AS processed_items,
+       file_names, file_hashes,
+       (SELECT to_json(list(error ORDER BY seq))
+        FROM entity_errors AS errors
+        WHERE errors.load_id = state.load_id) AS errors,
+       created_timestamp, last_updated
+FROM entity_state AS state
+WHERE load_id = $1
+"""
+
+_LOAD_PROGRESS_SQL = """
+WITH entity_state AS MATERIALIZED (
+    SELECT load_id, completed, last_page, pages_processed, total_results
+    FROM processing_state WHERE entity_id = $2
+)
+SELECT completed, last_page, pages_processed, total_results
+FROM entity_state
+WHERE load_id = $1
+"""
+
+# Processed items live one per row in processing_state_items, ordered by seq
+_INSERT_ITEMS_SQL = """
+INSERT INTO processing_state_items (load_id, entity_id, item, seq)
+SELECT $2, $3, item, nextval('processing_state_items_seq')
+FROM (SELECT unnest(CAST($1 AS VARCHAR[])) AS item)
+WHERE EXISTS (SELECT 1 FROM processing_state WHERE load_id = $2 AND entity_id = $3)
+ON CONFLICT DO NOTHING
+"""
+
+# Errors live one per row in processing_state_errors, ordered by seq
+_INSERT_ERRORS_SQL = """
+INSERT INTO processing_state_errors (load_id, entity_id, seq, error)
+SELECT $2, $3, nextval('processing_state_errors_seq'), CAST(error AS JSON)
+FROM (SELECT unnest(CAST($1 AS VARCHAR[])) AS error)
+WHERE EXISTS (SELECT 1 FROM processing_state WHERE load_id = $2 AND entity_id = $3)
+"""
+
+# Marks a state row as changed when only its child tables were written
+_TOUCH_STATE_SQL = """
+UPDATE processing_state
+SET last_updated = ?
+WHERE load_id = ? AND entity_id = ?
+"""
+
+_DELETE_ERRORS_SQL = """
+DELETE FROM processing_state_errors
+WHERE load_id = ? AND entity_id = ?
+"""
+
+# Applies every queued file hash for one entity in a single statement
+_FLUSH_PENDING_SQL = """
+UPDATE processing_state
+SET file_hashes = map_concat(COALESCE(file_hashes, MAP {}), map(CAST(? AS VARCHAR[]), CAST(? AS VARCHAR[]))),
+    last_updated = ?
+WHERE load_id = ? AND entity_id = ?
+"""
+
+# Anti-joins the stored rows against the unnested items, which DuckDB runs as
+# a hash join rather than a list scan per stored row
+_DELETE_STALE_ITEMS_SQL = """
+DELETE FROM processing_state_items
+WHERE load_id = $2 AND entity_id = $3
+  AND item NOT IN (SELECT unnest(CAST($1 AS VARCHAR[])))
+"""
+
+
+def _encode_json(value: Any) -> str:
+    """
+    Encode a value for a JSON column in one orjson call
+    
+    The text is bound as is, so DuckDB stores it without first converting
+    Python dicts to STRUCTs, which would add null keys to entries whose
+    fields differ.
+    
+    Args:
+        value: JSON serialisable value
+        
+    Returns:
+        JSON text
+    """
+    return orjson.dumps(value).decode()
+
+
+@dataclass(slots=True)
 class ProcessingState:
     """State information for resumable processing"""
     entity_id: str
@@ -28,11 +146,90 @@ class ProcessingState:
     last_updated: datetime = field(default_factory=datetime.now)
 
 
+@dataclass(slots=True)
+class ProcessingProgress:
+    """Scalar progress fields of a processing state, without its JSON columns"""
+    completed: bool
+    last_page: int
+    pages_processed: int
+    total_results: Optional[int] = None
+
+
+class StateWriteBuffer:
+    """Coalesces queued file hash and error writes per entity until they are flushed"""
+    
+    # Queued writes held before the owning StateManager flushes them
+    DEFAULT_MAX_PENDING = 100
+    
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._pending_hashes: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._pending_errors: Dict[Tuple[str, str], List[str]] = {}
+        self._pending_count = 0
+    
+    def queue_hash(self, entity_id: str, load_id: str, filename: str, file_hash: str) -> None:
+        """
+        Queue a file hash for an entity, replacing any queued hash for the same file
+        
+        Args:
+            entity_id: Entity identifier
+            load_id: Load identifier
+            filename: Name of the file
+            file_hash: Hash of the file content
+        """
+        self._pending_hashes.setdefault((load_id, entity_id), {})[filename] = file_hash
+        self._pending_count += 1
+    
+    def queue_error(self, entity_id: str, load_id: str, error_entry: Dict[str, Any]) -> None:
+        """
+        Queue an error entry for an entity
+        
+        Args:
+            entity_id: Entity identifier
+            load_id: Load identifier
+            error_entry: Error details to append
+        """
+        self._pending_errors.setdefault((load_id, entity_id), []).append(_encode_json(error_entry))
+        self._pending_count += 1
+    
+    @property
+    def has_pending(self) -> bool:
+        """Whether any writes are waiting to be flushed"""
+        return self._pending_count > 0
+    
+    @property
+    def is_full(self) -> bool:
+        """Whether the queued writes have reached max_pending"""
+        return self._pending_count >= self.max_pending
+    
+    def pending(self) -> List[Tuple[Tuple[str, str], Dict[str, str], List[str]]]:
+        """
+        List every queued write, grouped per entity, leaving the buffer unchanged
+        
+        Returns:
+            List of ((load_id, entity_id), file hashes, JSON encoded error entries)
+        """
+        keys = list(dict.fromkeys([*self._pending_hashes, *self._pending_errors]))
+        return [
+            (key, self._pending_hashes.get(key, {}), self._pending_errors.get(key, []))
+            for key in keys
+        ]
+    
+    def clear(self) -> None:
+        """
+        Empty the buffer once its writes have been committed
+        """
+        self._pending_hashes = {}
+        self._pending_errors = {}
+        self._pending_count = 0
+
+
 class StateManager:
     """Manages processing state persistence and recovery using DuckDB"""
     
     def __init__(self, database_manager: DatabaseManager):
         self.db_manager = database_manager
+        self.write_buffer = StateWriteBuffer()
     
     def load_state(self, entity_id: str, load_id: str) -> Optional[ProcessingState]:
         """
@@ -51,12 +248,9 @@ class StateManager:
         if not self.db_manager._connection:
             raise Exception("No active database connection")
         
-        query = """
-        SELECT * FROM processing_state 
-        WHERE load_id = ? AND entity_id = ?
-        """
+        self.flush_pending_writes()
         
-        result = self.db_manager._connection.execute(query, (load_id, entity_id))
+        result = self.db_manager._connection.execute(_LOAD_STATE_SQL, (load_id, entity_id))
         row = result.fetchone()
         
         if row is None:
@@ -75,11 +269,65 @@ class StateManager:
             processed_items=row[8] if row[8] else [],
             file_names=row[9] if row[9] else [],
             file_hashes=row[10] if row[10] else {},
-            errors=row[11] if row[11] else [],
+            errors=self._decode_json_column(row[11], []),
             created_timestamp=datetime.fromisoformat(row[12]) if isinstance(row[12], str) else row[12],
             last_updated=datetime.fromisoformat(row[13]) if isinstance(row[13], str) else row[13]
         )
     
+    @staticmethod
+    def _decode_json_column(value: Any, default: Any) -> Any:
+        """
+        Decode a JSON column value, which DuckDB returns as text
+        
+        Only errors are still stored as JSON, since their entries vary in shape,
+        and are read back as one JSON array. Processed items, file names and
+        file hashes use native LIST and MAP columns, which DuckDB binds and
+        returns as Python lists and dicts.
+        
+        Args:
+            value: Raw column value
+            default: Value to use when the column is NULL or empty
+            
+        Returns:
+            Decoded Python value
+        """
+        if not value:
+            return default
+        return orjson.loads(value) if isinstance(value, str) else value
+    
+    def load_progress(self, entity_id: str, load_id: str) -> Optional[ProcessingProgress]:
+        """
+        Load only the scalar progress columns for entity and load_id
+        
+        Used where the JSON columns (processed items, file names, hashes and
+        errors) are not needed, so they are neither read nor deserialised.
+        
+        Args:
+            entity_id: Entity identifier
+            load_id: Load identifier
+            
+        Returns:
+            ProcessingProgress object if found, None otherwise
+            
+        Raises:
+            Exception: If no active database connection
+        """
+        if not self.db_manager._connection:
+            raise Exception("No active database connection")
+        
+        self.flush_pending_writes()
+        
+        row = self.db_manager._connection.execute(_LOAD_PROGRESS_SQL, (load_id, entity_id)).fetchone()
+        if row is None:
+            return None
+        
+        return ProcessingProgress(
+            completed=row[0],
+            last_page=row[1],
+            pages_processed=row[2],
+            total_results=row[3]
+        )
+    
     def save_state(self, state: ProcessingState) -> None:
         """
         Save or update processing state using UPSERT pattern
@@ -90,27 +338,73 @@ class StateManager:
         # Update timestamp
         state.last_updated = datetime.now()
         
-        upsert_sql = """
-        INSERT INTO processing_state (
-            load_id, entity_id, data_source, last_page, last_start_index,
-            total_results, pages_processed, completed, processed_items,
-            file_names, file_hashes, errors, created_timestamp, last_updated
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT (load_id, entity_id) DO UPDATE SET
-            data_source = EXCLUDED.data_source,
-            last_page = EXCLUDED.last_page,
-            last_start_index = EXCLUDED.last_start_index,
-            total_results = EXCLUDED.total_results,
-            pages_processed = EXCLUDED.pages_processed,
-            completed = EXCLUDED.completed,
-            processed_items = EXCLUDED.processed_items,
-            file_names = EXCLUDED.file_names,
-            file_hashes = EXCLUDED.file_hashes,
-            errors = EXCLUDED.errors,
-            last_updated = EXCLUDED.last_updated
-        """
-        
-        params = (
+        with self.db_manager.transaction() as connection:
+            connection.execute(_UPSERT_STATE_SQL, self._state_params(state))
+            self._sync_processed_items(connection, state)
+            self._replace_errors(connection, state)
+    
+    def save_state_bulk(self, states: List[ProcessingState]) -> None:
+        """
+        Save or update several processing states in one batched UPSERT
+        
+        Args:
+            states: ProcessingState objects to save
+        """
+        if not states:
+            return
+        
+        # Update timestamps
+        now = datetime.now()
+        for state in states:
+            state.last_updated = now
+        
+        params_list = [self._state_params(state) for state in states]
+        with self.db_manager.transaction() as connection:
+            connection.executemany(_UPSERT_STATE_SQL, params_list)
+            for state in states:
+                self._sync_processed_items(connection, state)
+                self._replace_errors(connection, state)
+    
+    @staticmethod
+    def _sync_processed_items(connection: Any, state: ProcessingState) -> None:
+        """
+        Make the stored processed items match the state, leaving unchanged rows in place
+        
+        Args:
+            connection: Connection inside the caller's transaction
+            state: ProcessingState whose processed items are authoritative
+        """
+        params = (list(dict.fromkeys(state.processed_items)), state.load_id, state.entity_id)
+        connection.execute(_DELETE_STALE_ITEMS_SQL, params)
+        if state.processed_items:
+            connection.execute(_INSERT_ITEMS_SQL, params)
+    
+    @staticmethod
+    def _replace_errors(connection: Any, state: ProcessingState) -> None:
+        """
+        Make the stored errors match the state, in the state's order
+        
+        Args:
+            connection: Connection inside the caller's transaction
+            state: ProcessingState whose errors are authoritative
+        """
+        connection.execute(_DELETE_ERRORS_SQL, (state.load_id, state.entity_id))
+        if state.errors:
+            error_entries = [_encode_json(error_entry) for error_entry in state.errors]
+            connection.execute(_INSERT_ERRORS_SQL, (error_entries, state.load_id, state.entity_id))
+    
+    @staticmethod
+    def _state_params(state: ProcessingState) -> Tuple:
+        """
+        Build UPSERT parameters for a processing state in column order
+        
+        Args:
+            state: ProcessingState object to save
+            
+        Returns:
+            Tuple of parameters matching _UPSERT_STATE_SQL
+        """
+        return (
             state.load_id,
             state.entity_id,
             state.data_source,
@@ -119,19 +413,18 @@ class StateManager:
             state.total_results,
             state.pages_processed,
             state.completed,
-            state.processed_items,
             state.file_names,
             state.file_hashes,
-            state.errors,
             state.created_timestamp,
             state.last_updated
         )
-        
-        self.db_manager.execute_with_transaction(upsert_sql, params)
     
     def mark_completed(self, entity_id: str, load_id: str) -> None:
         """
-        Mark entity processing as completed
+        Mark entity processing as completed, persisting any queued writes first
+        
+        The queued writes and the completed flag are committed together, so
+        finishing an entity costs a single transaction.
         
         Args:
             entity_id: Entity identifier
@@ -144,7 +437,12 @@ class StateManager:
         """
         
         params = (load_id, entity_id)
-        self.db_manager.execute_with_transaction(update_sql, params)
+        with self.db_manager.transaction() as connection:
+            self._write_pending(connection)
+            connection.execute(update_sql, params)
+        
+        # Only dropped once committed, so a failed transaction keeps them queued
+        self.write_buffer.clear()
     
     def get_incomplete_entities(self, entity_ids: List[str], load_id: str) -> List[str]:
         """
@@ -155,24 +453,24 @@ class StateManager:
             load_id: Load identifier
             
         Returns:
-            List of entity IDs that need processing
+            List of entity IDs that need processing, in the order they were given
         """
         if not entity_ids:
             return []
         
-        # Find entities that are marked as completed
+        # Send the candidates as one list parameter and let the database return
+        # only those without a completed state, in the order they were given
         query = """
-        SELECT entity_id FROM processing_state 
-        WHERE load_id = ? AND completed = TRUE
+        SELECT candidate.entity_id
+        FROM (SELECT unnest($1) AS entity_id, generate_subscripts($1, 1) AS position) AS candidate
+        LEFT JOIN processing_state AS state
+            ON state.entity_id = candidate.entity_id AND state.load_id = $2
+        WHERE state.completed IS NOT TRUE
+        ORDER BY candidate.position
         """
         
-        result = self.db_manager._connection.execute(query, (load_id,))
-        completed_entities = {row[0] for row in result.fetchall()}
-        
-        # Return entities that are not in the completed set
-        incomplete_entities = [entity_id for entity_id in entity_ids if entity_id not in completed_entities]
-        
-        return incomplete_entities
+        result = self.db_manager._connection.execute(query, (list(entity_ids), load_id))
+        return [row[0] for row in result.fetchall()]
     
     def update_page_progress(self, entity_id: str, load_id: str, page_num: int) -> None:
         """
@@ -201,25 +499,26 @@ class StateManager:
             load_id: Load identifier
             identifier: Item identifier (DOI, etc.) to add
         """
-        # First load current state to get existing processed items
-        current_state = self.load_state(entity_id, load_id)
-        if current_state is None:
-            # If no state exists, we can't update processed items
-            return
-        
-        # Add new identifier if not already present
-        if identifier not in current_state.processed_items:
-            current_state.processed_items.append(identifier)
+        self.add_processed_items(entity_id, load_id, [identifier])
+    
+    def add_processed_items(self, entity_id: str, load_id: str, identifiers: List[str]) -> None:
+        """
+        Add several processed item identifiers to the state in one insert
         
-        # Update only the processed_items field
-        update_sql = """
-        UPDATE processing_state 
-        SET processed_items = ?, last_updated = ?
-        WHERE load_id = ? AND entity_id = ?
+        Args:
+            entity_id: Entity identifier
+            load_id: Load identifier
+            identifiers: Item identifiers (DOI, etc.) to add
         """
+        if not identifiers:
+            return
         
-        params = (current_state.processed_items, datetime.now(), load_id, entity_id)
-        self.db_manager.execute_with_transaction(update_sql, params)
+        # One row per new item, so the cost does not grow with the items already
+        # stored; existing items are skipped by the primary key
+        params = (list(dict.fromkeys(identifiers)), load_id, entity_id)
+        with self.db_manager.transaction() as connection:
+            connection.execute(_INSERT_ITEMS_SQL, params)
+            connection.execute(_TOUCH_STATE_SQL, (datetime.now(), load_id, entity_id))
     
     def record_file_hash(self, entity_id: str, load_id: str, filename: str, file_hash: str) -> None:
         """
@@ -231,23 +530,15 @@ class StateManager:
             filename: Name of the file
             file_hash: Hash of the file content
         """
-        # First load current state to get existing file hashes
-        current_state = self.load_state(entity_id, load_id)
-        if current_state is None:
-            # If no state exists, we can't update file hashes
-            return
-        
-        # Update file hash mapping
-        current_state.file_hashes[filename] = file_hash
-        
-        # Update only the file_hashes field
+        # Merge the new mapping into the stored file hashes in a single statement
         update_sql = """
         UPDATE processing_state 
-        SET file_hashes = ?, last_updated = ?
+        SET file_hashes = map_concat(COALESCE(file_hashes, MAP {}), MAP {?: ?}),
+            last_updated = ?
         WHERE load_id = ? AND entity_id = ?
         """
         
-        params = (current_state.file_hashes, datetime.now(), load_id, entity_id)
+        params = (filename, file_hash, datetime.now(), load_id, entity_id)
         self.db_manager.execute_with_transaction(update_sql, params)
     
     def log_processing_error(self, entity_id: str, load_id: str, error: Exception, page_num: int) -> None:
@@ -260,29 +551,105 @@ class StateManager:
             error: Exception that occurred
             page_num: Page number where error occurred
         """
-        # First load current state to get existing errors
-        current_state = self.load_state(entity_id, load_id)
-        if current_state is None:
-            # If no state exists, we can't update errors
+        error_entry = self._error_entry(error, page_num)
+        
+        # One new row, so the cost does not grow with the errors already stored
+        params = ([_encode_json(error_entry)], load_id, entity_id)
+        with self.db_manager.transaction() as connection:
+            connection.execute(_INSERT_ERRORS_SQL, params)
+            connection.execute(_TOUCH_STATE_SQL, (datetime.now(), load_id, entity_id))
+    
+    def queue_file_hash(self, entity_id: str, load_id: str, filename: str, file_hash: str) -> None:
+        """
+        Queue a file hash to be written with other pending writes for the entity
+        
+        Args:
+            entity_id: Entity identifier
+            load_id: Load identifier
+            filename: Name of the file
+            file_hash: Hash of the file content
+        """
+        self.write_buffer.queue_hash(entity_id, load_id, filename, file_hash)
+        if self.write_buffer.is_full:
+            self.flush_pending_writes()
+    
+    def queue_processing_error(self, entity_id: str, load_id: str, error: Exception, page_num: int) -> None:
+        """
+        Queue a processing error to be written with other pending writes for the entity
+        
+        Args:
+            entity_id: Entity identifier
+            load_id: Load identifier
+            error: Exception that occurred
+            page_num: Page number where error occurred
+        """
+        self.write_buffer.queue_error(entity_id, load_id, self._error_entry(error, page_num))
+        if self.write_buffer.is_full:
+            self.flush_pending_writes()
+    
+    def flush_pending_writes(self) -> None:
+        """
+        Write all queued file hashes and errors, one UPDATE per entity in a single transaction
+        """
+        if not self.write_buffer.has_pending:
             return
         
-        # Create error entry
-        error_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "page_number": page_num,
-            "error_type": type(error).__name__,
-            "error_message": str(error)
-        }
+        with self.db_manager.transaction() as connection:
+            self._write_pending(connection)
         
-        # Add to errors list
-        current_state.errors.append(error_entry)
+        # Only dropped once committed, so a failed transaction keeps them queued
+        self.write_buffer.clear()
+    
+    def _write_pending(self, connection: Any) -> None:
+        """
+        Write the buffered writes to the database
         
-        # Update only the errors field
-        update_sql = """
-        UPDATE processing_state 
-        SET errors = ?, last_updated = ?
-        WHERE load_id = ? AND entity_id = ?
+        The buffer is left as it is; callers clear it after their transaction
+        commits.
+        
+        Each entity gets one UPDATE merging its file hashes and setting
+        last_updated, even when only errors were queued, plus one insert of
+        its error rows if any errors were queued.
+        
+        Args:
+            connection: Connection inside the caller's transaction
         """
+        if not self.write_buffer.has_pending:
+            return
         
-        params = (current_state.errors, datetime.now(), load_id, entity_id)
-        self.db_manager.execute_with_transaction(update_sql, params)
\ No newline at end of file
+        now = datetime.now()
+        hash_params = []
+        error_params = []
+        for (load_id, entity_id), file_hashes, error_entries in self.write_buffer.pending():
+            hash_params.append((
+                list(file_hashes.keys()),
+                list(file_hashes.values()),
+                now,
+                load_id,
+                entity_id
+            ))
+            if error_entries:
+                error_params.append((error_entries, load_id, entity_id))
+        
+        connection.executemany(_FLUSH_PENDING_SQL, hash_params)
+        if error_params:
+            connection.executemany(_INSERT_ERRORS_SQL, error_params)
+    
+    @staticmethod
+    def _error_entry(error: Exception, page_num: int) -> Dict[str, Any]:
+        """
+        Build the stored error entry for an exception
+        
+        Args:
+            error: Exception that occurred
+            page_num: Page number where error occurred
+            
+        Returns:
+            Error details with timestamp, page number, type and message
+        """
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "page_number": page_num,
+            "error_type": type(error).__name__,
+            "error_message": str(error)
+        }
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Shared pytest fixtures for the API adapter test suite
+"""
+
+import pytest
+from pathlib import Path
+from api_adapter.database_manager import DatabaseManager
+from api_adapter.http_client import APIResponse
+from api_adapter.pagination_strategy import OffsetLimitPagination
+from api_adapter.payload_validator import PayloadValidator
+from api_adapter.state_manager import StateManager
+
+
+@pytest.fixture(scope="session")
+def scopus_offset_config():
+    """Scopus-style offset pagination configuration"""
+    return {
+        'items_per_page': 25,
+        'start_param': 'start',
+        'count_param': 'count',
+        'total_results_path': 'search-results.opensearch:totalResults'
+    }
+
+
+@pytest.fixture(scope="session")
+def offset_pagination(scopus_offset_config):
+    """OffsetLimitPagination built once from the Scopus-style configuration"""
+    return OffsetLimitPagination(scopus_offset_config)
+
+
+@pytest.fixture(scope="session")
+def full_validator_config():
+    """Payload validation configuration with every validation enabled"""
+    return {
+        'response_completeness': True,
+        'rate_limit_headers': True,
+        'empty_response_detection': True,
+        'json_structure_validation': True,
+        'headers': {
+            'total_results_field': 'search-results.opensearch:totalResults',
+            'rate_limit_remaining': 'X-RateLimit-Remaining'
+        }
+    }
+
+
+@pytest.fixture(scope="session")
+def completeness_config():
+    """Payload validation configuration mapping the Scopus total results field"""
+    return {
+        'headers': {
+            'total_results_field': 'search-results.opensearch:totalResults'
+        }
+    }
+
+
+@pytest.fixture(scope="session")
+def rate_limit_config():
+    """Payload validation configuration naming the rate limit remaining header"""
+    return {
+        'headers': {
+            'rate_limit_remaining': 'X-RateLimit-Remaining'
+        }
+    }
+
+
+@pytest.fixture(scope="session")
+def nested_path_config():
+    """Payload validation configuration with a nested non-Scopus total results field"""
+    return {
+        'headers': {
+            'total_results_field': 'results.metadata.totalCount'
+        }
+    }
+
+
+@pytest.fixture(scope="session")
+def payload_validator(full_validator_config):
+    """PayloadValidator built once from the full validation configuration"""
+    return PayloadValidator(full_validator_config)
+
+
+@pytest.fixture(scope="session")
+def scopus_two_entry_payload():
+    """Scopus search payload whose totalResults matches its two entries; treat as read-only"""
+    return {
+        'search-results': {
+            'opensearch:totalResults': '2',
+            'entry': [{'id': '1'}, {'id': '2'}]
+        }
+    }
+
+
+@pytest.fixture
+def api_response_factory():
+    """Factory building real APIResponse instances for tests that only read attributes"""
+    def _make(raw_data=None, metadata=None, status_code=200, headers=None):
+        return APIResponse(
+            raw_data=raw_data if raw_data is not None else {},
+            metadata=metadata if metadata is not None else {},
+            status_code=status_code,
+            headers=headers if headers is not None else {}
+        )
+    return _make
+
+
+@pytest.fixture
+def state_db_manager():
+    """DatabaseManager connected to a fresh in-memory DuckDB with the schema created"""
+    db_manager = DatabaseManager()
+    db_manager.create_connection(Path(":memory:"))
+    db_manager.create_tables()
+    yield db_manager
+    db_manager.close_connection()
+
+
+@pytest.fixture
+def state_manager(state_db_manager):
+    """StateManager backed by the in-memory database"""
+    return StateManager(state_db_manager)
\ No newline at end of file
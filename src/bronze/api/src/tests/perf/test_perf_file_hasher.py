@@ -0,0 +1,61 @@
+"""
+Performance benchmarks for FileHasher content hashing
+Requires pytest-benchmark; skipped when the plugin is not installed.
+Benchmarks are disabled under xdist, so run them with -n 0.
+"""
+
+import pytest
+from api_adapter.file_hasher import FileHasher
+
+pytest.importorskip('pytest_benchmark')
+
+
+# Roughly 1KB of JSON once serialised, shaped like a Scopus search entry
+LARGE_FIXTURE = {
+    "search-results": {
+        "opensearch:totalResults": "150",
+        "entry": [
+            {
+                "dc:identifier": f"SCOPUS_ID:8500000{i:04d}",
+                "prism:doi": f"10.1000/test{i}",
+                "dc:title": f"Test Paper {i}",
+                "citedby-count": str(i)
+            }
+            for i in range(8)
+        ]
+    }
+}
+
+# Batch size used to expose per-call Python overhead separately from digest cost
+BATCH_SIZE = 1024
+
+BATCH_FIXTURE = [{"id": i, "payload": LARGE_FIXTURE} for i in range(BATCH_SIZE)]
+
+
+def _hash_batch(payloads):
+    """Hash every payload in the batch"""
+    return [FileHasher.generate_content_hash(payload) for payload in payloads]
+
+
+class TestFileHasherPerformance:
+    """Benchmarks for the FileHasher hashing hot path"""
+    
+    def test_bench_hash_1kb(self, benchmark):
+        """
+        Benchmark hashing a single ~1KB payload
+        """
+        # Act
+        result = benchmark(FileHasher.generate_content_hash, LARGE_FIXTURE)
+        
+        # Assert
+        assert result == FileHasher.generate_content_hash(LARGE_FIXTURE)
+    
+    def test_bench_hash_batch(self, benchmark):
+        """
+        Benchmark hashing a batch of payloads to measure per-call overhead
+        """
+        # Act
+        result = benchmark(_hash_batch, BATCH_FIXTURE)
+        
+        # Assert
+        assert len(result) == BATCH_SIZE
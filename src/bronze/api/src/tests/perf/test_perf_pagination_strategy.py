@@ -0,0 +1,93 @@
+"""
+Performance budgets for the pagination strategy hot path
+get_next_page_params and extract_total_results run on every page fetch, so
+each is held to a fixed per-call budget that fails the suite on regression.
+Budgets are marked perf and deselected by default; run them with -m perf -n 0.
+"""
+
+import timeit
+import pytest
+from api_adapter.http_client import APIResponse
+
+
+# Per-call budget in microseconds, generous enough to absorb shared CI runners
+TARGET_US = 50
+
+ITERATIONS = 10000
+
+# Allowed ratio between late and early page cost before offset maths counts as non-constant
+CONSTANT_TIME_RATIO = 3
+
+SCOPUS_PAGE_RESPONSE = APIResponse(
+    raw_data={
+        'search-results': {
+            'opensearch:totalResults': '150',
+            'entry': [{'id': '1'}, {'id': '2'}]
+        }
+    },
+    metadata={'total_results': 150},
+    status_code=200,
+    headers={}
+)
+
+
+def _per_call_us(func, *args, iterations=ITERATIONS):
+    """
+    Time repeated calls to func and return the mean cost per call
+    
+    Args:
+        func: Callable under measurement
+        *args: Positional arguments passed to every call
+        iterations: Number of calls to time
+        
+    Returns:
+        Mean duration of a single call in microseconds
+    """
+    elapsed = timeit.timeit(lambda: func(*args), number=iterations)
+    return elapsed / iterations * 1_000_000
+
+
+class TestPaginationStrategyPerformance:
+    """Per-call budgets for the offset pagination hot path"""
+    
+    @pytest.mark.perf
+    def test_offset_get_next_page_params_perf(self, offset_pagination):
+        """
+        Test that building next page params stays within the per-call budget
+        """
+        # Act
+        per_call_us = _per_call_us(offset_pagination.get_next_page_params, {}, SCOPUS_PAGE_RESPONSE, 2)
+        
+        # Assert
+        assert per_call_us < TARGET_US, f"get_next_page_params took {per_call_us:.2f}us per call"
+    
+    @pytest.mark.perf
+    def test_extract_total_results_perf(self, offset_pagination):
+        """
+        Test that extracting total results stays within the per-call budget
+        """
+        # Act
+        per_call_us = _per_call_us(offset_pagination.extract_total_results, SCOPUS_PAGE_RESPONSE)
+        
+        # Assert
+        assert per_call_us < TARGET_US, f"extract_total_results took {per_call_us:.2f}us per call"
+    
+    @pytest.mark.perf
+    def test_offset_get_next_page_params_constant_per_page(self, offset_pagination):
+        """
+        Test that a deep page costs the same as an early one, so offset maths stays O(1) per call
+        """
+        # Arrange
+        deep_response = APIResponse(
+            raw_data={},
+            metadata={'total_results': 10_000_000},
+            status_code=200,
+            headers={}
+        )
+        
+        # Act
+        early_us = _per_call_us(offset_pagination.get_next_page_params, {}, deep_response, 2)
+        late_us = _per_call_us(offset_pagination.get_next_page_params, {}, deep_response, 399_999)
+        
+        # Assert
+        assert late_us < early_us * CONSTANT_TIME_RATIO, f"page 399999 took {late_us:.2f}us vs {early_us:.2f}us for page 2"
\ No newline at end of file
@@ -9,7 +9,7 @@ import duckdb
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
-from api_adapter.database_manager import DatabaseManager, DatabaseConnectionError
+from api_adapter.database_manager import DatabaseManager, DatabaseConnectionError, ConnectionPool
 
 
 class TestDatabaseManager:
@@ -98,6 +98,110 @@ class TestDatabaseManager:
         # Act & Assert - should not raise any exceptions
         db_manager.close_connection()
     
+    def test_close_connection_with_pool_returns_connection_for_reuse(self, tmp_path):
+        """
+        Test that a pooled connection stays open on close and is handed to the next manager
+        """
+        # Arrange
+        db_path = tmp_path / "test.db"
+        pool = ConnectionPool(db_path)
+        first_manager = DatabaseManager(pool)
+        connection = first_manager.create_connection(db_path)
+        
+        # Act
+        first_manager.close_connection()
+        second_manager = DatabaseManager(pool)
+        reused_connection = second_manager.create_connection(db_path)
+        
+        # Assert
+        assert reused_connection is connection
+        assert reused_connection.execute("SELECT 1").fetchone()[0] == 1
+        
+        # Cleanup
+        second_manager.close_connection()
+        pool.close()
+    
+    def test_release_connection_with_full_pool_closes_connection(self, tmp_path):
+        """
+        Test that connections beyond the pool limit are closed rather than kept idle
+        """
+        # Arrange
+        pool = ConnectionPool(tmp_path / "test.db", connection_limit=1)
+        kept_connection = pool.get_connection()
+        extra_connection = pool.get_connection()
+        pool.release_connection(kept_connection)
+        
+        # Act
+        pool.release_connection(extra_connection)
+        
+        # Assert
+        with pytest.raises(Exception):  # DuckDB connection closed error
+            extra_connection.execute("SELECT 1")
+        assert pool.get_connection() is kept_connection
+        
+        # Cleanup
+        kept_connection.close()
+    
+    def test_create_tables_with_pool_runs_once_per_pool(self, tmp_path):
+        """
+        Test that later managers sharing a pool skip the schema statements
+        """
+        # Arrange
+        db_path = tmp_path / "test.db"
+        pool = ConnectionPool(db_path)
+        first_manager = DatabaseManager(pool)
+        first_manager.create_connection(db_path)
+        first_manager.create_tables()
+        first_manager.close_connection()
+        
+        second_manager = DatabaseManager(pool)
+        connection = second_manager.create_connection(db_path)
+        second_manager._connection = Mock(wraps=connection)
+        
+        # Act
+        second_manager.create_tables()
+        
+        # Assert
+        second_manager._connection.execute.assert_not_called()
+        
+        # Cleanup
+        second_manager._connection = connection
+        second_manager.close_connection()
+        pool.close()
+    
+    def test_create_connection_with_pool_for_other_path_raises_error(self, tmp_path):
+        """
+        Test that a manager cannot take a pooled connection to a different database file
+        """
+        # Arrange
+        db_manager = DatabaseManager(ConnectionPool(tmp_path / "pooled.db"))
+        
+        # Act & Assert
+        with pytest.raises(DatabaseConnectionError) as exc_info:
+            db_manager.create_connection(tmp_path / "other.db")
+        
+        assert "Connection pool is for" in str(exc_info.value)
+    
+    def test_connection_pool_for_path_shares_pool_until_closed(self, tmp_path):
+        """
+        Test that for_path returns one pool per file and close_all discards it
+        """
+        # Arrange
+        db_path = tmp_path / "test.db"
+        pool = ConnectionPool.for_path(db_path)
+        
+        # Act
+        same_pool = ConnectionPool.for_path(tmp_path / "." / "test.db")
+        ConnectionPool.close_all()
+        new_pool = ConnectionPool.for_path(db_path)
+        
+        # Assert
+        assert same_pool is pool
+        assert new_pool is not pool
+        
+        # Cleanup
+        ConnectionPool.close_all()
+    
     def test_create_tables_with_valid_connection_creates_required_tables(self):
         """
         Test that create_tables creates all required database tables
@@ -133,6 +237,71 @@ class TestDatabaseManager:
             # Cleanup
             db_manager.close_connection()
     
+    def test_create_tables_with_legacy_json_state_columns_migrates_to_native_types(self, tmp_path):
+        """
+        Test that create_tables converts legacy state columns to native types, item rows and error rows, keeping their data
+        """
+        # Arrange
+        db_manager = DatabaseManager()
+        db_manager.create_connection(tmp_path / "legacy.db")
+        db_manager._connection.execute("""
+        CREATE TABLE processing_state (
+            load_id VARCHAR NOT NULL,
+            entity_id VARCHAR NOT NULL,
+            data_source VARCHAR NOT NULL,
+            last_page INTEGER DEFAULT 0,
+            last_start_index INTEGER DEFAULT 0,
+            total_results INTEGER,
+            pages_processed INTEGER DEFAULT 0,
+            completed BOOLEAN DEFAULT FALSE,
+            processed_items JSON DEFAULT '[]',
+            file_names JSON DEFAULT '[]',
+            file_hashes JSON DEFAULT '{}',
+            errors JSON DEFAULT '[]',
+            created_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (load_id, entity_id)
+        )
+        """)
+        db_manager._connection.execute(
+            "CREATE INDEX idx_state_completed ON processing_state (completed)"
+        )
+        db_manager._connection.execute("""
+        INSERT INTO processing_state (load_id, entity_id, data_source, processed_items, file_hashes, errors)
+        VALUES ('test_load', 'entity_123', 'scopus', '["doi1", "doi2"]', '{"file1.json": "hash1"}',
+                '[{"page_number": 1}, {"page_number": 2}]')
+        """)
+        
+        # Act
+        db_manager.create_tables()
+        
+        # Assert - columns are native and values come back as Python objects
+        row = db_manager._connection.execute(
+            "SELECT file_names, file_hashes FROM processing_state WHERE entity_id = ?", ("entity_123",)
+        ).fetchone()
+        assert row == ([], {'file1.json': 'hash1'})
+        
+        # Assert - processed items moved to their own table in order
+        items = db_manager._connection.execute(
+            "SELECT item FROM processing_state_items WHERE entity_id = ? ORDER BY seq", ("entity_123",)
+        ).fetchall()
+        assert [item[0] for item in items] == ['doi1', 'doi2']
+        
+        # Assert - errors moved to their own table in order
+        errors = db_manager._connection.execute(
+            "SELECT error->>'page_number' FROM processing_state_errors WHERE entity_id = ? ORDER BY seq", ("entity_123",)
+        ).fetchall()
+        assert [error[0] for error in errors] == ['1', '2']
+        
+        columns = db_manager._connection.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = 'processing_state'"
+        ).fetchall()
+        assert ('processed_items',) not in columns
+        assert ('errors',) not in columns
+        
+        # Cleanup
+        db_manager.close_connection()
+    
     def test_create_tables_without_connection_raises_database_connection_error(self):
         """
         Test that creating tables without connection raises error
@@ -174,6 +343,32 @@ class TestDatabaseManager:
             # Cleanup
             db_manager.close_connection()
     
+    def test_execute_many_with_transaction_with_valid_rows_inserts_all(self):
+        """
+        Test that execute_many_with_transaction inserts every parameter set in one commit
+        """
+        # Arrange
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            db_manager = DatabaseManager()
+            db_manager.create_connection(db_path)
+            db_manager.create_tables()
+            
+            query = "INSERT INTO processing_state (load_id, entity_id, data_source) VALUES (?, ?, ?)"
+            params_list = [("test_load", f"entity_{i}", "scopus") for i in range(3)]
+            
+            # Act
+            db_manager.execute_many_with_transaction(query, params_list)
+            
+            # Assert - verify every row was inserted
+            result = db_manager._connection.execute(
+                "SELECT COUNT(*) FROM processing_state WHERE load_id = ?", ("test_load",)
+            )
+            assert result.fetchone()[0] == 3
+            
+            # Cleanup
+            db_manager.close_connection()
+    
     def test_execute_with_transaction_with_invalid_query_rolls_back(self):
         """
         Test that execute_with_transaction rolls back on query failure
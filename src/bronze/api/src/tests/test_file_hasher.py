@@ -74,7 +74,7 @@ class TestFileHasher:
         assert isinstance(result_hash, str)
         assert len(result_hash) == 32
         # Verify it's a valid MD5 hash format (hexadecimal)
-        assert all(c in '0123456789abcdef' for c in result_hash)
+        int(result_hash, 16)  # raises ValueError if not hex
     
     def test_generate_content_hash_with_none_values_handles_gracefully(self):
         """
@@ -201,4 +201,34 @@ class TestFileHasher:
         expected_hash = hashlib.md5(
             json.dumps(test_data, sort_keys=True).encode('utf-8')
         ).hexdigest()
-        assert hash1 == expected_hash
\ No newline at end of file
+        assert hash1 == expected_hash
+    
+    def test_generate_content_hash_algorithm_configurable(self, monkeypatch):
+        """
+        Test that the hash algorithm can be switched to SHA-256 via DEDUP_HASH
+        """
+        # Arrange
+        monkeypatch.setenv('DEDUP_HASH', 'sha256')
+        test_data = {"key": "value", "nested": {"inner": [1, 2, 3]}}
+        canonical = json.dumps(test_data, sort_keys=True).encode('utf-8')
+        
+        # Act
+        result_hash = FileHasher.generate_content_hash(test_data)
+        
+        # Assert
+        assert len(result_hash) == 64
+        assert result_hash == hashlib.sha256(canonical).hexdigest()
+    
+    def test_generate_bytes_hash_with_canonical_bytes_matches_content_hash(self):
+        """
+        Test that hashing canonical JSON bytes gives the same hash as hashing the parsed content
+        """
+        # Arrange
+        test_data = {"key": "value", "nested": {"inner": [1, 2, 3]}}
+        canonical = json.dumps(test_data, sort_keys=True).encode('utf-8')
+        
+        # Act
+        result_hash = FileHasher.generate_bytes_hash(canonical)
+        
+        # Assert
+        assert result_hash == FileHasher.generate_content_hash(test_data)
\ No newline at end of file
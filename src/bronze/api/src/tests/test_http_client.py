@@ -423,4 +423,20 @@ class TestHTTPClient:
         assert 'X-API-Key' in headers
         assert headers['X-API-Key'] == 'test_key_123'
         assert 'Custom-Header' in headers
-        assert headers['Custom-Header'] == 'custom_value'
\ No newline at end of file
+        assert headers['Custom-Header'] == 'custom_value'
+    
+    def test_api_response_has_no_dict(self):
+        """
+        Test that APIResponse uses a slotted, frozen layout without a per-instance dict
+        """
+        # Arrange
+        api_response = APIResponse(
+            raw_data={'data': 'test'},
+            metadata={},
+            status_code=200
+        )
+        
+        # Act & Assert
+        assert not hasattr(api_response, '__dict__')
+        with pytest.raises(AttributeError):
+            api_response.status_code = 500
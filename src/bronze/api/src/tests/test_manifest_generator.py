@@ -4,67 +4,350 @@ Following TDD approach with AAA pattern and descriptive naming
 """
 
 import pytest
+import re
+from functools import lru_cache
+import uuid
 from datetime import datetime, timezone, timedelta
+from types import MappingProxyType
 from api_adapter.manifest_generator import ManifestGenerator
 
 
+# Fixed reference time; the tests only check arithmetic on deltas, not wall-clock time
+_BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+_ISO_TIMESTAMP_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})"
+)
+
+# Processing results payloads are built once at import and wrapped in
+# MappingProxyType so that an accidental write fails loudly.
+_COMPLETE_RESULTS = MappingProxyType({
+    'load_id': 'test_load_123',
+    'data_source': 'scopus_search',
+    'start_time': _BASE_TIME,
+    'end_time': _BASE_TIME + timedelta(minutes=30),
+    'entities': [
+        {
+            'entity_id': 'author_001',
+            'status': 'completed',
+            'pages_processed': 5,
+            'total_results': 125,
+            'errors': [],
+            'start_time': _BASE_TIME,
+            'end_time': _BASE_TIME + timedelta(minutes=10)
+        },
+        {
+            'entity_id': 'author_002',
+            'status': 'completed',
+            'pages_processed': 3,
+            'total_results': 75,
+            'errors': [],
+            'start_time': _BASE_TIME + timedelta(minutes=10),
+            'end_time': _BASE_TIME + timedelta(minutes=20)
+        }
+    ]
+})
+
+_EMPTY_RESULTS = MappingProxyType({})
+
+_NO_ENTITY_RESULTS = MappingProxyType({
+    'load_id': 'test_load_empty',
+    'data_source': 'scopus_search',
+    'entities': []
+})
+
+_ALL_SUCCESSFUL_RESULTS = MappingProxyType({
+    'entities': [
+        {
+            'entity_id': 'author_001',
+            'status': 'completed',
+            'pages_processed': 5,
+            'total_results': 125,
+            'errors': []
+        },
+        {
+            'entity_id': 'author_002',
+            'status': 'completed',
+            'pages_processed': 3,
+            'total_results': 75,
+            'errors': []
+        }
+    ]
+})
+
+_MIXED_RESULTS = MappingProxyType({
+    'entities': [
+        {
+            'entity_id': 'author_001',
+            'status': 'completed',
+            'pages_processed': 5,
+            'total_results': 125,
+            'errors': []
+        },
+        {
+            'entity_id': 'author_002',
+            'status': 'failed',
+            'pages_processed': 2,
+            'total_results': 50,
+            'errors': [{'type': 'APIError', 'message': 'Rate limit exceeded'}]
+        },
+        {
+            'entity_id': 'author_003',
+            'status': 'partial',
+            'pages_processed': 3,
+            'total_results': 75,
+            'errors': [{'type': 'TimeoutError', 'message': 'Request timeout'}]
+        }
+    ]
+})
+
+_SINGLE_ENTITY_DURATION_RESULTS = MappingProxyType({
+    'start_time': _BASE_TIME,
+    'end_time': _BASE_TIME + timedelta(minutes=30),  # 30 minutes = 1800 seconds
+    'entities': [
+        {
+            'entity_id': 'author_001',
+            'status': 'completed',
+            'pages_processed': 2,
+            'total_results': 50,
+            'errors': []
+        }
+    ]
+})
+
+_MULTIPLE_ENTITY_DURATION_RESULTS = MappingProxyType({
+    'start_time': _BASE_TIME,
+    'end_time': _BASE_TIME + timedelta(minutes=60),  # 60 minutes = 3600 seconds
+    'entities': [
+        {
+            'entity_id': 'author_001',
+            'status': 'completed',
+            'pages_processed': 2,
+            'total_results': 50,
+            'errors': []
+        },
+        {
+            'entity_id': 'author_002',
+            'status': 'completed',
+            'pages_processed': 3,
+            'total_results': 75,
+            'errors': []
+        }
+    ]
+})
+
+_ERROR_RESULTS = MappingProxyType({
+    'entities': [
+        {
+            'entity_id': 'author_001',
+            'status': 'completed',
+            'pages_processed': 5,
+            'total_results': 125,
+            'errors': []
+        },
+        {
+            'entity_id': 'author_002',
+            'status': 'failed',
+            'pages_processed': 2,
+            'total_results': 50,
+            'errors': [
+                {'type': 'APIError', 'message': 'Rate limit exceeded'},
+                {'type': 'APIError', 'message': 'Invalid response'}
+            ]
+        },
+        {
+            'entity_id': 'author_003',
+            'status': 'partial',
+            'pages_processed': 3,
+            'total_results': 75,
+            'errors': [
+                {'type': 'TimeoutError', 'message': 'Request timeout'}
+            ]
+        }
+    ]
+})
+
+_NO_ERROR_RESULTS = MappingProxyType({
+    'entities': [
+        {
+            'entity_id': 'author_001',
+            'status': 'completed',
+            'pages_processed': 5,
+            'total_results': 125,
+            'errors': []
+        }
+    ]
+})
+
+_ENTITY_DETAIL_RESULTS = MappingProxyType({
+    'load_id': 'test_load_123',
+    'data_source': 'scopus_search',
+    'entities': [
+        {
+            'entity_id': 'author_001',
+            'status': 'completed',
+            'pages_processed': 5,
+            'total_results': 125,
+            'errors': [],
+            'start_time': _BASE_TIME,
+            'end_time': _BASE_TIME + timedelta(minutes=15)  # 15 minutes = 900 seconds
+        },
+        {
+            'entity_id': 'author_002',
+            'status': 'failed',
+            'pages_processed': 2,
+            'total_results': 50,
+            'errors': [
+                {
+                    'type': 'APIError',
+                    'message': 'Rate limit exceeded',
+                    'page_num': 3
+                }
+            ],
+            'start_time': _BASE_TIME,
+            'end_time': _BASE_TIME + timedelta(minutes=15)
+        }
+    ]
+})
+
+_MISSING_TIMESTAMP_RESULTS = MappingProxyType({
+    'load_id': 'test_load_123',
+    'data_source': 'scopus_search',
+    'entities': [
+        {
+            'entity_id': 'author_001',
+            'status': 'completed',
+            'pages_processed': 5,
+            'total_results': 125,
+            'errors': []
+            # Missing start_time and end_time
+        }
+    ]
+})
+
+SUMMARY_STATISTICS_CASES = [
+    pytest.param(
+        _ALL_SUCCESSFUL_RESULTS,
+        {
+            'total_entities': 2,
+            'successful_entities': 2,
+            'failed_entities': 0,
+            'partial_entities': 0,
+            'success_rate_percent': 100.0,
+            'total_api_responses': 8,  # 5 + 3
+            'total_results_retrieved': 200,  # 125 + 75
+            'average_results_per_entity': 100.0  # 200 / 2
+        },
+        id="all_successful"
+    ),
+    pytest.param(
+        _MIXED_RESULTS,
+        {
+            'total_entities': 3,
+            'successful_entities': 1,
+            'failed_entities': 1,
+            'partial_entities': 1,
+            'success_rate_percent': 33.33,  # 1/3 * 100, rounded to 2 dp
+            'total_api_responses': 10,  # 5 + 2 + 3
+            'total_results_retrieved': 250  # 125 + 50 + 75
+        },
+        id="mixed_results"
+    ),
+    pytest.param(
+        MappingProxyType({'entities': []}),
+        {
+            'total_entities': 0,
+            'successful_entities': 0,
+            'failed_entities': 0,
+            'success_rate_percent': 0.0,
+            'total_api_responses': 0,
+            'total_results_retrieved': 0,
+            'average_results_per_entity': 0.0
+        },
+        id="no_entities"
+    ),
+    pytest.param(
+        _SINGLE_ENTITY_DURATION_RESULTS,
+        {
+            'processing_duration': {
+                'total_seconds': 1800.0,
+                'average_seconds_per_entity': 1800.0,  # 1800 / 1 entity
+                'start_time': _BASE_TIME.isoformat(),
+                'end_time': (_BASE_TIME + timedelta(minutes=30)).isoformat()
+            }
+        },
+        id="processing_duration"
+    ),
+    pytest.param(
+        _MULTIPLE_ENTITY_DURATION_RESULTS,
+        {
+            'processing_duration': {
+                'total_seconds': 3600.0,
+                'average_seconds_per_entity': 1800.0,  # 3600 / 2 entities
+                'start_time': _BASE_TIME.isoformat(),
+                'end_time': (_BASE_TIME + timedelta(minutes=60)).isoformat()
+            }
+        },
+        id="average_duration"
+    ),
+]
+
+
+# ManifestGenerator holds no state between calls, so one instance serves every test
+_MANIFEST_GENERATOR = ManifestGenerator()
+
+_RESULTS_BY_NAME = {
+    'complete': _COMPLETE_RESULTS,
+    'empty': _EMPTY_RESULTS,
+    'no_entities': _NO_ENTITY_RESULTS,
+    'entity_details': _ENTITY_DETAIL_RESULTS,
+    'missing_timestamps': _MISSING_TIMESTAMP_RESULTS,
+}
+
+
+@lru_cache(maxsize=None)
+def _manifest_for(results_name):
+    """Generate the manifest for a named frozen payload once per session"""
+    return _MANIFEST_GENERATOR.generate_manifest_data(_RESULTS_BY_NAME[results_name])
+
+
+@pytest.fixture(scope="class")
+def manifest_generator():
+    """Shared ManifestGenerator instance"""
+    return _MANIFEST_GENERATOR
+
+
 class TestManifestGenerator:
     """Test suite for ManifestGenerator processing summary functionality"""
     
-    def setup_method(self):
-        """Set up test fixtures before each test method"""
-        self.manifest_generator = ManifestGenerator()
-        self.base_time = datetime.now(timezone.utc)
-    
     def test_generate_manifest_data_with_complete_results_returns_full_manifest(self):
         """
         Test that complete processing results generate a full manifest with all sections
         """
-        # Arrange
-        processing_results = {
-            'load_id': 'test_load_123',
-            'data_source': 'scopus_search',
-            'start_time': self.base_time,
-            'end_time': self.base_time + timedelta(minutes=30),
-            'entities': [
-                {
-                    'entity_id': 'author_001',
-                    'status': 'completed',
-                    'pages_processed': 5,
-                    'total_results': 125,
-                    'errors': [],
-                    'start_time': self.base_time,
-                    'end_time': self.base_time + timedelta(minutes=10)
-                },
-                {
-                    'entity_id': 'author_002',
-                    'status': 'completed',
-                    'pages_processed': 3,
-                    'total_results': 75,
-                    'errors': [],
-                    'start_time': self.base_time + timedelta(minutes=10),
-                    'end_time': self.base_time + timedelta(minutes=20)
-                }
-            ]
-        }
-        
         # Act
-        manifest = self.manifest_generator.generate_manifest_data(processing_results)
+        manifest = _manifest_for('complete')
         
         # Assert
         assert manifest['load_id'] == 'test_load_123'
         assert manifest['data_source'] == 'scopus_search'
-        assert 'manifest_id' in manifest
-        assert 'generated_timestamp' in manifest
-        assert 'processing_summary' in manifest
-        assert 'entity_details' in manifest
-        assert 'metadata' in manifest
+        assert manifest.keys() >= {
+            'manifest_id', 'generated_timestamp', 'processing_summary', 'entity_details', 'metadata'
+        }
         
         # Check metadata structure
         metadata = manifest['metadata']
-        assert metadata['manifest_version'] == '1.0'
-        assert metadata['generator'] == 'APIOrchestrator'
-        assert metadata['total_entities_requested'] == 2
+        assert metadata.keys() >= {
+            'manifest_version', 'generator', 'total_entities_requested', 'processing_start', 'processing_end'
+        }
+        assert {
+            'manifest_version': metadata['manifest_version'],
+            'generator': metadata['generator'],
+            'total_entities_requested': metadata['total_entities_requested']
+        } == {
+            'manifest_version': '1.0',
+            'generator': 'APIOrchestrator',
+            'total_entities_requested': 2
+        }
         assert metadata['processing_start'] is not None
         assert metadata['processing_end'] is not None
     
@@ -72,11 +355,8 @@ class TestManifestGenerator:
         """
         Test that empty processing results return a manifest with zero counts
         """
-        # Arrange
-        empty_results = {}
-        
         # Act
-        manifest = self.manifest_generator.generate_manifest_data(empty_results)
+        manifest = _manifest_for('empty')
         
         # Assert
         assert manifest['load_id'] == ''
@@ -92,227 +372,32 @@ class TestManifestGenerator:
         """
         Test that results with empty entities list return empty manifest
         """
-        # Arrange
-        results_no_entities = {
-            'load_id': 'test_load_empty',
-            'data_source': 'scopus_search',
-            'entities': []
-        }
-        
         # Act
-        manifest = self.manifest_generator.generate_manifest_data(results_no_entities)
+        manifest = _manifest_for('no_entities')
         
         # Assert
         assert manifest['processing_summary']['total_entities'] == 0
         assert manifest['entity_details'] == []
         assert manifest['metadata']['total_entities_requested'] == 0
     
-    def test_calculate_summary_statistics_with_all_successful_entities_returns_100_percent_success(self):
-        """
-        Test that all successful entities result in 100% success rate
-        """
-        # Arrange
-        results = {
-            'entities': [
-                {
-                    'entity_id': 'author_001',
-                    'status': 'completed',
-                    'pages_processed': 5,
-                    'total_results': 125,
-                    'errors': []
-                },
-                {
-                    'entity_id': 'author_002',
-                    'status': 'completed',
-                    'pages_processed': 3,
-                    'total_results': 75,
-                    'errors': []
-                }
-            ]
-        }
-        
-        # Act
-        stats = self.manifest_generator.calculate_summary_statistics(results)
-        
-        # Assert
-        assert stats['total_entities'] == 2
-        assert stats['successful_entities'] == 2
-        assert stats['failed_entities'] == 0
-        assert stats['partial_entities'] == 0
-        assert stats['success_rate_percent'] == 100.0
-        assert stats['total_api_responses'] == 8  # 5 + 3
-        assert stats['total_results_retrieved'] == 200  # 125 + 75
-        assert stats['average_results_per_entity'] == 100.0  # 200 / 2
-    
-    def test_calculate_summary_statistics_with_mixed_results_calculates_correct_percentages(self):
-        """
-        Test that mixed successful and failed entities calculate correct success rate
-        """
-        # Arrange
-        results = {
-            'entities': [
-                {
-                    'entity_id': 'author_001',
-                    'status': 'completed',
-                    'pages_processed': 5,
-                    'total_results': 125,
-                    'errors': []
-                },
-                {
-                    'entity_id': 'author_002',
-                    'status': 'failed',
-                    'pages_processed': 2,
-                    'total_results': 50,
-                    'errors': [{'type': 'APIError', 'message': 'Rate limit exceeded'}]
-                },
-                {
-                    'entity_id': 'author_003',
-                    'status': 'partial',
-                    'pages_processed': 3,
-                    'total_results': 75,
-                    'errors': [{'type': 'TimeoutError', 'message': 'Request timeout'}]
-                }
-            ]
-        }
-        
-        # Act
-        stats = self.manifest_generator.calculate_summary_statistics(results)
-        
-        # Assert
-        assert stats['total_entities'] == 3
-        assert stats['successful_entities'] == 1
-        assert stats['failed_entities'] == 1
-        assert stats['partial_entities'] == 1
-        assert stats['success_rate_percent'] == 33.33  # 1/3 * 100, rounded to 2 dp
-        assert stats['total_api_responses'] == 10  # 5 + 2 + 3
-        assert stats['total_results_retrieved'] == 250  # 125 + 50 + 75
-    
-    def test_calculate_summary_statistics_with_no_entities_returns_zero_statistics(self):
-        """
-        Test that empty entities list returns zero statistics
-        """
-        # Arrange
-        results = {'entities': []}
-        
-        # Act
-        stats = self.manifest_generator.calculate_summary_statistics(results)
-        
-        # Assert
-        assert stats['total_entities'] == 0
-        assert stats['successful_entities'] == 0
-        assert stats['failed_entities'] == 0
-        assert stats['success_rate_percent'] == 0.0
-        assert stats['total_api_responses'] == 0
-        assert stats['total_results_retrieved'] == 0
-        assert stats['average_results_per_entity'] == 0.0
-    
-    def test_calculate_summary_statistics_with_processing_duration_calculates_time_correctly(self):
+    @pytest.mark.parametrize("results,expected", SUMMARY_STATISTICS_CASES)
+    def test_calculate_summary_statistics_returns_expected_statistics(self, manifest_generator, results, expected):
         """
-        Test that processing duration is calculated correctly from start and end times
+        Test that summary statistics match the expected values for each case
         """
-        # Arrange
-        start_time = self.base_time
-        end_time = self.base_time + timedelta(minutes=30)  # 30 minutes = 1800 seconds
-        
-        results = {
-            'start_time': start_time,
-            'end_time': end_time,
-            'entities': [
-                {
-                    'entity_id': 'author_001',
-                    'status': 'completed',
-                    'pages_processed': 2,
-                    'total_results': 50,
-                    'errors': []
-                }
-            ]
-        }
-        
         # Act
-        stats = self.manifest_generator.calculate_summary_statistics(results)
+        stats = manifest_generator.calculate_summary_statistics(results)
         
         # Assert
-        duration = stats['processing_duration']
-        assert duration['total_seconds'] == 1800.0
-        assert duration['average_seconds_per_entity'] == 1800.0  # 1800 / 1 entity
-        assert duration['start_time'] == start_time.isoformat()
-        assert duration['end_time'] == end_time.isoformat()
+        for key, value in expected.items():
+            assert stats[key] == value, key
     
-    def test_calculate_summary_statistics_with_multiple_entities_calculates_average_duration(self):
-        """
-        Test that average processing time per entity is calculated correctly
-        """
-        # Arrange
-        start_time = self.base_time
-        end_time = self.base_time + timedelta(minutes=60)  # 60 minutes = 3600 seconds
-        
-        results = {
-            'start_time': start_time,
-            'end_time': end_time,
-            'entities': [
-                {
-                    'entity_id': 'author_001',
-                    'status': 'completed',
-                    'pages_processed': 2,
-                    'total_results': 50,
-                    'errors': []
-                },
-                {
-                    'entity_id': 'author_002',
-                    'status': 'completed',
-                    'pages_processed': 3,
-                    'total_results': 75,
-                    'errors': []
-                }
-            ]
-        }
-        
-        # Act
-        stats = self.manifest_generator.calculate_summary_statistics(results)
-        
-        # Assert
-        duration = stats['processing_duration']
-        assert duration['total_seconds'] == 3600.0
-        assert duration['average_seconds_per_entity'] == 1800.0  # 3600 / 2 entities
-    
-    def test_calculate_summary_statistics_with_errors_calculates_error_statistics(self):
+    def test_calculate_summary_statistics_with_errors_calculates_error_statistics(self, manifest_generator):
         """
         Test that error statistics are calculated correctly
         """
-        # Arrange
-        results = {
-            'entities': [
-                {
-                    'entity_id': 'author_001',
-                    'status': 'completed',
-                    'pages_processed': 5,
-                    'total_results': 125,
-                    'errors': []
-                },
-                {
-                    'entity_id': 'author_002',
-                    'status': 'failed',
-                    'pages_processed': 2,
-                    'total_results': 50,
-                    'errors': [
-                        {'type': 'APIError', 'message': 'Rate limit exceeded'},
-                        {'type': 'APIError', 'message': 'Invalid response'}
-                    ]
-                },
-                {
-                    'entity_id': 'author_003',
-                    'status': 'partial',
-                    'pages_processed': 3,
-                    'total_results': 75,
-                    'errors': [
-                        {'type': 'TimeoutError', 'message': 'Request timeout'}
-                    ]
-                }
-            ]
-        }
-        
         # Act
-        stats = self.manifest_generator.calculate_summary_statistics(results)
+        stats = manifest_generator.calculate_summary_statistics(_ERROR_RESULTS)
         
         # Assert
         error_summary = stats['error_summary']
@@ -321,25 +406,12 @@ class TestManifestGenerator:
         assert error_summary['error_types']['APIError'] == 2
         assert error_summary['error_types']['TimeoutError'] == 1
     
-    def test_calculate_summary_statistics_with_no_errors_returns_empty_error_statistics(self):
+    def test_calculate_summary_statistics_with_no_errors_returns_empty_error_statistics(self, manifest_generator):
         """
         Test that entities with no errors return empty error statistics
         """
-        # Arrange
-        results = {
-            'entities': [
-                {
-                    'entity_id': 'author_001',
-                    'status': 'completed',
-                    'pages_processed': 5,
-                    'total_results': 125,
-                    'errors': []
-                }
-            ]
-        }
-        
         # Act
-        stats = self.manifest_generator.calculate_summary_statistics(results)
+        stats = manifest_generator.calculate_summary_statistics(_NO_ERROR_RESULTS)
         
         # Assert
         error_summary = stats['error_summary']
@@ -351,43 +423,8 @@ class TestManifestGenerator:
         """
         Test that entity details are formatted correctly with processing time and error details
         """
-        # Arrange
-        entity_start = self.base_time
-        entity_end = self.base_time + timedelta(minutes=15)  # 15 minutes = 900 seconds
-        
-        processing_results = {
-            'load_id': 'test_load_123',
-            'data_source': 'scopus_search',
-            'entities': [
-                {
-                    'entity_id': 'author_001',
-                    'status': 'completed',
-                    'pages_processed': 5,
-                    'total_results': 125,
-                    'errors': [],
-                    'start_time': entity_start,
-                    'end_time': entity_end
-                },
-                {
-                    'entity_id': 'author_002',
-                    'status': 'failed',
-                    'pages_processed': 2,
-                    'total_results': 50,
-                    'errors': [
-                        {
-                            'type': 'APIError',
-                            'message': 'Rate limit exceeded',
-                            'page_num': 3
-                        }
-                    ],
-                    'start_time': entity_start,
-                    'end_time': entity_end
-                }
-            ]
-        }
-        
         # Act
-        manifest = self.manifest_generator.generate_manifest_data(processing_results)
+        manifest = _manifest_for('entity_details')
         
         # Assert
         entity_details = manifest['entity_details']
@@ -418,24 +455,8 @@ class TestManifestGenerator:
         """
         Test that entities without start/end times return zero processing duration
         """
-        # Arrange
-        processing_results = {
-            'load_id': 'test_load_123',
-            'data_source': 'scopus_search',
-            'entities': [
-                {
-                    'entity_id': 'author_001',
-                    'status': 'completed',
-                    'pages_processed': 5,
-                    'total_results': 125,
-                    'errors': []
-                    # Missing start_time and end_time
-                }
-            ]
-        }
-        
         # Act
-        manifest = self.manifest_generator.generate_manifest_data(processing_results)
+        manifest = _manifest_for('missing_timestamps')
         
         # Assert
         entity_details = manifest['entity_details']
@@ -445,27 +466,13 @@ class TestManifestGenerator:
         """
         Test that generated manifest contains valid UUID and ISO timestamp
         """
-        # Arrange
-        processing_results = {
-            'load_id': 'test_load_123',
-            'data_source': 'scopus_search',
-            'entities': []
-        }
-        
         # Act
-        manifest = self.manifest_generator.generate_manifest_data(processing_results)
+        manifest = _manifest_for('no_entities')
         
         # Assert
-        # Check UUID format (36 characters with hyphens)
+        # Check UUID format (raises ValueError if invalid)
         manifest_id = manifest['manifest_id']
-        assert len(manifest_id) == 36
-        assert manifest_id.count('-') == 4
-        
-        # Check ISO timestamp format
-        timestamp = manifest['generated_timestamp']
-        assert 'T' in timestamp
-        assert timestamp.endswith('Z') or '+' in timestamp or '-' in timestamp[-6:]
+        assert str(uuid.UUID(manifest_id)) == manifest_id
         
-        # Verify it can be parsed as datetime
-        parsed_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        assert isinstance(parsed_time, datetime)
\ No newline at end of file
+        # Check ISO timestamp format with timezone offset
+        assert _ISO_TIMESTAMP_RE.fullmatch(manifest['generated_timestamp'])
@@ -1,75 +1,30 @@
 """
 Test suite for PaginationStrategy components
 Following TDD approach with AAA pattern and descriptive naming
+Tests are pure (no I/O, shared fixtures are read-only) and safe for pytest -n auto
 """
 
+import math
 import pytest
-from unittest.mock import Mock
 from api_adapter.pagination_strategy import (
     PaginationStrategy, OffsetLimitPagination, PageBasedPagination, 
-    CursorBasedPagination, PaginationFactory, APIResponse
+    CursorBasedPagination, PaginationFactory
 )
 
 
 class TestOffsetLimitPagination:
     """Test suite for offset-based pagination strategy"""
     
-    def test_get_next_page_params_with_first_page_returns_zero_offset(self):
+    @pytest.mark.parametrize("page_num,expected_start", [(1, 0), (2, 25), (3, 50)])
+    def test_get_next_page_params_returns_offset_for_page(self, offset_pagination, page_num, expected_start):
         """
-        Test that first page request returns start=0 and correct count
+        Test that each page request calculates the correct offset with 25 items per page
         """
-        # Arrange
-        config = {
-            'items_per_page': 25,
-            'start_param': 'start',
-            'count_param': 'count'
-        }
-        pagination = OffsetLimitPagination(config)
-        current_params = {}
-        
         # Act
-        result = pagination.get_next_page_params(current_params, None, 1)
+        result = offset_pagination.get_next_page_params({}, None, page_num)
         
         # Assert
-        assert result == {'start': 0, 'count': 25}
-    
-    def test_get_next_page_params_with_second_page_returns_correct_offset(self):
-        """
-        Test that second page request calculates correct offset
-        """
-        # Arrange
-        config = {
-            'items_per_page': 25,
-            'start_param': 'start',
-            'count_param': 'count'
-        }
-        pagination = OffsetLimitPagination(config)
-        current_params = {}
-        
-        # Act
-        result = pagination.get_next_page_params(current_params, None, 2)
-        
-        # Assert
-        assert result == {'start': 25, 'count': 25}
-    
-    def test_get_next_page_params_with_third_page_returns_correct_offset(self):
-        """
-        Test that third page with 25 items per page returns start=50
-        """
-        # Arrange
-        config = {
-            'items_per_page': 25,
-            'start_param': 'start',
-            'count_param': 'count'
-        }
-        pagination = OffsetLimitPagination(config)
-        current_params = {}
-        
-        # Act
-        result = pagination.get_next_page_params(current_params, None, 3)
-        
-        # Assert
-        assert result == {'start': 50, 'count': 25}
+        assert result == {'start': expected_start, 'count': 25}
     
     def test_get_next_page_params_with_custom_parameter_names_uses_correct_keys(self):
         """
@@ -90,107 +45,104 @@ class TestOffsetLimitPagination:
         # Assert
         assert result == {'offset': 50, 'limit': 50}
     
-    def test_get_next_page_params_when_offset_exceeds_total_returns_none(self):
+    def test_get_next_page_params_when_offset_exceeds_total_returns_none(self, api_response_factory, offset_pagination):
         """
         Test that pagination stops when offset exceeds total results
         """
-        # Arrange
-        config = {
-            'items_per_page': 25,
-            'start_param': 'start',
-            'count_param': 'count'
-        }
-        pagination = OffsetLimitPagination(config)
-        
-        # Mock response with total results
-        mock_response = Mock(spec=APIResponse)
-        mock_response.metadata = {'total_results': 50}
+        # Arrange - mock response with total results
+        mock_response = api_response_factory(metadata={'total_results': 50})
         
         # Act - page 3 would start at index 50, which equals total results
-        result = pagination.get_next_page_params({}, mock_response, 3)
+        result = offset_pagination.get_next_page_params({}, mock_response, 3)
         
         # Assert
         assert result is None
     
-    def test_extract_total_results_with_valid_scopus_response_returns_integer(self):
-        """
-        Test extraction of total results from Scopus-style response
+    @pytest.mark.parametrize("total_results_path,raw_data,expected", [
+        pytest.param(
+            'search-results.opensearch:totalResults',
+            {'search-results': {'opensearch:totalResults': '150', 'entry': []}},
+            150,
+            id="scopus-style"
+        ),
+        pytest.param(
+            'search-results.opensearch:totalResults',
+            {'search-results': {'entry': []}},
+            None,
+            id="missing-field"
+        ),
+        pytest.param(
+            'results.metadata.totalCount',
+            {'results': {'metadata': {'totalCount': 75}, 'data': []}},
+            75,
+            id="nested-path"
+        ),
+    ])
+    def test_extract_total_results_follows_configured_path(self, api_response_factory, total_results_path, raw_data, expected):
+        """
+        Test extraction of total results for Scopus-style, missing and deeply nested paths
         """
         # Arrange
         config = {
             'items_per_page': 25,
             'start_param': 'start',
-            'total_results_path': 'search-results.opensearch:totalResults'
+            'total_results_path': total_results_path
         }
         pagination = OffsetLimitPagination(config)
-        
-        mock_response = Mock(spec=APIResponse)
-        mock_response.raw_data = {
-            'search-results': {
-                'opensearch:totalResults': '150',
-                'entry': []
-            }
-        }
+        mock_response = api_response_factory(raw_data=raw_data)
         
         # Act
         result = pagination.extract_total_results(mock_response)
         
         # Assert
-        assert result == 150
+        assert result == expected
+
     
-    def test_extract_total_results_with_missing_field_returns_none(self):
+    @pytest.mark.parametrize("total,per_page", [(100, 25), (101, 25), (1_000_000, 1000)])
+    def test_get_next_page_params_walks_monotonic_offsets_until_total(self, api_response_factory, total, per_page):
         """
-        Test that missing total results field returns None
+        Test that offsets increase by one page each call and stop exactly at total results
+        Offset paging re-scans skipped rows server side, so prefer cursor-based for very large collections
         """
         # Arrange
-        config = {
-            'items_per_page': 25,
-            'start_param': 'start',
-            'total_results_path': 'search-results.opensearch:totalResults'
-        }
-        pagination = OffsetLimitPagination(config)
-        
-        mock_response = Mock(spec=APIResponse)
-        mock_response.raw_data = {
-            'search-results': {
-                'entry': []
-                # missing opensearch:totalResults
-            }
-        }
+        pagination = OffsetLimitPagination({'items_per_page': per_page, 'start_param': 'start'})
+        mock_response = api_response_factory(metadata={'total_results': total})
+        starts = []
         
         # Act
-        result = pagination.extract_total_results(mock_response)
+        page_num = 1
+        while (params := pagination.get_next_page_params({}, mock_response, page_num)) is not None:
+            starts.append(params['start'])
+            page_num += 1
         
         # Assert
-        assert result is None
+        assert len(starts) == math.ceil(total / per_page)
+        assert starts == list(range(0, total, per_page))
     
-    def test_extract_total_results_with_nested_path_extracts_correctly(self):
+    @pytest.mark.parametrize("raw_data", [
+        pytest.param({'search-results': {'opensearch:totalResults': '150', 'entry': []}}, id="present"),
+        pytest.param({'search-results': {'entry': []}}, id="missing_field"),
+        pytest.param({}, id="missing_root"),
+    ])
+    def test_precomputed_path_matches_dotted_path(self, api_response_factory, offset_pagination, scopus_offset_config, raw_data):
         """
-        Test extraction from deeply nested response structure
+        Test that the precomputed path keys resolve the same value as walking the dotted path
         """
         # Arrange
-        config = {
-            'items_per_page': 25,
-            'start_param': 'start',
-            'total_results_path': 'results.metadata.totalCount'
-        }
-        pagination = OffsetLimitPagination(config)
-        
-        mock_response = Mock(spec=APIResponse)
-        mock_response.raw_data = {
-            'results': {
-                'metadata': {
-                    'totalCount': 75
-                },
-                'data': []
-            }
-        }
+        mock_response = api_response_factory(raw_data=raw_data)
+        expected = raw_data
+        try:
+            for part in scopus_offset_config['total_results_path'].split('.'):
+                expected = expected[part]
+            expected = int(expected)
+        except KeyError:
+            expected = None
         
         # Act
-        result = pagination.extract_total_results(mock_response)
+        result = offset_pagination.extract_total_results(mock_response)
         
         # Assert
-        assert result == 75
+        assert result == expected
 
 
 class TestPageBasedPagination:
@@ -232,7 +184,7 @@ class TestPageBasedPagination:
         # Assert
         assert result == {'page': 5, 'pageSize': 50}
     
-    def test_get_next_page_params_when_exceeding_max_pages_returns_none(self):
+    def test_get_next_page_params_when_exceeding_max_pages_returns_none(self, api_response_factory):
         """
         Test that pagination stops when exceeding calculated max pages
         """
@@ -245,8 +197,7 @@ class TestPageBasedPagination:
         }
         pagination = PageBasedPagination(config)
         
-        mock_response = Mock(spec=APIResponse)
-        mock_response.raw_data = {'totalResults': 75}  # 3 pages of 25 items each
+        mock_response = api_response_factory(raw_data={'totalResults': 75})  # 3 pages of 25 items each
         
         # Act - requesting page 4 when only 3 pages exist
         result = pagination.get_next_page_params({}, mock_response, 4)
@@ -254,7 +205,7 @@ class TestPageBasedPagination:
         # Assert
         assert result is None
     
-    def test_extract_total_results_with_direct_path_returns_value(self):
+    def test_extract_total_results_with_direct_path_returns_value(self, api_response_factory):
         """
         Test extraction of total results from simple path
         """
@@ -266,8 +217,7 @@ class TestPageBasedPagination:
         }
         pagination = PageBasedPagination(config)
         
-        mock_response = Mock(spec=APIResponse)
-        mock_response.raw_data = {'totalResults': 200}
+        mock_response = api_response_factory(raw_data={'totalResults': 200})
         
         # Act
         result = pagination.extract_total_results(mock_response)
@@ -298,7 +248,7 @@ class TestCursorBasedPagination:
         assert result == {'limit': 50}
         assert 'cursor' not in result
     
-    def test_get_next_page_params_with_subsequent_page_uses_cursor_from_response(self):
+    def test_get_next_page_params_with_subsequent_page_uses_cursor_from_response(self, api_response_factory):
         """
         Test that subsequent pages use cursor from previous response
         """
@@ -311,11 +261,10 @@ class TestCursorBasedPagination:
         }
         pagination = CursorBasedPagination(config)
         
-        mock_response = Mock(spec=APIResponse)
-        mock_response.raw_data = {
+        mock_response = api_response_factory(raw_data={
             'pagination': {'nextCursor': 'abc123def456'},
             'data': ['item1', 'item2']
-        }
+        })
         
         # Act
         result = pagination.get_next_page_params({}, mock_response, 2)
@@ -323,7 +272,7 @@ class TestCursorBasedPagination:
         # Assert
         assert result == {'cursor': 'abc123def456', 'limit': 50}
     
-    def test_get_next_page_params_with_no_next_cursor_returns_none(self):
+    def test_get_next_page_params_with_no_next_cursor_returns_none(self, api_response_factory):
         """
         Test that pagination stops when no next cursor is available
         """
@@ -336,11 +285,10 @@ class TestCursorBasedPagination:
         }
         pagination = CursorBasedPagination(config)
         
-        mock_response = Mock(spec=APIResponse)
-        mock_response.raw_data = {
+        mock_response = api_response_factory(raw_data={
             'pagination': {'nextCursor': None},  # No more pages
             'data': ['item1']
-        }
+        })
         
         # Act
         result = pagination.get_next_page_params({}, mock_response, 2)
@@ -348,7 +296,7 @@ class TestCursorBasedPagination:
         # Assert
         assert result is None
     
-    def test_extract_total_results_returns_none(self):
+    def test_extract_total_results_returns_none(self, api_response_factory):
         """
         Test that cursor-based pagination doesn't provide total count upfront
         """
@@ -360,8 +308,7 @@ class TestCursorBasedPagination:
         }
         pagination = CursorBasedPagination(config)
         
-        mock_response = Mock(spec=APIResponse)
-        mock_response.raw_data = {'data': ['item1', 'item2']}
+        mock_response = api_response_factory(raw_data={'data': ['item1', 'item2']})
         
         # Act
         result = pagination.extract_total_results(mock_response)
@@ -373,56 +320,32 @@ class TestCursorBasedPagination:
 class TestPaginationFactory:
     """Test suite for pagination strategy factory"""
     
-    def test_create_strategy_with_offset_limit_returns_offset_pagination(self):
+    @pytest.mark.parametrize("config,expected_class", [
+        pytest.param(
+            {'strategy': 'offset_limit', 'items_per_page': 25, 'start_param': 'start'},
+            OffsetLimitPagination,
+            id="offset_limit"
+        ),
+        pytest.param(
+            {'strategy': 'page_based', 'items_per_page': 100, 'page_param': 'page'},
+            PageBasedPagination,
+            id="page_based"
+        ),
+        pytest.param(
+            {'strategy': 'cursor_based', 'items_per_page': 50, 'cursor_param': 'cursor'},
+            CursorBasedPagination,
+            id="cursor_based"
+        ),
+    ])
+    def test_create_strategy_returns_strategy_for_configured_type(self, config, expected_class):
+        """
+        Test that factory creates the strategy class matching the configured strategy
         """
-        Test that factory creates OffsetLimitPagination for offset_limit strategy
-        """
-        # Arrange
-        config = {
-            'strategy': 'offset_limit',
-            'items_per_page': 25,
-            'start_param': 'start'
-        }
-        
-        # Act
-        result = PaginationFactory.create_strategy(config)
-        
-        # Assert
-        assert isinstance(result, OffsetLimitPagination)
-    
-    def test_create_strategy_with_page_based_returns_page_pagination(self):
-        """
-        Test that factory creates PageBasedPagination for page_based strategy
-        """
-        # Arrange
-        config = {
-            'strategy': 'page_based',
-            'items_per_page': 100,
-            'page_param': 'page'
-        }
-        
         # Act
         result = PaginationFactory.create_strategy(config)
         
         # Assert
-        assert isinstance(result, PageBasedPagination)
-    
-    def test_create_strategy_with_cursor_based_returns_cursor_pagination(self):
-        """
-        Test that factory creates CursorBasedPagination for cursor_based strategy
-        """
-        # Arrange
-        config = {
-            'strategy': 'cursor_based',
-            'items_per_page': 50,
-            'cursor_param': 'cursor'
-        }
-        
-        # Act
-        result = PaginationFactory.create_strategy(config)
-        
-        # Assert
-        assert isinstance(result, CursorBasedPagination)
+        assert isinstance(result, expected_class)
     
     def test_create_strategy_with_unsupported_strategy_raises_value_error(self):
         """
@@ -453,4 +376,32 @@ class TestPaginationFactory:
         
         # Act & Assert
         with pytest.raises(KeyError):
-            PaginationFactory.create_strategy(config)
\ No newline at end of file
+            PaginationFactory.create_strategy(config)
+    
+    def test_create_strategy_with_repeated_stateless_config_returns_same_instance(self):
+        """
+        Test that identical stateless configs reuse the previously built strategy
+        """
+        # Arrange
+        config = {'strategy': 'offset_limit', 'items_per_page': 25, 'start_param': 'start'}
+        
+        # Act
+        result1 = PaginationFactory.create_strategy(config)
+        result2 = PaginationFactory.create_strategy(dict(config))
+        
+        # Assert
+        assert result1 is result2
+    
+    def test_create_strategy_with_cursor_config_returns_fresh_instance(self):
+        """
+        Test that cursor strategies are never shared because they track the current cursor
+        """
+        # Arrange
+        config = {'strategy': 'cursor_based', 'items_per_page': 50, 'cursor_param': 'cursor'}
+        
+        # Act
+        result1 = PaginationFactory.create_strategy(config)
+        result2 = PaginationFactory.create_strategy(config)
+        
+        # Assert
+        assert result1 is not result2
\ No newline at end of file
@@ -1,195 +1,180 @@
 """
 Test suite for PayloadValidator component
 Following TDD approach with AAA pattern and descriptive naming
+Tests are pure (no I/O, shared fixtures are read-only) and safe for pytest -n auto
 """
 
 import pytest
 from unittest.mock import Mock
-from api_adapter.payload_validator import PayloadValidator
 from api_adapter.http_client import APIResponse
 from datetime import datetime
 
 
+# Canonical response payloads shared read-only across tests
+SCOPUS_PARTIAL_PAGE_PAYLOAD = {
+    'search-results': {
+        'opensearch:totalResults': '25',
+        'entry': [{'id': '1'}, {'id': '2'}]
+    }
+}
+
+SCOPUS_MISMATCHED_COUNT_PAYLOAD = {
+    'search-results': {
+        'opensearch:totalResults': '50',
+        'entry': [{'id': '1'}, {'id': '2'}]
+    }
+}
+
+SCOPUS_MISSING_TOTAL_PAYLOAD = {
+    'search-results': {
+        'entry': [{'id': '1'}, {'id': '2'}]
+    }
+}
+
+SCOPUS_SINGLE_ENTRY_PAYLOAD = {
+    'search-results': {
+        'entry': [{'id': '1'}],
+        'opensearch:totalResults': '25'
+    }
+}
+
+SCOPUS_ZERO_RESULTS_PAYLOAD = {
+    'search-results': {
+        'opensearch:totalResults': '0',
+        'entry': []
+    }
+}
+
+SCOPUS_MISSING_ENTRY_PAYLOAD = {
+    'search-results': {
+        'opensearch:totalResults': '0'
+    }
+}
+
+SCOPUS_SINGLE_ENTRY_MISMATCHED_PAYLOAD = {
+    'search-results': {
+        'opensearch:totalResults': '50',
+        'entry': [{'id': '1'}]
+    }
+}
+
+NESTED_THREE_ITEM_PAYLOAD = {
+    'results': {
+        'metadata': {
+            'totalCount': '3'
+        },
+        'data': [{'id': '1'}, {'id': '2'}, {'id': '3'}]
+    }
+}
+
+
+class CountingDict(dict):
+    """Dict that records how many times each key is read with subscription"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = {}
+    
+    def __getitem__(self, key):
+        self.reads[key] = self.reads.get(key, 0) + 1
+        return super().__getitem__(key)
+
+
 class TestPayloadValidator:
     """Test suite for PayloadValidator response validation functionality"""
     
-    def test_validate_response_with_all_validations_enabled_and_passing_returns_true(self):
+    def test_validate_response_with_all_validations_enabled_and_passing_returns_true(self, payload_validator, full_validator_config, scopus_two_entry_payload):
         """
         Test that when all validations are enabled and pass, validate_response returns True
         """
-        # Arrange
-        config = {
-            'response_completeness': True,
-            'rate_limit_headers': True,
-            'empty_response_detection': True,
-            'json_structure_validation': True,
-            'headers': {
-                'total_results_field': 'search-results.opensearch:totalResults',
-                'rate_limit_remaining': 'X-RateLimit-Remaining'
-            }
-        }
-        
-        validator = PayloadValidator(config)
-        
-        # Mock response with valid data - make sure counts match
+        # Arrange - mock response with valid data - make sure counts match
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'opensearch:totalResults': '2',  # Changed to match actual items
-                    'entry': [{'id': '1'}, {'id': '2'}]  # 2 items
-                }
-            },
+            raw_data=scopus_two_entry_payload,
             metadata={'total_results': 2},
             status_code=200,
             headers={'X-RateLimit-Remaining': '95'}
         )
         
         # Act
-        result = validator.validate_response(api_response, config)
+        result = payload_validator.validate_response(api_response, full_validator_config)
         
         # Assert
         assert result is True
     
-    def test_validate_response_with_failing_validation_returns_false(self):
+    def test_validate_response_with_failing_validation_returns_false(self, payload_validator, full_validator_config):
         """
         Test that when any validation fails, validate_response returns False
         """
-        # Arrange
-        config = {
-            'response_completeness': True,
-            'rate_limit_headers': True,
-            'empty_response_detection': True,
-            'json_structure_validation': True,
-            'headers': {
-                'total_results_field': 'search-results.opensearch:totalResults',
-                'rate_limit_remaining': 'X-RateLimit-Remaining'
-            }
-        }
-        
-        validator = PayloadValidator(config)
-        
-        # Mock response with missing rate limit headers
+        # Arrange - mock response with missing rate limit headers
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'opensearch:totalResults': '25',
-                    'entry': [{'id': '1'}, {'id': '2'}]
-                }
-            },
+            raw_data=SCOPUS_PARTIAL_PAGE_PAYLOAD,
             metadata={'total_results': 25},
             status_code=200,
             headers={}  # Missing rate limit headers
         )
         
         # Act
-        result = validator.validate_response(api_response, config)
+        result = payload_validator.validate_response(api_response, full_validator_config)
         
         # Assert
         assert result is False
     
-    def test_validate_response_completeness_with_matching_counts_returns_true(self):
+    def test_validate_response_completeness_with_matching_counts_returns_true(self, payload_validator, completeness_config, scopus_two_entry_payload):
         """
         Test that response completeness validation passes when counts match
         """
         # Arrange
-        config = {
-            'headers': {
-                'total_results_field': 'search-results.opensearch:totalResults'
-            }
-        }
-        
-        validator = PayloadValidator(config)
-        
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'opensearch:totalResults': '2',
-                    'entry': [{'id': '1'}, {'id': '2'}]
-                }
-            },
+            raw_data=scopus_two_entry_payload,
             metadata={},
             status_code=200
         )
         
         # Act
-        result = validator.validate_response_completeness(api_response, config)
+        result = payload_validator.validate_response_completeness(api_response, completeness_config)
         
         # Assert
         assert result is True
     
-    def test_validate_response_completeness_with_mismatched_counts_returns_false(self):
+    def test_validate_response_completeness_with_mismatched_counts_returns_false(self, payload_validator, completeness_config):
         """
         Test that response completeness validation fails when totalResults doesn't match actual items
         """
         # Arrange
-        config = {
-            'headers': {
-                'total_results_field': 'search-results.opensearch:totalResults'
-            }
-        }
-        
-        validator = PayloadValidator(config)
-        
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'opensearch:totalResults': '50',  # Claims 50 results
-                    'entry': [{'id': '1'}, {'id': '2'}]  # But only has 2
-                }
-            },
+            raw_data=SCOPUS_MISMATCHED_COUNT_PAYLOAD,
             metadata={},
             status_code=200
         )
         
         # Act
-        result = validator.validate_response_completeness(api_response, config)
+        result = payload_validator.validate_response_completeness(api_response, completeness_config)
         
         # Assert
         assert result is False
     
-    def test_validate_response_completeness_with_missing_total_results_field_returns_false(self):
+    def test_validate_response_completeness_with_missing_total_results_field_returns_false(self, payload_validator, completeness_config):
         """
         Test that response completeness validation fails when total results field is missing
         """
         # Arrange
-        config = {
-            'headers': {
-                'total_results_field': 'search-results.opensearch:totalResults'
-            }
-        }
-        
-        validator = PayloadValidator(config)
-        
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'entry': [{'id': '1'}, {'id': '2'}]
-                    # Missing opensearch:totalResults
-                }
-            },
+            raw_data=SCOPUS_MISSING_TOTAL_PAYLOAD,
             metadata={},
             status_code=200
         )
         
         # Act
-        result = validator.validate_response_completeness(api_response, config)
+        result = payload_validator.validate_response_completeness(api_response, completeness_config)
         
         # Assert
         assert result is False
     
-    def test_validate_rate_limit_headers_with_present_headers_returns_true(self):
+    def test_validate_rate_limit_headers_with_present_headers_returns_true(self, payload_validator, rate_limit_config):
         """
         Test that rate limit validation passes when required headers are present
         """
         # Arrange
-        config = {
-            'headers': {
-                'rate_limit_remaining': 'X-RateLimit-Remaining'
-            }
-        }
-        
-        validator = PayloadValidator(config)
-        
         api_response = APIResponse(
             raw_data={},
             metadata={},
@@ -198,24 +183,16 @@ class TestPayloadValidator:
         )
         
         # Act
-        result = validator.validate_rate_limit_headers(api_response, config)
+        result = payload_validator.validate_rate_limit_headers(api_response, rate_limit_config)
         
         # Assert
         assert result is True
     
-    def test_validate_rate_limit_headers_with_missing_headers_returns_false(self):
+    def test_validate_rate_limit_headers_with_missing_headers_returns_false(self, payload_validator, rate_limit_config):
         """
         Test that rate limit validation fails when required headers are missing
         """
         # Arrange
-        config = {
-            'headers': {
-                'rate_limit_remaining': 'X-RateLimit-Remaining'
-            }
-        }
-        
-        validator = PayloadValidator(config)
-        
         api_response = APIResponse(
             raw_data={},
             metadata={},
@@ -224,42 +201,33 @@ class TestPayloadValidator:
         )
         
         # Act
-        result = validator.validate_rate_limit_headers(api_response, config)
+        result = payload_validator.validate_rate_limit_headers(api_response, rate_limit_config)
         
         # Assert
         assert result is False
     
-    def test_validate_json_structure_with_valid_structure_returns_true(self):
+    def test_validate_json_structure_with_valid_structure_returns_true(self, payload_validator):
         """
         Test that JSON structure validation passes for well-formed responses
         """
         # Arrange
-        validator = PayloadValidator({})
-        
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'entry': [{'id': '1'}],
-                    'opensearch:totalResults': '25'
-                }
-            },
+            raw_data=SCOPUS_SINGLE_ENTRY_PAYLOAD,
             metadata={},
             status_code=200
         )
         
         # Act
-        result = validator.validate_json_structure(api_response)
+        result = payload_validator.validate_json_structure(api_response)
         
         # Assert
         assert result is True
     
-    def test_validate_json_structure_with_missing_top_level_keys_returns_false(self):
+    def test_validate_json_structure_with_missing_top_level_keys_returns_false(self, payload_validator):
         """
         Test that JSON structure validation fails when expected top-level keys are missing
         """
         # Arrange
-        validator = PayloadValidator({})
-        
         api_response = APIResponse(
             raw_data={},  # Empty response
             metadata={},
@@ -267,18 +235,16 @@ class TestPayloadValidator:
         )
         
         # Act
-        result = validator.validate_json_structure(api_response)
+        result = payload_validator.validate_json_structure(api_response)
         
         # Assert
         assert result is False
     
-    def test_validate_json_structure_with_invalid_json_returns_false(self):
+    def test_validate_json_structure_with_invalid_json_returns_false(self, payload_validator):
         """
         Test that JSON structure validation fails for malformed JSON data
         """
         # Arrange
-        validator = PayloadValidator({})
-        
         api_response = APIResponse(
             raw_data="not valid json",  # String instead of dict
             metadata={},
@@ -286,84 +252,63 @@ class TestPayloadValidator:
         )
         
         # Act
-        result = validator.validate_json_structure(api_response)
+        result = payload_validator.validate_json_structure(api_response)
         
         # Assert
         assert result is False
     
-    def test_detect_empty_response_with_zero_results_returns_true(self):
+    def test_detect_empty_response_with_zero_results_returns_true(self, payload_validator):
         """
         Test that empty response detection correctly identifies responses with no data
         """
         # Arrange
-        validator = PayloadValidator({})
-        
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'opensearch:totalResults': '0',
-                    'entry': []
-                }
-            },
+            raw_data=SCOPUS_ZERO_RESULTS_PAYLOAD,
             metadata={},
             status_code=200
         )
         
         # Act
-        result = validator.detect_empty_response(api_response)
+        result = payload_validator.detect_empty_response(api_response)
         
         # Assert
         assert result is True
     
-    def test_detect_empty_response_with_data_present_returns_false(self):
+    def test_detect_empty_response_with_data_present_returns_false(self, payload_validator, scopus_two_entry_payload):
         """
         Test that empty response detection returns False when data is present
         """
         # Arrange
-        validator = PayloadValidator({})
-        
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'opensearch:totalResults': '2',
-                    'entry': [{'id': '1'}, {'id': '2'}]
-                }
-            },
+            raw_data=scopus_two_entry_payload,
             metadata={},
             status_code=200
         )
         
         # Act
-        result = validator.detect_empty_response(api_response)
+        result = payload_validator.detect_empty_response(api_response)
         
         # Assert
         assert result is False
     
-    def test_detect_empty_response_with_missing_entry_field_returns_true(self):
+    def test_detect_empty_response_with_missing_entry_field_returns_true(self, payload_validator):
         """
         Test that empty response detection handles missing entry fields
         """
         # Arrange
-        validator = PayloadValidator({})
-        
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'opensearch:totalResults': '0'
-                    # Missing 'entry' field
-                }
-            },
+            raw_data=SCOPUS_MISSING_ENTRY_PAYLOAD,
             metadata={},
             status_code=200
         )
         
         # Act
-        result = validator.detect_empty_response(api_response)
+        result = payload_validator.detect_empty_response(api_response)
         
         # Assert
         assert result is True
     
-    def test_validate_response_with_disabled_validations_skips_checks(self):
+    def test_validate_response_with_disabled_validations_skips_checks(self, payload_validator):
         """
         Test that disabled validations are properly skipped
         """
@@ -375,56 +320,103 @@ class TestPayloadValidator:
             'json_structure_validation': True
         }
         
-        validator = PayloadValidator(config)
-        
         # Mock response that would fail completeness and rate limit checks
         api_response = APIResponse(
-            raw_data={
-                'search-results': {
-                    'opensearch:totalResults': '50',  # Mismatched count
-                    'entry': [{'id': '1'}]  # Only 1 item
-                }
-            },
+            raw_data=SCOPUS_SINGLE_ENTRY_MISMATCHED_PAYLOAD,
             metadata={},
             status_code=200,
             headers={}  # Missing rate limit headers
         )
         
         # Act
-        result = validator.validate_response(api_response, config)
+        result = payload_validator.validate_response(api_response, config)
         
         # Assert
         # Should pass because the failing validations are disabled
         assert result is True
     
-    def test_validate_response_completeness_with_nested_path_extracts_correctly(self):
+    @pytest.mark.parametrize("config_key,method_name", [
+        pytest.param('response_completeness', 'validate_response_completeness', id="response_completeness"),
+        pytest.param('rate_limit_headers', 'validate_rate_limit_headers', id="rate_limit_headers"),
+        pytest.param('empty_response_detection', 'detect_empty_response', id="empty_response_detection"),
+        pytest.param('json_structure_validation', 'validate_json_structure', id="json_structure_validation"),
+    ])
+    def test_validate_response_with_disabled_validation_does_not_call_check(self, payload_validator, full_validator_config, monkeypatch, config_key, method_name, scopus_two_entry_payload):
+        """
+        Test that a disabled validation is never invoked by validate_response
+        """
+        # Arrange
+        config = {**full_validator_config, config_key: False}
+        spy = Mock(wraps=getattr(payload_validator, method_name))
+        monkeypatch.setattr(payload_validator, method_name, spy)
+        
+        api_response = APIResponse(
+            raw_data=scopus_two_entry_payload,
+            metadata={},
+            status_code=200,
+            headers={'X-RateLimit-Remaining': '95'}
+        )
+        
+        # Act
+        payload_validator.validate_response(api_response, config)
+        
+        # Assert
+        spy.assert_not_called()
+    
+    def test_validate_response_with_failing_cheap_check_skips_completeness(self, payload_validator, full_validator_config, monkeypatch, scopus_two_entry_payload):
+        """
+        Test that the completeness path walk is skipped once a cheaper validation fails
+        """
+        # Arrange
+        spy = Mock(wraps=payload_validator.validate_response_completeness)
+        monkeypatch.setattr(payload_validator, 'validate_response_completeness', spy)
+        
+        api_response = APIResponse(
+            raw_data=scopus_two_entry_payload,
+            metadata={},
+            status_code=200,
+            headers={}  # Missing rate limit headers
+        )
+        
+        # Act
+        result = payload_validator.validate_response(api_response, full_validator_config)
+        
+        # Assert
+        assert result is False
+        spy.assert_not_called()
+    
+    def test_validate_response_completeness_with_nested_path_extracts_correctly(self, payload_validator, nested_path_config):
         """
         Test that response completeness validation can extract total results from nested paths
         """
         # Arrange
-        config = {
-            'headers': {
-                'total_results_field': 'results.metadata.totalCount'
-            }
-        }
+        api_response = APIResponse(
+            raw_data=NESTED_THREE_ITEM_PAYLOAD,
+            metadata={},
+            status_code=200
+        )
         
-        validator = PayloadValidator(config)
+        # Act
+        result = payload_validator.validate_response_completeness(api_response, nested_path_config)
         
+        # Assert
+        assert result is True
+    
+    def test_validate_completeness_uses_single_traversal(self, payload_validator, completeness_config, scopus_two_entry_payload):
+        """
+        Test that completeness validation reads the container node once for both total and item count
+        """
+        # Arrange
+        raw_data = CountingDict(scopus_two_entry_payload)
         api_response = APIResponse(
-            raw_data={
-                'results': {
-                    'metadata': {
-                        'totalCount': '3'
-                    },
-                    'data': [{'id': '1'}, {'id': '2'}, {'id': '3'}]
-                }
-            },
+            raw_data=raw_data,
             metadata={},
             status_code=200
         )
         
         # Act
-        result = validator.validate_response_completeness(api_response, config)
+        result = payload_validator.validate_response_completeness(api_response, completeness_config)
         
         # Assert
-        assert result is True
\ No newline at end of file
+        assert result is True
+        assert raw_data.reads == {'search-results': 1}
\ No newline at end of file
@@ -110,7 +110,7 @@ class TestRecoveryManager:
         recovery_manager = RecoveryManager(mock_state_manager, mock_file_hasher)
         
         # Mock file existence and validation
-        with patch('pathlib.Path.exists', return_value=True), \
+        with patch.object(recovery_manager, '_list_directory', return_value={"file1.json", "file2.json", "file3.json"}), \
              patch.object(recovery_manager, '_validate_file_integrity', return_value=True):
             
             # Act
@@ -265,6 +265,34 @@ class TestRecoveryManager:
         assert len(saved_state.errors) == 1
         assert saved_state.errors[0]["page_number"] == 2
     
+    def test_restart_from_page_with_out_of_order_file_names_keeps_earlier_pages(self):
+        """
+        Test that files from pages before the restart page are kept even when recorded after later pages
+        """
+        # Arrange
+        mock_state_manager = Mock(spec=StateManager)
+        mock_file_hasher = Mock(spec=FileHasher)
+        
+        mock_state_manager.load_state.return_value = ProcessingState(
+            entity_id="author_123",
+            load_id="test_load",
+            file_names=["page1.json", "page4.json", "page2.json", "page3.json"],
+            file_hashes={
+                "page1.json": "hash1", "page2.json": "hash2",
+                "page3.json": "hash3", "page4.json": "hash4"
+            }
+        )
+        
+        recovery_manager = RecoveryManager(mock_state_manager, mock_file_hasher)
+        
+        # Act
+        recovery_manager.restart_from_page("author_123", "test_load", 3)
+        
+        # Assert
+        saved_state = mock_state_manager.save_state.call_args[0][0]
+        assert saved_state.file_names == ["page1.json", "page2.json"]
+        assert saved_state.file_hashes == {"page1.json": "hash1", "page2.json": "hash2"}
+    
     def test_restart_from_page_with_missing_state_handles_gracefully(self):
         """
         Test that restart_from_page handles missing state without errors
@@ -301,11 +329,13 @@ class TestRecoveryManager:
         mock_file = Mock()
         mock_file.__enter__ = Mock(return_value=mock_file)
         mock_file.__exit__ = Mock(return_value=None)
+        mock_file.read.return_value = b'{"data": "test_content"}'
         
         with patch('builtins.open', return_value=mock_file), \
-             patch('json.load', return_value=mock_file_content):
+             patch('orjson.loads', return_value=mock_file_content):
             
-            # Set up the mock to return the expected hash
+            # Set up the mock to return the expected hash from the parsed content
+            mock_file_hasher.generate_bytes_hash.return_value = "raw_bytes_hash"
             mock_file_hasher.generate_content_hash.return_value = expected_hash
             
             # Act
@@ -331,7 +361,7 @@ class TestRecoveryManager:
         mock_file_content = {"data": "corrupted_content"}
         
         with patch('pathlib.Path.open', create=True) as mock_open, \
-             patch('json.load', return_value=mock_file_content):
+             patch('orjson.loads', return_value=mock_file_content):
             
             mock_file_hasher.generate_content_hash.return_value = "different_hash_456"
             
@@ -361,4 +391,114 @@ class TestRecoveryManager:
             result = recovery_manager._validate_file_integrity(test_file_path, expected_hash)
             
             # Assert
-            assert result is False
\ No newline at end of file
+            assert result is False
+    
+    def test_validate_file_integrity_with_canonical_file_matches_without_parsing(self, tmp_path):
+        """
+        Test that a file written in canonical JSON form validates from its raw bytes alone
+        """
+        # Arrange
+        mock_state_manager = Mock(spec=StateManager)
+        recovery_manager = RecoveryManager(mock_state_manager, FileHasher())
+        
+        content = {"b": 2, "a": 1}
+        test_file_path = tmp_path / "page1.json"
+        test_file_path.write_text('{"a": 1, "b": 2}')
+        expected_hash = FileHasher.generate_content_hash(content)
+        
+        with patch('orjson.loads') as mock_loads:
+            
+            # Act
+            result = recovery_manager._validate_file_integrity(test_file_path, expected_hash)
+            
+            # Assert
+            assert result is True
+            mock_loads.assert_not_called()
+    
+    def test_validate_existing_files_with_many_files_checks_each_integrity(self, tmp_path):
+        """
+        Test that concurrent integrity checks report a single corrupted file among many
+        """
+        # Arrange
+        mock_state_manager = Mock(spec=StateManager)
+        recovery_manager = RecoveryManager(mock_state_manager, FileHasher())
+        
+        file_names = []
+        file_hashes = {}
+        for page in range(1, 11):
+            content = {"page": page}
+            file_path = tmp_path / f"page{page}.json"
+            file_path.write_text('{"page": %d}' % page)
+            file_names.append(str(file_path))
+            file_hashes[str(file_path)] = FileHasher.generate_content_hash(content)
+        
+        (tmp_path / "page7.json").write_text('{"page": "corrupted"}')
+        
+        mock_state_manager.load_state.return_value = ProcessingState(
+            entity_id="author_123",
+            load_id="test_load",
+            file_names=file_names,
+            file_hashes=file_hashes
+        )
+        
+        # Act
+        result = recovery_manager.validate_existing_files("author_123", "test_load")
+        
+        # Assert
+        assert result is False
+    
+    def test_recovery_operations_reload_state_saved_elsewhere(self):
+        """
+        Test that each recovery operation reads the current state from the state manager
+        """
+        # Arrange
+        mock_state_manager = Mock(spec=StateManager)
+        mock_file_hasher = Mock(spec=FileHasher)
+        
+        mock_state_manager.load_state.side_effect = [
+            ProcessingState(
+                entity_id="author_123",
+                load_id="test_load",
+                errors=[{"page_number": 3, "error": "HTTP 503"}]
+            ),
+            ProcessingState(
+                entity_id="author_123",
+                load_id="test_load",
+                errors=[{"page_number": 3, "error": "HTTP 503"}, {"page_number": 5, "error": "HTTP 500"}]
+            )
+        ]
+        
+        recovery_manager = RecoveryManager(mock_state_manager, mock_file_hasher)
+        
+        # Act
+        first_result = recovery_manager.identify_failed_pages("author_123", "test_load")
+        second_result = recovery_manager.identify_failed_pages("author_123", "test_load")
+        
+        # Assert
+        assert first_result == [3]
+        assert second_result == [3, 5]
+    
+    def test_restart_from_page_with_failed_save_does_not_keep_changes(self):
+        """
+        Test that a restart whose save raises leaves later operations reading the stored state
+        """
+        # Arrange
+        mock_state_manager = Mock(spec=StateManager)
+        mock_file_hasher = Mock(spec=FileHasher)
+        
+        mock_state_manager.load_state.side_effect = lambda entity_id, load_id: ProcessingState(
+            entity_id=entity_id,
+            load_id=load_id,
+            errors=[{"page_number": 3, "error": "HTTP 503"}]
+        )
+        mock_state_manager.save_state.side_effect = RuntimeError("write failed")
+        
+        recovery_manager = RecoveryManager(mock_state_manager, mock_file_hasher)
+        
+        # Act
+        with pytest.raises(RuntimeError):
+            recovery_manager.restart_from_page("author_123", "test_load", 3)
+        result = recovery_manager.identify_failed_pages("author_123", "test_load")
+        
+        # Assert
+        assert result == [3]
\ No newline at end of file
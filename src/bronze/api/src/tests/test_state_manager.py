@@ -1,52 +1,57 @@
 """
 Test suite for StateManager component
 Following TDD approach with AAA pattern and descriptive naming
+Tests run against a fresh in-memory DuckDB so the real queries are exercised
 """
 
 import pytest
-import tempfile
-from pathlib import Path
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock
 from datetime import datetime
-from api_adapter.state_manager import StateManager, ProcessingState
+from api_adapter.state_manager import StateManager, ProcessingState, ProcessingProgress
 from api_adapter.database_manager import DatabaseManager
 
 
+def _saved_state(state_manager, **overrides):
+    """Save a processing state for author_456 in test_load_123 and return it"""
+    fields = {
+        'entity_id': 'author_456',
+        'load_id': 'test_load_123',
+        'data_source': 'scopus'
+    }
+    fields.update(overrides)
+    state = ProcessingState(**fields)
+    state_manager.save_state(state)
+    return state
+
+
+def _spy_connection(db_manager):
+    """Wrap the live connection so its calls can be counted while still hitting the database"""
+    db_manager._connection = Mock(wraps=db_manager._connection)
+    return db_manager._connection
+
+
 class TestStateManager:
     """Test suite for StateManager processing state functionality"""
     
-    def test_load_state_with_existing_record_returns_processing_state(self):
+    def test_load_state_with_existing_record_returns_processing_state(self, state_manager, state_db_manager):
         """
         Test that loading existing state returns properly populated ProcessingState object
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager._connection = Mock()
-        
-        # Mock database response
-        mock_result = Mock()
-        mock_result.fetchone.return_value = (
-            'test_load_123',  # load_id
-            'author_456',     # entity_id
-            'scopus',         # data_source
-            2,                # last_page
-            50,               # last_start_index
-            100,              # total_results
-            2,                # pages_processed
-            False,            # completed
-            ['doi1', 'doi2'], # processed_items (JSON)
-            ['file1.json', 'file2.json'],  # file_names (JSON)
-            {'file1.json': 'hash1'},       # file_hashes (JSON)
-            [],               # errors (JSON)
-            '2023-01-01T00:00:00',  # created_timestamp
-            '2023-01-01T01:00:00'   # last_updated
+        _saved_state(
+            state_manager,
+            last_page=2,
+            last_start_index=50,
+            total_results=100,
+            pages_processed=2,
+            processed_items=['doi1', 'doi2'],
+            file_names=['file1.json', 'file2.json'],
+            file_hashes={'file1.json': 'hash1'},
+            created_timestamp=datetime(2023, 1, 1)
         )
-        mock_db_manager._connection.execute.return_value = mock_result
-        
-        state_manager = StateManager(mock_db_manager)
         
-        # Act
-        result = state_manager.load_state('author_456', 'test_load_123')
+        # Act - a separate manager so the result comes from the database, not the cache
+        result = StateManager(state_db_manager).load_state('author_456', 'test_load_123')
         
         # Assert
         assert isinstance(result, ProcessingState)
@@ -56,30 +61,114 @@ class TestStateManager:
         assert result.total_results == 100
         assert result.completed is False
         assert result.processed_items == ['doi1', 'doi2']
+        assert result.file_hashes == {'file1.json': 'hash1'}
+        assert result.errors == []
+        assert result.created_timestamp == datetime(2023, 1, 1)
+    
+    def test_save_state_stores_lists_and_maps_natively(self, state_manager, state_db_manager):
+        """
+        Test that list and map fields are stored as native columns and read back without JSON decoding
+        """
+        # Arrange
+        _saved_state(state_manager, file_names=['file1.json'], file_hashes={'file1.json': 'hash1'})
+        
+        # Act
+        row = state_db_manager._connection.execute(
+            "SELECT file_names, file_hashes FROM processing_state WHERE entity_id = ?", ('author_456',)
+        ).fetchone()
         
-        # Verify database was queried correctly
-        mock_db_manager._connection.execute.assert_called_once()
-        call_args = mock_db_manager._connection.execute.call_args
-        assert 'SELECT * FROM processing_state' in call_args[0][0]
-        assert call_args[0][1] == ('test_load_123', 'author_456')
+        # Assert
+        assert row == (['file1.json'], {'file1.json': 'hash1'})
     
-    def test_load_state_with_nonexistent_record_returns_none(self):
+    def test_save_state_round_trips_errors_with_differing_fields(self, state_manager):
         """
-        Test that loading non-existent state returns None
+        Test that error entries are stored as encoded and read back unchanged
+        """
+        # Arrange
+        errors = [
+            {'page_number': 1, 'error_type': 'ValueError'},
+            {'error_message': 'timeout', 'details': {'retries': 3, 'codes': [429, 503]}}
+        ]
+        _saved_state(state_manager, errors=errors)
+        
+        # Act
+        result = state_manager.load_state('author_456', 'test_load_123')
+        
+        # Assert
+        assert result.errors == errors
+    
+    def test_save_state_replaces_stored_errors(self, state_manager):
+        """
+        Test that saving a state makes its errors the stored error rows
+        """
+        # Arrange
+        _saved_state(state_manager, errors=[{'page_number': 1}, {'page_number': 2}])
+        
+        # Act
+        _saved_state(state_manager, errors=[{'page_number': 3}])
+        
+        # Assert
+        assert state_manager.load_state('author_456', 'test_load_123').errors == [{'page_number': 3}]
+    
+    def test_save_state_stores_processed_items_as_rows(self, state_manager, state_db_manager):
+        """
+        Test that processed items are stored one per row in order, and a later save drops removed items
+        """
+        # Arrange
+        state = _saved_state(state_manager, processed_items=['doi1', 'doi2', 'doi3'])
+        state.processed_items = ['doi1', 'doi3', 'doi4']
+        
+        # Act
+        state_manager.save_state(state)
+        
+        # Assert
+        rows = state_db_manager._connection.execute(
+            "SELECT item FROM processing_state_items WHERE entity_id = ? ORDER BY seq", ('author_456',)
+        ).fetchall()
+        assert [row[0] for row in rows] == ['doi1', 'doi3', 'doi4']
+    
+    def test_save_state_with_no_processed_items_drops_stored_items(self, state_manager, state_db_manager):
+        """
+        Test that saving a state whose processed items were emptied removes every stored item row
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager._connection = Mock()
+        state = _saved_state(state_manager, processed_items=['doi1', 'doi2'])
+        state.processed_items = []
         
-        # Mock database response - no record found
-        mock_result = Mock()
-        mock_result.fetchone.return_value = None
-        mock_db_manager._connection.execute.return_value = mock_result
+        # Act
+        state_manager.save_state(state)
         
-        state_manager = StateManager(mock_db_manager)
+        # Assert
+        count = state_db_manager._connection.execute("SELECT count(*) FROM processing_state_items").fetchone()[0]
+        assert count == 0
+    
+    def test_save_state_drops_removed_items_with_hash_anti_join(self, state_manager, state_db_manager):
+        """
+        Test that dropping removed items joins against the kept items instead of scanning the list per row
+        """
+        # Arrange
+        state = _saved_state(state_manager, processed_items=['doi1', 'doi2', 'doi3'])
+        state.processed_items = ['doi1', 'doi3']
+        connection = _spy_connection(state_db_manager)
+        state_manager.save_state(state)
+        query, params = next(
+            call[0] for call in connection.execute.call_args_list
+            if 'DELETE FROM processing_state_items' in call[0][0]
+        )
         
         # Act
-        result = state_manager.load_state('nonexistent_entity', 'nonexistent_load')
+        plan = state_db_manager._connection.execute(f"EXPLAIN {query}", params).fetchone()[1]
+        
+        # Assert
+        assert "HASH_JOIN" in plan
+        assert "list_contains" not in plan
+    
+    def test_load_state_with_nonexistent_record_returns_none(self, state_manager):
+        """
+        Test that loading non-existent state returns None
+        """
+        # Act
+        result = state_manager.load_state('nonexistent_entity', 'test_load_123')
         
         # Assert
         assert result is None
@@ -89,10 +178,7 @@ class TestStateManager:
         Test that loading state without database connection raises error
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager._connection = None
-        
-        state_manager = StateManager(mock_db_manager)
+        state_manager = StateManager(DatabaseManager())
         
         # Act & Assert
         with pytest.raises(Exception) as exc_info:
@@ -100,16 +186,122 @@ class TestStateManager:
         
         assert "No active database connection" in str(exc_info.value)
     
-    def test_save_state_with_new_entity_inserts_record(self):
+    def test_load_progress_only_selects_scalar_columns(self, state_manager, state_db_manager):
         """
-        Test that saving state for new entity inserts new record
+        Test that loading progress projects the scalar columns and skips the JSON ones
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager.execute_with_transaction = Mock()
+        _saved_state(state_manager, last_page=2, pages_processed=2, total_results=100, processed_items=['doi1'])
+        connection = _spy_connection(state_db_manager)
         
-        state_manager = StateManager(mock_db_manager)
+        # Act
+        result = state_manager.load_progress('author_456', 'test_load_123')
+        
+        # Assert
+        assert result == ProcessingProgress(completed=False, last_page=2, pages_processed=2, total_results=100)
+        
+        query = connection.execute.call_args[0][0]
+        assert 'SELECT completed, last_page, pages_processed' in query
+        assert '*' not in query
+        assert 'processed_items' not in query
+    
+    def test_load_state_uses_entity_indexes(self, state_manager, state_db_manager):
+        """
+        Test that the point lookup is planned as index scans rather than sequential scans
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state_manager.add_processed_items('author_456', 'test_load_123', ['doi_1', 'doi_2'])
+        connection = _spy_connection(state_db_manager)
+        state_manager.load_state('author_456', 'test_load_123')
+        query, params = connection.execute.call_args[0]
+        
+        # Act
+        plan = state_db_manager._connection.execute(f"EXPLAIN ANALYZE {query}", params).fetchone()[1]
         
+        # Assert
+        assert plan.count("Index Scan") == 2
+        assert "Sequential Scan" not in plan
+    
+    def test_load_progress_uses_entity_index(self, state_manager, state_db_manager):
+        """
+        Test that the progress lookup is planned as an index scan rather than a sequential scan
+        """
+        # Arrange
+        _saved_state(state_manager)
+        connection = _spy_connection(state_db_manager)
+        state_manager.load_progress('author_456', 'test_load_123')
+        query, params = connection.execute.call_args[0]
+        
+        # Act
+        plan = state_db_manager._connection.execute(f"EXPLAIN ANALYZE {query}", params).fetchone()[1]
+        
+        # Assert
+        assert "Index Scan" in plan
+        assert "Sequential Scan" not in plan
+    
+    def test_load_state_returns_independent_states(self, state_manager):
+        """
+        Test that changing a loaded state without saving it does not affect later loads
+        """
+        # Arrange
+        _saved_state(state_manager, processed_items=['doi_1'], file_hashes={'page_1.json': 'hash_1'})
+        state = state_manager.load_state('author_456', 'test_load_123')
+        
+        # Act
+        state.last_page = 9
+        state.processed_items.append('doi_2')
+        state.file_hashes['page_2.json'] = 'hash_2'
+        result = state_manager.load_state('author_456', 'test_load_123')
+        
+        # Assert
+        assert result is not state
+        assert result.last_page == 0
+        assert result.processed_items == ['doi_1']
+        assert result.file_hashes == {'page_1.json': 'hash_1'}
+    
+    def test_failed_save_state_leaves_stored_state_unchanged(self, state_manager, state_db_manager):
+        """
+        Test that a save that raises leaves later loads matching the database
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state = state_manager.load_state('author_456', 'test_load_123')
+        state.last_page = 9
+        connection = _spy_connection(state_db_manager)
+        connection.execute.side_effect = RuntimeError("write failed")
+        
+        # Act
+        with pytest.raises(RuntimeError):
+            state_manager.save_state(state)
+        connection.execute.side_effect = None
+        result = state_manager.load_state('author_456', 'test_load_123')
+        
+        # Assert
+        assert result.last_page == 0
+    
+    def test_load_state_sees_writes_from_another_manager(self, state_manager, state_db_manager):
+        """
+        Test that a state saved through a different StateManager on the same database is loaded as written
+        """
+        # Arrange
+        state = _saved_state(state_manager)
+        state_manager.load_state('author_456', 'test_load_123')
+        other_manager = StateManager(state_db_manager)
+        state.last_page = 4
+        
+        # Act
+        other_manager.save_state(state)
+        result = state_manager.load_state('author_456', 'test_load_123')
+        
+        # Assert
+        assert result.last_page == 4
+    
+    def test_save_state_with_new_entity_inserts_record(self, state_manager):
+        """
+        Test that saving state for new entity inserts new record
+        """
+        # Arrange
         processing_state = ProcessingState(
             entity_id='author_456',
             load_id='test_load_123',
@@ -125,28 +317,19 @@ class TestStateManager:
         state_manager.save_state(processing_state)
         
         # Assert
-        mock_db_manager.execute_with_transaction.assert_called_once()
-        call_args = mock_db_manager.execute_with_transaction.call_args
-        
-        # Verify UPSERT query structure
-        query = call_args[0][0]
-        params = call_args[0][1]
-        
-        assert 'INSERT INTO processing_state' in query
-        assert 'ON CONFLICT' in query
-        assert params[0] == 'test_load_123'  # load_id
-        assert params[1] == 'author_456'     # entity_id
-        assert params[2] == 'scopus'         # data_source
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert result.data_source == 'scopus'
+        assert result.last_page == 1
+        assert result.total_results == 50
+        assert result.processed_items == ['doi1']
+        assert result.file_names == ['file1.json']
     
-    def test_save_state_with_existing_entity_updates_record(self):
+    def test_save_state_with_existing_entity_updates_record(self, state_manager):
         """
         Test that saving state for existing entity updates the record
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager.execute_with_transaction = Mock()
-        
-        state_manager = StateManager(mock_db_manager)
+        _saved_state(state_manager, last_page=1, total_results=50, processed_items=['doi1'])
         
         # Create state with updated values
         processing_state = ProcessingState(
@@ -165,56 +348,60 @@ class TestStateManager:
         state_manager.save_state(processing_state)
         
         # Assert
-        mock_db_manager.execute_with_transaction.assert_called_once()
-        call_args = mock_db_manager.execute_with_transaction.call_args
-        params = call_args[0][1]
-        
-        assert params[3] == 3    # last_page
-        assert params[5] == 75   # total_results
-        assert params[6] == 3    # pages_processed
-        assert params[7] is True # completed
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert result.last_page == 3
+        assert result.total_results == 75
+        assert result.pages_processed == 3
+        assert result.completed is True
+        assert result.processed_items == ['doi1', 'doi2', 'doi3']
     
-    def test_mark_completed_with_valid_entity_updates_completed_flag(self):
+    def test_save_state_bulk_uses_executemany(self, state_manager, state_db_manager):
         """
-        Test that mark_completed sets completed flag to True
+        Test that saving several states issues one batched UPSERT with a row per state
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager.execute_with_transaction = Mock()
+        connection = _spy_connection(state_db_manager)
         
-        state_manager = StateManager(mock_db_manager)
+        states = [
+            ProcessingState(entity_id=f'author_{i}', load_id='test_load_123', data_source='scopus')
+            for i in range(3)
+        ]
         
         # Act
-        state_manager.mark_completed('author_456', 'test_load_123')
+        state_manager.save_state_bulk(states)
         
         # Assert
-        mock_db_manager.execute_with_transaction.assert_called_once()
-        call_args = mock_db_manager.execute_with_transaction.call_args
+        connection.executemany.assert_called_once()
+        query, params_list = connection.executemany.call_args[0]
         
-        query = call_args[0][0]
-        params = call_args[0][1]
-        
-        assert 'UPDATE processing_state' in query
-        assert 'SET completed = TRUE' in query
-        assert params == ('test_load_123', 'author_456')
+        assert 'INSERT INTO processing_state' in query
+        assert 'ON CONFLICT' in query
+        assert len(params_list) == 3
+        assert all(state_manager.load_state(f'author_{i}', 'test_load_123') is not None for i in range(3))
     
-    def test_get_incomplete_entities_with_all_complete_returns_empty_list(self):
+    def test_mark_completed_with_valid_entity_updates_completed_flag(self, state_manager):
         """
-        Test that when all entities are complete, empty list is returned
+        Test that mark_completed sets completed flag to True
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager._connection = Mock()
+        _saved_state(state_manager)
         
-        # Mock database response - all entities are complete
-        mock_result = Mock()
-        mock_result.fetchall.return_value = [
-            ('author_1',), ('author_2',), ('author_3',)
-        ]  # All entities returned as completed
-        mock_db_manager._connection.execute.return_value = mock_result
+        # Act
+        state_manager.mark_completed('author_456', 'test_load_123')
         
-        state_manager = StateManager(mock_db_manager)
+        # Assert
+        assert state_manager.load_state('author_456', 'test_load_123').completed is True
+    
+    def test_get_incomplete_entities_with_all_complete_returns_empty_list(self, state_manager):
+        """
+        Test that when all entities are complete, empty list is returned
+        """
+        # Arrange
         entity_ids = ['author_1', 'author_2', 'author_3']
+        state_manager.save_state_bulk([
+            ProcessingState(entity_id=entity_id, load_id='test_load_123', data_source='scopus', completed=True)
+            for entity_id in entity_ids
+        ])
         
         # Act
         result = state_manager.get_incomplete_entities(entity_ids, 'test_load_123')
@@ -222,22 +409,16 @@ class TestStateManager:
         # Assert
         assert result == []
     
-    def test_get_incomplete_entities_with_some_incomplete_returns_incomplete_list(self):
+    def test_get_incomplete_entities_with_some_incomplete_returns_incomplete_list(self, state_manager, state_db_manager):
         """
         Test that incomplete entities are correctly identified and returned
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager._connection = Mock()
-        
-        # Mock database response - some entities are incomplete
-        mock_result = Mock()
-        mock_result.fetchall.return_value = [
-            ('author_2',),  # Only author_2 is marked as complete
-        ]
-        mock_db_manager._connection.execute.return_value = mock_result
-        
-        state_manager = StateManager(mock_db_manager)
+        state_manager.save_state_bulk([
+            ProcessingState(entity_id='author_2', load_id='test_load_123', data_source='scopus', completed=True),
+            ProcessingState(entity_id='author_3', load_id='test_load_123', data_source='scopus', completed=False),
+        ])
+        connection = _spy_connection(state_db_manager)
         entity_ids = ['author_1', 'author_2', 'author_3']
         
         # Act
@@ -246,27 +427,46 @@ class TestStateManager:
         # Assert
         assert result == ['author_1', 'author_3']  # author_2 was complete, so excluded
         
-        # Verify correct query was made
-        mock_db_manager._connection.execute.assert_called_once()
-        call_args = mock_db_manager._connection.execute.call_args
-        query = call_args[0][0]
-        assert 'WHERE load_id = ?' in query
-        assert 'AND completed = TRUE' in query
+        # Verify the candidates were sent in a single query
+        connection.execute.assert_called_once()
+        query = connection.execute.call_args[0][0]
+        assert 'unnest($1)' in query
+        assert 'completed IS NOT TRUE' in query
     
-    def test_get_incomplete_entities_with_no_existing_state_returns_all_entities(self):
+    def test_get_incomplete_entities_sees_completion_by_another_manager(self, state_manager, state_db_manager):
         """
-        Test that entities without state records are considered incomplete
+        Test that an entity completed through a different StateManager on the same database is excluded
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state_manager.get_incomplete_entities(['author_456'], 'test_load_123')
+        other_manager = StateManager(state_db_manager)
+        
+        # Act
+        other_manager.mark_completed('author_456', 'test_load_123')
+        
+        # Assert
+        assert state_manager.get_incomplete_entities(['author_456'], 'test_load_123') == []
+    
+    def test_mark_completed_is_reflected_in_next_incomplete_check(self, state_manager):
+        """
+        Test that completing an entity is reflected in the next incomplete check
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager._connection = Mock()
+        _saved_state(state_manager)
+        state_manager.get_incomplete_entities(['author_456'], 'test_load_123')
         
-        # Mock database response - no entities have state records
-        mock_result = Mock()
-        mock_result.fetchall.return_value = []
-        mock_db_manager._connection.execute.return_value = mock_result
+        # Act
+        state_manager.mark_completed('author_456', 'test_load_123')
         
-        state_manager = StateManager(mock_db_manager)
+        # Assert
+        assert state_manager.get_incomplete_entities(['author_456'], 'test_load_123') == []
+    
+    def test_get_incomplete_entities_with_no_existing_state_returns_all_entities(self, state_manager):
+        """
+        Test that entities without state records are considered incomplete
+        """
+        # Arrange
         entity_ids = ['author_1', 'author_2', 'author_3']
         
         # Act
@@ -275,140 +475,371 @@ class TestStateManager:
         # Assert
         assert result == entity_ids  # All entities returned as incomplete
     
-    def test_update_page_progress_with_valid_data_updates_state(self):
+    def test_get_incomplete_entities_ignores_other_loads_and_keeps_input_order(self, state_manager):
         """
-        Test that update_page_progress correctly updates page tracking
+        Test that only completion within the given load counts, and results follow input order
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager.execute_with_transaction = Mock()
+        state_manager.save_state_bulk([
+            ProcessingState(entity_id='author_2', load_id='test_load_123', data_source='scopus', completed=True),
+            ProcessingState(entity_id='author_1', load_id='other_load', data_source='scopus', completed=True),
+        ])
         
-        state_manager = StateManager(mock_db_manager)
+        # Act
+        result = state_manager.get_incomplete_entities(['author_4', 'author_3', 'author_2', 'author_1'], 'test_load_123')
+        
+        # Assert
+        assert result == ['author_4', 'author_3', 'author_1']
+    
+    def test_update_page_progress_with_valid_data_updates_state(self, state_manager):
+        """
+        Test that update_page_progress correctly updates page tracking
+        """
+        # Arrange
+        _saved_state(state_manager, last_page=1, pages_processed=1)
         
         # Act
         state_manager.update_page_progress('author_456', 'test_load_123', 5)
         
         # Assert
-        mock_db_manager.execute_with_transaction.assert_called_once()
-        call_args = mock_db_manager.execute_with_transaction.call_args
+        result = state_manager.load_progress('author_456', 'test_load_123')
+        assert result.last_page == 5
+        assert result.pages_processed == 5
+    
+    def test_add_processed_item_with_new_identifier_adds_to_list(self, state_manager, state_db_manager):
+        """
+        Test that add_processed_item inserts the identifier and touches the state row with no prior read
+        """
+        # Arrange
+        _saved_state(state_manager, processed_items=['existing_doi'])
+        connection = _spy_connection(state_db_manager)
         
-        query = call_args[0][0]
-        params = call_args[0][1]
+        # Act
+        state_manager.add_processed_item('author_456', 'test_load_123', 'new_doi')
         
-        assert 'UPDATE processing_state' in query
-        assert 'SET last_page = ?' in query
-        assert 'pages_processed = ?' in query  # Look for this anywhere in the query
-        assert params[0] == 5  # page_num
-        assert params[1] == 5  # pages_processed
+        # Assert
+        queries = [call[0][0] for call in connection.execute.call_args_list]
+        assert len(queries) == 2
+        assert 'INSERT INTO processing_state_items' in queries[0]
+        assert 'SET last_updated = ?' in queries[1]
+        assert state_manager.load_state('author_456', 'test_load_123').processed_items == ['existing_doi', 'new_doi']
     
-    def test_add_processed_item_with_new_identifier_adds_to_list(self):
+    def test_add_processed_item_is_idempotent(self, state_manager):
         """
-        Test that add_processed_item adds identifier to processed items
+        Test that re-adding a retried page keeps each identifier once and in first-seen order
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager._connection = Mock()
-        mock_db_manager.execute_with_transaction = Mock()
+        _saved_state(state_manager)
+        state_manager.add_processed_items('author_456', 'test_load_123', ['doi_1', 'doi_2'])
         
-        # Mock existing state with some processed items
-        mock_result = Mock()
-        mock_result.fetchone.return_value = (
-            'test_load_123', 'author_456', 'scopus', 1, 25, 100, 1, False,
-            ['existing_doi'],  # existing processed_items
-            [], {}, [], '2023-01-01T00:00:00', '2023-01-01T00:00:00'
-        )
-        mock_db_manager._connection.execute.return_value = mock_result
+        # Act
+        state_manager.add_processed_items('author_456', 'test_load_123', ['doi_2', 'doi_1', 'doi_3', 'doi_3'])
+        state_manager.add_processed_item('author_456', 'test_load_123', 'doi_1')
         
-        state_manager = StateManager(mock_db_manager)
+        # Assert
+        processed_items = state_manager.load_state('author_456', 'test_load_123').processed_items
+        assert processed_items == ['doi_1', 'doi_2', 'doi_3']
+    
+    def test_add_processed_items_with_page_of_identifiers_updates_once(self, state_manager, state_db_manager):
+        """
+        Test that add_processed_items appends only new identifiers, in order, with a single insert
+        """
+        # Arrange
+        _saved_state(state_manager, processed_items=['existing_doi'])
+        connection = _spy_connection(state_db_manager)
         
         # Act
-        state_manager.add_processed_item('author_456', 'test_load_123', 'new_doi')
+        state_manager.add_processed_items('author_456', 'test_load_123', ['doi_a', 'existing_doi', 'doi_b', 'doi_a'])
         
         # Assert
-        mock_db_manager.execute_with_transaction.assert_called_once()
-        call_args = mock_db_manager.execute_with_transaction.call_args
+        queries = [call[0][0] for call in connection.execute.call_args_list]
+        assert sum('INSERT INTO processing_state_items' in query for query in queries) == 1
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert result.processed_items == ['existing_doi', 'doi_a', 'doi_b']
+    
+    def test_add_processed_items_across_many_pages_only_inserts_rows(self, state_manager, state_db_manager):
+        """
+        Test that 10k items over 100 pages cost one insert per page, never a rewrite of the stored items
+        """
+        # Arrange
+        _saved_state(state_manager)
+        pages = [[f'10.1000/{page}-{item}' for item in range(100)] for page in range(100)]
+        connection = _spy_connection(state_db_manager)
         
-        query = call_args[0][0]
-        assert 'UPDATE processing_state' in query
-        assert 'SET processed_items = ?' in query
+        # Act
+        for page in pages:
+            state_manager.add_processed_items('author_456', 'test_load_123', page)
         
-        # The updated processed_items should include both existing and new DOI
-        updated_items = call_args[0][1][0]
-        assert 'existing_doi' in updated_items
-        assert 'new_doi' in updated_items
+        # Assert
+        queries = [call[0][0] for call in connection.execute.call_args_list]
+        assert len(queries) == 2 * len(pages)
+        assert all('INSERT INTO processing_state_items' in query for query in queries[0::2])
+        assert all('SET last_updated = ?' in query for query in queries[1::2])
+        
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert result.processed_items == [item for page in pages for item in page]
     
-    def test_record_file_hash_with_valid_data_updates_hashes(self):
+    def test_add_processed_items_advances_last_updated(self, state_manager, state_db_manager):
         """
-        Test that record_file_hash correctly stores file hash mapping
+        Test that adding processed items marks the state row as updated
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager._connection = Mock()
-        mock_db_manager.execute_with_transaction = Mock()
+        _saved_state(state_manager)
+        state_db_manager._connection.execute("UPDATE processing_state SET last_updated = '2000-01-01'")
         
-        # Mock existing state
-        mock_result = Mock()
-        mock_result.fetchone.return_value = (
-            'test_load_123', 'author_456', 'scopus', 1, 25, 100, 1, False,
-            [], ['existing_file.json'], {'existing_file.json': 'existing_hash'}, 
-            [], '2023-01-01T00:00:00', '2023-01-01T00:00:00'
-        )
-        mock_db_manager._connection.execute.return_value = mock_result
-        
-        state_manager = StateManager(mock_db_manager)
+        # Act
+        state_manager.add_processed_items('author_456', 'test_load_123', ['doi_1'])
         
+        # Assert
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert result.last_updated > datetime(2000, 1, 1)
+    
+    def test_add_processed_item_without_existing_state_does_nothing(self, state_manager):
+        """
+        Test that processed items are not recorded for an entity with no state
+        """
         # Act
-        state_manager.record_file_hash('author_456', 'test_load_123', 'new_file.json', 'new_hash_123')
+        state_manager.add_processed_item('author_456', 'test_load_123', 'new_doi')
         
         # Assert
-        mock_db_manager.execute_with_transaction.assert_called_once()
-        call_args = mock_db_manager.execute_with_transaction.call_args
+        assert state_manager.load_state('author_456', 'test_load_123') is None
+    
+    def test_record_file_hash_with_valid_data_updates_hashes(self, state_manager, state_db_manager):
+        """
+        Test that record_file_hash merges the file hash mapping with a single statement and no prior read
+        """
+        # Arrange
+        _saved_state(state_manager, file_names=['existing_file.json'], file_hashes={'existing_file.json': 'existing_hash'})
+        connection = _spy_connection(state_db_manager)
         
-        query = call_args[0][0]
-        assert 'UPDATE processing_state' in query
-        assert 'SET file_hashes = ?' in query
+        # Act
+        state_manager.record_file_hash('author_456', 'test_load_123', 'new_file.json', 'new_hash_123')
         
-        # The updated file_hashes should include both existing and new mapping
-        updated_hashes = call_args[0][1][0]
+        # Assert
+        connection.execute.assert_called_once()
+        updated_hashes = state_manager.load_state('author_456', 'test_load_123').file_hashes
         assert updated_hashes['existing_file.json'] == 'existing_hash'
         assert updated_hashes['new_file.json'] == 'new_hash_123'
     
-    def test_log_processing_error_with_exception_records_error_details(self):
+    def test_log_processing_error_with_exception_records_error_details(self, state_manager, state_db_manager):
         """
-        Test that log_processing_error correctly stores error information
+        Test that log_processing_error inserts one error row and touches the state row with no prior read
         """
         # Arrange
-        mock_db_manager = Mock(spec=DatabaseManager)
-        mock_db_manager._connection = Mock()
-        mock_db_manager.execute_with_transaction = Mock()
-        
-        # Mock existing state
-        mock_result = Mock()
-        mock_result.fetchone.return_value = (
-            'test_load_123', 'author_456', 'scopus', 1, 25, 100, 1, False,
-            [], [], {}, [], '2023-01-01T00:00:00', '2023-01-01T00:00:00'
-        )
-        mock_db_manager._connection.execute.return_value = mock_result
-        
-        state_manager = StateManager(mock_db_manager)
+        _saved_state(state_manager)
+        connection = _spy_connection(state_db_manager)
         test_exception = ValueError("Test error message")
         
         # Act
         state_manager.log_processing_error('author_456', 'test_load_123', test_exception, 3)
         
         # Assert
-        mock_db_manager.execute_with_transaction.assert_called_once()
-        call_args = mock_db_manager.execute_with_transaction.call_args
-        
-        query = call_args[0][0]
-        assert 'UPDATE processing_state' in query
-        assert 'SET errors = ?' in query
+        queries = [call[0][0] for call in connection.execute.call_args_list]
+        assert len(queries) == 2
+        assert 'INSERT INTO processing_state_errors' in queries[0]
+        assert 'SET last_updated = ?' in queries[1]
         
-        # The updated errors should contain the error details
-        updated_errors = call_args[0][1][0]
+        # The stored errors should contain the error details
+        updated_errors = state_manager.load_state('author_456', 'test_load_123').errors
         assert len(updated_errors) == 1
         error_entry = updated_errors[0]
         assert error_entry['page_number'] == 3
         assert error_entry['error_message'] == "Test error message"
         assert error_entry['error_type'] == "ValueError"
-        assert 'timestamp' in error_entry
\ No newline at end of file
+        assert 'timestamp' in error_entry
+    
+    def test_log_processing_error_twice_keeps_both_entries(self, state_manager):
+        """
+        Test that successive errors accumulate rather than overwrite each other
+        """
+        # Arrange
+        _saved_state(state_manager)
+        
+        # Act
+        state_manager.log_processing_error('author_456', 'test_load_123', ValueError("first"), 1)
+        state_manager.log_processing_error('author_456', 'test_load_123', KeyError("second"), 2)
+        
+        # Assert
+        errors = state_manager.load_state('author_456', 'test_load_123').errors
+        assert [error['page_number'] for error in errors] == [1, 2]
+        assert [error['error_type'] for error in errors] == ["ValueError", "KeyError"]
+    
+    def test_log_processing_error_advances_last_updated(self, state_manager, state_db_manager):
+        """
+        Test that logging an error marks the state row as updated
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state_db_manager._connection.execute("UPDATE processing_state SET last_updated = '2000-01-01'")
+        
+        # Act
+        state_manager.log_processing_error('author_456', 'test_load_123', ValueError("failed"), 1)
+        
+        # Assert
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert result.last_updated > datetime(2000, 1, 1)
+    
+    def test_flush_pending_writes_with_only_errors_advances_last_updated(self, state_manager, state_db_manager):
+        """
+        Test that flushing queued errors for an entity with no queued hashes marks its state row as updated
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state_db_manager._connection.execute("UPDATE processing_state SET last_updated = '2000-01-01'")
+        state_manager.queue_processing_error('author_456', 'test_load_123', ValueError("failed"), 1)
+        
+        # Act
+        state_manager.flush_pending_writes()
+        
+        # Assert
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert [error['error_type'] for error in result.errors] == ["ValueError"]
+        assert result.last_updated > datetime(2000, 1, 1)
+    
+    def test_flush_pending_writes_coalesces_queued_hashes_into_one_update(self, state_manager, state_db_manager):
+        """
+        Test that hashes queued for one entity are written with a single parameter row on flush
+        """
+        # Arrange
+        _saved_state(state_manager)
+        for i in range(10):
+            state_manager.queue_file_hash('author_456', 'test_load_123', f'page_{i}.json', f'hash_{i}')
+        connection = _spy_connection(state_db_manager)
+        
+        # Act
+        state_manager.flush_pending_writes()
+        
+        # Assert
+        connection.executemany.assert_called_once()
+        assert len(connection.executemany.call_args[0][1]) == 1
+        assert not state_manager.write_buffer.has_pending
+        stored_hashes = state_manager.load_state('author_456', 'test_load_123').file_hashes
+        assert stored_hashes == {f'page_{i}.json': f'hash_{i}' for i in range(10)}
+    
+    def test_flush_pending_writes_that_fails_keeps_writes_queued(self, state_manager, state_db_manager):
+        """
+        Test that a flush whose transaction rolls back keeps the queued writes for the next flush
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state_manager.queue_file_hash('author_456', 'test_load_123', 'page_1.json', 'hash_1')
+        state_manager.queue_processing_error('author_456', 'test_load_123', ValueError("failed"), 1)
+        connection = _spy_connection(state_db_manager)
+        connection.executemany.side_effect = RuntimeError("write failed")
+        
+        # Act
+        with pytest.raises(RuntimeError):
+            state_manager.flush_pending_writes()
+        connection.executemany.side_effect = None
+        state_manager.flush_pending_writes()
+        
+        # Assert
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert result.file_hashes == {'page_1.json': 'hash_1'}
+        assert [error['error_type'] for error in result.errors] == ["ValueError"]
+    
+    def test_mark_completed_that_fails_keeps_writes_queued(self, state_manager, state_db_manager):
+        """
+        Test that a failed mark_completed leaves the queued writes and the completed flag unapplied
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state_manager.queue_file_hash('author_456', 'test_load_123', 'page_1.json', 'hash_1')
+        connection = _spy_connection(state_db_manager)
+        connection.executemany.side_effect = RuntimeError("write failed")
+        
+        # Act
+        with pytest.raises(RuntimeError):
+            state_manager.mark_completed('author_456', 'test_load_123')
+        connection.executemany.side_effect = None
+        
+        # Assert
+        assert state_manager.write_buffer.has_pending
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert result.completed is False
+        assert result.file_hashes == {'page_1.json': 'hash_1'}
+    
+    def test_queue_processing_error_is_visible_after_load_state(self, state_manager):
+        """
+        Test that load_state flushes queued errors and hashes before reading
+        """
+        # Arrange
+        _saved_state(state_manager, file_hashes={'existing_file.json': 'existing_hash'})
+        state_manager.queue_file_hash('author_456', 'test_load_123', 'new_file.json', 'new_hash')
+        state_manager.queue_processing_error('author_456', 'test_load_123', ValueError("first"), 1)
+        state_manager.queue_processing_error('author_456', 'test_load_123', KeyError("second"), 2)
+        
+        # Act
+        result = state_manager.load_state('author_456', 'test_load_123')
+        
+        # Assert
+        assert result.file_hashes == {'existing_file.json': 'existing_hash', 'new_file.json': 'new_hash'}
+        assert [error['page_number'] for error in result.errors] == [1, 2]
+        assert [error['error_type'] for error in result.errors] == ["ValueError", "KeyError"]
+    
+    def test_queue_file_hash_flushes_when_buffer_is_full(self, state_manager):
+        """
+        Test that queued writes are flushed once max_pending is reached
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state_manager.write_buffer.max_pending = 3
+        
+        # Act
+        for i in range(3):
+            state_manager.queue_file_hash('author_456', 'test_load_123', f'page_{i}.json', f'hash_{i}')
+        
+        # Assert
+        assert not state_manager.write_buffer.has_pending
+    
+    def test_mark_completed_flushes_pending_writes(self, state_manager, state_db_manager):
+        """
+        Test that marking an entity completed persists its queued writes first
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state_manager.queue_file_hash('author_456', 'test_load_123', 'page_1.json', 'hash_1')
+        
+        # Act
+        state_manager.mark_completed('author_456', 'test_load_123')
+        
+        # Assert
+        row = state_db_manager._connection.execute(
+            "SELECT completed, file_hashes FROM processing_state WHERE entity_id = 'author_456'"
+        ).fetchone()
+        assert row[0] is True
+        assert row[1] == {'page_1.json': 'hash_1'}
+    
+    def test_mark_completed_commits_pending_writes_and_flag_together(self, state_manager, state_db_manager):
+        """
+        Test that queued writes and the completed flag share a single transaction
+        """
+        # Arrange
+        _saved_state(state_manager)
+        state_manager.queue_file_hash('author_456', 'test_load_123', 'page_1.json', 'hash_1')
+        state_manager.queue_processing_error('author_456', 'test_load_123', ValueError("failed"), 1)
+        connection = _spy_connection(state_db_manager)
+        
+        # Act
+        state_manager.mark_completed('author_456', 'test_load_123')
+        
+        # Assert
+        connection.begin.assert_called_once()
+        connection.commit.assert_called_once()
+        assert not state_manager.write_buffer.has_pending
+        result = state_manager.load_state('author_456', 'test_load_123')
+        assert result.completed is True
+        assert result.file_hashes == {'page_1.json': 'hash_1'}
+        assert [error['error_type'] for error in result.errors] == ["ValueError"]
+    
+    def test_processing_state_has_no_dict(self):
+        """
+        Test that ProcessingState uses a slotted layout without a per-instance dict
+        """
+        # Arrange
+        processing_state = ProcessingState(entity_id="author_123", load_id="test_load")
+        
+        # Act & Assert
+        assert not hasattr(processing_state, '__dict__')
+        with pytest.raises(AttributeError):
+            processing_state.unknown_field = True
\ No newline at end of file
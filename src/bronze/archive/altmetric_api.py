@@ -1,20 +1,26 @@
 """
 Altmetric API Ingestion Script
 This script ingests altmetric data via the Counts API and retrieves the full RAW JSON output.
-It processes DOIs one at a time from a text file, makes API requests, and stores the raw responses
+It processes DOIs concurrently from a text file, makes API requests, and stores the raw responses
 in a date-partitioned directory structure with a manifest file.
 """
 
 import os
-import json
 import time
 import argparse
 import requests
 import requests_cache
+from requests.adapters import HTTPAdapter
 import logging
 import yaml
 import hashlib
+import orjson
+import xxhash
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from rate_limiter import RequestRateLimiter
 
 # Define paths
 PROJECT_ROOT = '/Users/work/Documents/prototype-analytics-platform'
@@ -62,14 +68,19 @@ config = load_config(CONFIG_PATH)
 
 # Set up cache from config
 CACHE_DIR = os.path.join(DATA_DIR, 'cache', 'altmetric')
-if not os.path.exists(CACHE_DIR):
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    logger.info(f"Created cache directory: {CACHE_DIR}")
+os.makedirs(CACHE_DIR, exist_ok=True)
+logger.info(f"Using cache directory: {CACHE_DIR}")
 
-# Set up request caching
+# Set up request caching, in WAL mode without a commit per response since the cache can always be refetched
 if config.get('cache', {}).get('enabled', True):
     cache_file = os.path.join(CACHE_DIR, 'altmetric_cache')
-    requests_cache.install_cache(cache_file, expire_after=config.get('cache', {}).get('expiration', 86400))
+    requests_cache.install_cache(
+        cache_file,
+        backend='sqlite',
+        fast_save=True,
+        wal=True,
+        expire_after=config.get('cache', {}).get('expiration', 86400)
+    )
     logger.info(f"Request caching enabled with expiration of {config.get('cache', {}).get('expiration', 86400)} seconds")
 
 # Get API credentials and endpoints from config
@@ -83,6 +94,154 @@ RETRY_WAIT = config.get('retries', {}).get('backoff_factor', 2)
 # API request rate
 REQUESTS_PER_SECOND = 50
 
+# Content hash for idempotent storage; state rows without hash_alg were hashed with md5
+FILE_HASH_ALG = 'xxh3_128'
+LEGACY_FILE_HASH_ALG = 'md5'
+
+# Raw responses are appended to newline-delimited JSON shards, rotated at this size
+RAW_SHARD_MAX_BYTES = 256 * 1024 * 1024
+
+# SQLite database holding the state of every DOI, keyed by load_id and DOI
+STATE_DB_NAME = 'altmetric_state.db'
+STATE_COLUMNS = (
+    'load_id', 'doi', 'item_num', 'bluesky_count', 'twitter_count', 'score',
+    'file_name', 'file_offset', 'file_length', 'file_hash', 'hash_alg',
+    'completed', 'last_updated', 'errors'
+)
+
+# Columns added to the state table after it was first created, with their types
+STATE_ADDED_COLUMNS = {
+    'hash_alg': 'TEXT',
+    'file_offset': 'INTEGER',
+    'file_length': 'INTEGER'
+}
+
+# Number of buffered state updates written to the state database in one transaction
+STATE_FLUSH_SIZE = 100
+
+# One cached connection per state directory, shared by all worker threads under a lock
+_state_connections = {}
+_state_lock = threading.RLock()
+
+# Buffered state rows not yet written, per state directory and keyed by (load_id, doi)
+_pending_state_updates = {}
+
+# Directories already created or found to exist during this run
+_ensured_dirs = set()
+
+class RawShardWriter:
+    """
+    Thread-safe appender of raw responses to newline-delimited JSON shard files.
+    
+    Each record's shard, byte offset and length are returned so it can be read
+    back with a single pread instead of one file per DOI.
+    """
+    
+    def __init__(self, output_dir, load_id, max_bytes=RAW_SHARD_MAX_BYTES):
+        self.output_dir = output_dir
+        self.load_id = load_id
+        self.max_bytes = max_bytes
+        self._shard_num = 0
+        self._file_name = None
+        self._handle = None
+        self._lock = threading.Lock()
+    
+    def append(self, payload):
+        """
+        Append one serialized record to the current shard, rotating it when full.
+        
+        Args:
+            payload (bytes): Serialized record, without a trailing newline
+        
+        Returns:
+            tuple: (file_name, offset, length) locating the record
+        """
+        with self._lock:
+            if self._handle is None or self._handle.tell() >= self.max_bytes:
+                self._open_next_shard()
+            
+            offset = self._handle.tell()
+            self._handle.write(payload + b'\n')
+            self._handle.flush()
+            return self._file_name, offset, len(payload)
+    
+    def close(self):
+        """Close the current shard file if one is open."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+    
+    def _open_next_shard(self):
+        """Open the next shard with room left, appending to one from a resumed run if possible."""
+        self.close()
+        
+        while True:
+            self._shard_num += 1
+            self._file_name = f"altmetric_raw_{self.load_id}_{self._shard_num:04d}.ndjson"
+            self._handle = open(os.path.join(self.output_dir, self._file_name), 'ab')
+            if self._handle.tell() < self.max_bytes:
+                return
+            self._handle.close()
+
+def create_session(pool_size=REQUESTS_PER_SECOND):
+    """
+    Create an HTTP session whose connection pool keeps one connection alive per worker.
+    
+    Reusing pooled connections avoids a new TCP and TLS handshake for every DOI.
+    Sessions created after install_cache still go through the request cache.
+    
+    Args:
+        pool_size (int): Number of connections kept open, one per concurrent request
+    
+    Returns:
+        requests.Session: Session for Altmetric API requests
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def is_cached_response(session, url):
+    """
+    Check whether a GET of url would be answered from the request cache.
+    
+    Args:
+        session (requests.Session): Session the request will be made with
+        url (str): URL to request
+    
+    Returns:
+        bool: True if an unexpired response is cached for the URL
+    """
+    cache = getattr(session, 'cache', None)
+    if cache is None:
+        return False
+    
+    response = cache.get_response(cache.create_key(requests.Request('GET', url).prepare()))
+    return response is not None and not response.is_expired
+
+def _ensure_dir(path):
+    """
+    Create a directory on first sight and remember it, so later calls make no syscalls.
+    
+    Args:
+        path (str): Directory to create
+    
+    Returns:
+        bool: True if this call created the directory, False if it already existed
+    """
+    if path in _ensured_dirs:
+        return False
+    
+    try:
+        os.makedirs(path)
+        created = True
+    except FileExistsError:
+        created = False
+    
+    _ensured_dirs.add(path)
+    return created
+
 def create_directory_structure(base_path, date_format='%Y%m/%d'):
     """
     Creates a directory structure with date partitioning based on current date.
@@ -99,36 +258,103 @@ def create_directory_structure(base_path, date_format='%Y%m/%d'):
     full_path = os.path.join(base_path, current_date)
     
     # Create directory if it doesn't exist
-    if not os.path.exists(full_path):
-        os.makedirs(full_path, exist_ok=True)
+    if _ensure_dir(full_path):
         logger.info(f"Created directory: {full_path}")
     else:
         logger.info(f"Directory already exists: {full_path}")
     
     return full_path
 
-def get_load_id_path(load_id, state_dir=STATE_DIR):
+def _get_state_conn(state_dir=STATE_DIR):
     """
-    Generate a directory path based on load_id.
+    Get the cached connection to the state database, creating it on first use.
     
     Args:
-        load_id (str): Unique identifier for the processing batch
-        state_dir (str): Base directory where state files are saved
+        state_dir (str): Directory where the state database is saved
     
     Returns:
-        str: Full path to the load_id directory
+        sqlite3.Connection: Connection to the state database
     """
-    # Create load_id-based directory path
-    load_id_dir = os.path.join(state_dir, f"load_id_{load_id}")
-    
-    # Create directory if it doesn't exist
-    if not os.path.exists(load_id_dir):
-        os.makedirs(load_id_dir, exist_ok=True)
-        logger.info(f"Created directory: {load_id_dir}")
-    else:
-        logger.debug(f"Directory already exists: {load_id_dir}")
+    with _state_lock:
+        conn = _state_connections.get(state_dir)
+        if conn is not None:
+            return conn
+        
+        _ensure_dir(state_dir)
+        db_path = os.path.join(state_dir, STATE_DB_NAME)
+        
+        # Worker threads share the connection, so every use is serialised by _state_lock
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS state (
+                load_id TEXT NOT NULL,
+                doi TEXT NOT NULL,
+                item_num INTEGER,
+                bluesky_count INTEGER,
+                twitter_count INTEGER,
+                score REAL,
+                file_name TEXT,
+                file_offset INTEGER,
+                file_length INTEGER,
+                file_hash TEXT,
+                hash_alg TEXT,
+                completed INTEGER NOT NULL DEFAULT 0,
+                last_updated TEXT,
+                errors TEXT,
+                PRIMARY KEY (load_id, doi)
+            )
+        """)
+        
+        # Databases created by earlier versions lack the columns added since
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(state)")}
+        for column, column_type in STATE_ADDED_COLUMNS.items():
+            if column not in columns:
+                conn.execute(f"ALTER TABLE state ADD COLUMN {column} {column_type}")
+        conn.commit()
+        logger.info(f"Opened state database: {db_path}")
+        
+        _state_connections[state_dir] = conn
+        return conn
+
+def flush_state(state_dir=STATE_DIR):
+    """
+    Write buffered state updates for a state directory in a single transaction.
     
-    return load_id_dir
+    Args:
+        state_dir (str): Directory where the state database is saved
+    """
+    with _state_lock:
+        pending = _pending_state_updates.get(state_dir)
+        if not pending:
+            return
+        
+        try:
+            conn = _get_state_conn(state_dir)
+            with conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO state ({', '.join(STATE_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in STATE_COLUMNS)})",
+                    list(pending.values())
+                )
+        except Exception as e:
+            # Keep the buffer so the next flush retries these rows
+            logger.error(f"Error flushing state updates: {e}")
+            return
+        
+        logger.info(f"Flushed {len(pending)} state updates to state database")
+        pending.clear()
+
+def close_state_connections():
+    """Flush buffered state updates and close all cached state database connections."""
+    with _state_lock:
+        for state_dir in list(_pending_state_updates):
+            flush_state(state_dir)
+        
+        for conn in _state_connections.values():
+            conn.close()
+        _state_connections.clear()
 
 # When re-factoring code, have source_system inherit from config files
 def generate_load_id(source_system='altmetric'):
@@ -144,38 +370,76 @@ def generate_load_id(source_system='altmetric'):
     timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
     return f"{source_system}_{timestamp}"
 
+def _row_to_state(row):
+    """
+    Convert a state table row into a state dictionary.
+    
+    Args:
+        row (tuple): Values in STATE_COLUMNS order
+    
+    Returns:
+        dict: State of ingestion for the DOI
+    """
+    state = dict(zip(STATE_COLUMNS, row))
+    state["completed"] = bool(state["completed"])
+    state["errors"] = orjson.loads(state["errors"]) if state["errors"] else []
+    return state
+
+def load_state_records(load_id, state_dir=STATE_DIR):
+    """
+    Load the state of every DOI recorded for a load in one query.
+    
+    Args:
+        load_id (str): Unique identifier for this processing batch
+        state_dir (str): Directory where the state database is saved
+    
+    Returns:
+        dict: Mapping of DOI to its state
+    """
+    try:
+        with _state_lock:
+            flush_state(state_dir)
+            rows = _get_state_conn(state_dir).execute(
+                f"SELECT {', '.join(STATE_COLUMNS)} FROM state WHERE load_id = ?",
+                (load_id,)
+            ).fetchall()
+    except Exception as e:
+        logger.error(f"Error loading state for load_id {load_id}: {e}")
+        return {}
+    
+    return {state["doi"]: state for state in map(_row_to_state, rows)}
+
 def create_or_load_state_file(doi, item_num, load_id, state_dir=STATE_DIR):
     """
-    Create or load a state file for tracking ingestion progress of a DOI.
+    Create or load the state record for tracking ingestion progress of a DOI.
     
     Args:
         doi (str): The DOI
         item_num (int): The item number
         load_id (str): Unique identifier for this processing batch
-        state_dir (str): Base directory where state files are saved
+        state_dir (str): Directory where the state database is saved
     
     Returns:
         dict: Current state of ingestion for the DOI
     """
-    # Get the load_id directory path
-    load_id_dir = get_load_id_path(load_id, state_dir)
-    
-    # Create a safe filename for the DOI
-    safe_doi = doi.replace('/', '_')
-    
-    # Create the state file path within the load_id directory
-    state_file = os.path.join(load_id_dir, f"doi_{safe_doi}_state.json")
-    
-    if os.path.exists(state_file):
-        try:
-            with open(state_file, 'r') as f:
-                state = json.load(f)
-                logger.info(f"Loaded existing state for DOI {doi} from load_id directory")
-                return state
-        except Exception as e:
-            logger.error(f"Error loading state file for DOI {doi}: {e}")
+    try:
+        with _state_lock:
+            # Buffered updates are newer than anything in the database
+            row = _pending_state_updates.get(state_dir, {}).get((load_id, doi))
+            if row is None:
+                row = _get_state_conn(state_dir).execute(
+                    f"SELECT {', '.join(STATE_COLUMNS)} FROM state WHERE load_id = ? AND doi = ?",
+                    (load_id, doi)
+                ).fetchone()
+        
+        if row is not None:
+            state = _row_to_state(row)
+            logger.info(f"Loaded existing state for DOI {doi} from state database")
+            return state
+    except Exception as e:
+        logger.error(f"Error loading state for DOI {doi}: {e}")
     
-    # Default state for new or failed state files
+    # Default state for new or unreadable state records
     return {
         "item_num": item_num,
         "doi": doi,
@@ -184,7 +448,10 @@ def create_or_load_state_file(doi, item_num, load_id, state_dir=STATE_DIR):
         "twitter_count": 0,
         "score": 0,
         "file_name": None,
+        "file_offset": None,
+        "file_length": None,
         "file_hash": None,
+        "hash_alg": None,
         "completed": False,
         "last_updated": datetime.now().isoformat(),
         "errors": []
@@ -192,20 +459,20 @@ def create_or_load_state_file(doi, item_num, load_id, state_dir=STATE_DIR):
 
 def update_state_file(state, state_dir=STATE_DIR):
     """
-    Update the state file with current ingestion progress.
+    Buffer an update of the state record with current ingestion progress.
+    
+    Updates are written to the state database every STATE_FLUSH_SIZE records,
+    and on flush_state or close_state_connections.
     
     Args:
         state (dict): Current state to save
-        state_dir (str): Base directory where state files are saved
+        state_dir (str): Directory where the state database is saved
     """
     # Get load_id from state
     load_id = state.get("load_id")
     if not load_id:
         logger.error("No load_id in state, cannot update state file")
         return
-        
-    # Get the load_id directory path
-    load_id_dir = get_load_id_path(load_id, state_dir)
     
     # Get DOI from state
     doi = state.get("doi")
@@ -213,72 +480,151 @@ def update_state_file(state, state_dir=STATE_DIR):
         logger.error("No DOI in state, cannot update state file")
         return
     
-    # Create a safe filename for the DOI
-    safe_doi = doi.replace('/', '_')
-    
-    # Create the state file path
-    state_file = os.path.join(load_id_dir, f"doi_{safe_doi}_state.json")
-    
     # Update timestamp
     state["last_updated"] = datetime.now().isoformat()
     
-    try:
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
-        logger.info(f"Updated state file for DOI {doi}")
-    except Exception as e:
-        logger.error(f"Error updating state file: {e}")
+    row = tuple(state.get(column) for column in STATE_COLUMNS[:-1]) + (orjson.dumps(state.get("errors", [])).decode(),)
+    
+    with _state_lock:
+        pending = _pending_state_updates.setdefault(state_dir, {})
+        pending[(load_id, doi)] = row
+        logger.info(f"Updated state for DOI {doi}")
+        
+        if len(pending) >= STATE_FLUSH_SIZE:
+            flush_state(state_dir)
+
+def serialize_content(content):
+    """
+    Serialize file content with sorted keys, so equal content always yields equal bytes.
+    
+    Args:
+        content (dict): Content to serialize
+        
+    Returns:
+        bytes: Serialized content, as written to disk and hashed
+    """
+    return orjson.dumps(content, option=orjson.OPT_SORT_KEYS)
 
-def generate_file_hash(content):
+def generate_file_hash(payload, hash_alg=FILE_HASH_ALG):
     """
     Generate a hash for file content to enable idempotent storage.
     
+    The hash only identifies content, so a fast non-cryptographic hash is used.
+    md5 is still supported to verify hashes recorded by earlier runs.
+    
     Args:
-        content (dict): Content to hash
+        payload (bytes): Serialized content to hash, as returned by serialize_content
+        hash_alg (str): Hash algorithm, FILE_HASH_ALG or LEGACY_FILE_HASH_ALG
         
     Returns:
         str: Hash of the content
     """
-    content_str = json.dumps(content, sort_keys=True)
-    return hashlib.md5(content_str.encode('utf-8')).hexdigest()
+    if hash_alg == LEGACY_FILE_HASH_ALG:
+        return hashlib.md5(payload).hexdigest()
+    return xxhash.xxh3_128_hexdigest(payload)
 
-def validate_doi_file(doi, output_dir, load_id, state_dir=STATE_DIR):
+def read_raw_record(state, output_dir):
     """
-    Validate that the file for a DOI exists and contains valid data.
+    Read the raw response bytes recorded in a DOI's state.
+    
+    Records in a shard are read with one pread at their offset. States without
+    an offset point at a whole per-DOI file written by earlier runs.
     
     Args:
-        doi (str): DOI
+        state (dict): State of the DOI
         output_dir (str): Directory where files are saved
-        load_id (str): Unique identifier for this processing batch
-        state_dir (str): Directory where state files are saved
+    
+    Returns:
+        bytes: Serialized raw response
+    """
+    file_path = os.path.join(output_dir, state["file_name"])
+    
+    if state.get("file_offset") is None:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        payload = os.pread(fd, state["file_length"], state["file_offset"])
+    finally:
+        os.close(fd)
+    
+    if len(payload) != state["file_length"]:
+        raise ValueError(f"Record at offset {state['file_offset']} in {file_path} is truncated")
+    return payload
+
+def list_output_files(output_dir):
+    """
+    List the files in an output directory with their sizes in one directory scan.
+    
+    Args:
+        output_dir (str): Directory where files are saved
+    
+    Returns:
+        dict: Mapping of file name to size in bytes, empty if the directory is missing
+    """
+    try:
+        with os.scandir(output_dir) as entries:
+            return {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return {}
+
+def validate_doi_file(state, output_dir, deep_validate=False, output_files=None):
+    """
+    Validate that the record in a DOI's state exists and contains valid data.
+    
+    A record whose content hash is recorded in the state is trusted once its file
+    exists and is long enough to hold it, unless deep_validate is set to re-read
+    it and verify the hash.
+    
+    Args:
+        state (dict): Already loaded state of the DOI
+        output_dir (str): Directory where files are saved
+        deep_validate (bool): If True, re-read the file and verify its content hash
+        output_files (dict): File sizes from list_output_files, to validate many DOIs without a stat each
         
     Returns:
         bool: True if file is valid, False otherwise
     """
-    # Create a temp state for validation - we don't need item_num here
-    state = create_or_load_state_file(doi, 0, load_id, state_dir)
+    doi = state.get("doi")
     
     if not state.get("file_name"):
         logger.info(f"No file found for DOI {doi} in state. Processing required.")
         return False
     
     file_path = os.path.join(output_dir, state["file_name"])
-    if not os.path.exists(file_path):
+    if output_files is not None:
+        file_size = output_files.get(state["file_name"])
+    else:
+        try:
+            file_size = os.path.getsize(file_path)
+        except OSError:
+            file_size = None
+    
+    if file_size is None:
         logger.warning(f"File {file_path} does not exist for DOI {doi}")
         return False
     
+    if state.get("file_offset") is not None and file_size < state["file_offset"] + state["file_length"]:
+        logger.warning(f"File {file_path} is too short to hold the record for DOI {doi}")
+        return False
+    
+    # The hash was taken from this content when the record was written
+    if state.get("file_hash") and not deep_validate:
+        return True
+    
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            # Basic validation - check if essential keys exist
-            if 'raw_response' in data and 'metadata' in data:
-                # If we have a stored hash, verify the content matches
-                if state.get("file_hash"):
-                    actual_hash = generate_file_hash(data)
-                    if actual_hash != state.get("file_hash"):
-                        logger.warning(f"File {file_path} hash mismatch. Expected: {state.get('file_hash')}, Got: {actual_hash}")
-                        return False
-                return True
+        payload = read_raw_record(state, output_dir)
+        data = orjson.loads(payload)
+        # Basic validation - check if essential keys exist
+        if 'raw_response' in data and 'metadata' in data:
+            # If we have a stored hash, verify the bytes on disk match it
+            if state.get("file_hash"):
+                actual_hash = generate_file_hash(payload, state.get("hash_alg") or LEGACY_FILE_HASH_ALG)
+                if actual_hash != state.get("file_hash"):
+                    logger.warning(f"File {file_path} hash mismatch. Expected: {state.get('file_hash')}, Got: {actual_hash}")
+                    return False
+            return True
         logger.warning(f"File {file_path} exists but contains invalid data")
         return False
     except Exception as e:
@@ -326,7 +672,8 @@ def read_dois(file_path):
         logger.error(f"Error reading DOI file: {e}")
         return []
 
-def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RETRIES, state_dir=STATE_DIR):
+def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RETRIES, state_dir=STATE_DIR,
+                         rate_limiter=None, deep_validate=False, session=None, shard_writer=None):
     """
     Query Altmetric for metrics of a specific DOI with retry capability and state tracking.
     
@@ -336,19 +683,24 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
         item_num (int): Current item number for naming files
         load_id (str): Unique identifier for this processing batch
         max_retries (int): Maximum number of retry attempts
-        state_dir (str): Directory where state files are saved
+        state_dir (str): Directory where the state database is saved
+        rate_limiter (RequestRateLimiter): Shared pacer awaited before every request attempt
+        deep_validate (bool): If True, re-read existing files to verify their content hash
+        session (requests.Session): Shared session to reuse pooled connections, or None for a one-off request
+        shard_writer (RawShardWriter): Shared writer appending raw responses to shards, or None for a one-off writer
         
     Returns:
         dict: Metadata about the processing
     """
-    # Record start time
+    # Record start time, with a monotonic counter for measuring duration
     start_time = datetime.now()
+    start_counter = time.perf_counter()
     
     # Load existing state or create new one
     state = create_or_load_state_file(doi, item_num, load_id, state_dir)
     
     # Check if this DOI was already completely processed and file is valid
-    if state.get("completed", False) and validate_doi_file(doi, output_dir, load_id, state_dir):
+    if state.get("completed", False) and validate_doi_file(state, output_dir, deep_validate):
         logger.info(f"DOI {doi} was already completely processed with valid file. Skipping.")
         return {
             "load_id": load_id,
@@ -356,7 +708,7 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
             "doi": doi,
             "start_time": start_time.isoformat(),
             "end_time": datetime.now().isoformat(),
-            "duration_seconds": (datetime.now() - start_time).total_seconds(),
+            "duration_seconds": time.perf_counter() - start_counter,
             "success": True,
             "bluesky_count": state.get("bluesky_count", 0),
             "twitter_count": state.get("twitter_count", 0),
@@ -378,8 +730,16 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
     # Implement retry mechanism
     while retry_count < max_retries and not success:
         try:
+            # Cached responses never reach the API, so only requests that will are paced
+            if rate_limiter is not None and not is_cached_response(session, url):
+                rate_limiter.wait()
+            
             logger.info(f"Requesting metrics for DOI {doi} (item {item_num}, attempt {retry_count + 1})")
-            response = requests.get(url)
+            response = (session or requests).get(url)
+            
+            # Let the limiter adapt the shared request rate to the API's feedback
+            if rate_limiter is not None:
+                rate_limiter.record_response(response)
             
             # Handle 404s (DOI not found in Altmetric)
             if response.status_code == 404:
@@ -405,16 +765,17 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
             else:
                 logger.error(f"Failed to retrieve metrics after {max_retries} attempts")
     
-    # Record end time
+    # Record end time once, reusing it for every timestamp taken while saving this response
     end_time = datetime.now()
-    duration_seconds = (end_time - start_time).total_seconds()
+    end_time_iso = end_time.isoformat()
+    duration_seconds = time.perf_counter() - start_counter
     
     # Add metadata to the response
     enriched_data = {
         'metadata': {
             'load_id': load_id,
             'data_source': 'altmetric_api',
-            'request_timestamp': datetime.now().isoformat(),
+            'request_timestamp': end_time_iso,
             'query_parameters': {
                 'doi': doi,
                 'item_num': item_num
@@ -426,50 +787,50 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
         'raw_response': response_data
     }
     
-    # Generate a content hash for the data before saving
-    content_hash = generate_file_hash(enriched_data)
+    # Serialize once, hashing and writing the same bytes
+    payload = serialize_content(enriched_data)
+    content_hash = generate_file_hash(payload)
     
     # Extract metrics from the response
     bluesky_count = response_data.get('cited_by_bluesky_count', 0) if success else 0
     twitter_count = response_data.get('cited_by_tweeters_count', 0) if success else 0
     score = response_data.get('score', 0) if success else 0
     
-    # Save the raw response to the partitioned output directory (only if we got data)
+    # Save the raw response to a shard in the partitioned output directory (only if we got data)
     file_name = None
+    file_offset = None
+    file_length = None
     file_saved = False
     write_file = True
     
-    # Check if we already have a file with the same content hash
+    # Check if we already have a record with the same content hash
     if state.get("file_hash") == content_hash and state.get("file_name"):
-        existing_file_path = os.path.join(output_dir, state.get("file_name"))
-        if os.path.exists(existing_file_path):
-            try:
-                # Verify the existing file is valid by opening it
-                with open(existing_file_path, 'r') as f:
-                    json.load(f)  # Just try to load it to ensure it's valid JSON
-                    
-                # If we get here, the file exists and is valid
-                logger.info(f"File with identical content already exists: {state.get('file_name')}. Skipping write.")
-                file_name = state.get("file_name")
-                write_file = False
-                file_saved = True
-            except Exception as e:
-                # If there was an error reading the file, we'll need to rewrite it
-                logger.warning(f"Existing file with matching hash couldn't be read: {e}. Will rewrite.")
-                write_file = True
-        else:
+        try:
+            # Verify the existing record is valid by reading it
+            orjson.loads(read_raw_record(state, output_dir))  # Just try to load it to ensure it's valid JSON
+            
+            # If we get here, the record exists and is valid
+            logger.info(f"Record with identical content already exists in {state.get('file_name')}. Skipping write.")
+            file_name = state.get("file_name")
+            file_offset = state.get("file_offset")
+            file_length = state.get("file_length")
+            write_file = False
+            file_saved = True
+        except FileNotFoundError:
             # File doesn't exist, even though we have a hash
             logger.warning(f"Expected file {state.get('file_name')} not found. Will create new file.")
+        except Exception as e:
+            # If there was an error reading the record, we'll need to rewrite it
+            logger.warning(f"Existing record with matching hash couldn't be read: {e}. Will rewrite.")
+            write_file = True
     
-    # If no matching hash or couldn't verify existing file, generate a new filename and save
+    # If no matching hash or couldn't verify existing record, append it to the current shard
     if write_file and success:
-        file_name = f"altmetric_doi_{doi.replace('/', '_')}_{datetime.now().strftime('%Y%m%d')}.json"
-        file_path = os.path.join(output_dir, file_name)
+        writer = shard_writer or RawShardWriter(output_dir, load_id)
         
         try:
-            with open(file_path, 'w') as f:
-                json.dump(enriched_data, f, indent=2)
-            logger.info(f"Saved raw data to {file_path}")
+            file_name, file_offset, file_length = writer.append(payload)
+            logger.info(f"Saved raw data to {os.path.join(output_dir, file_name)} at offset {file_offset}")
             file_saved = True
         except Exception as e:
             logger.error(f"Error saving raw data: {e}")
@@ -478,7 +839,7 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
             # Update state file with file write error
             state_errors = state.get("errors", [])
             state_errors.append({
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": end_time_iso,
                 "error": f"File write error: {str(e)}"
             })
             
@@ -487,6 +848,9 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
                 "errors": state_errors
             })
             update_state_file(state, state_dir)
+        finally:
+            if shard_writer is None:
+                writer.close()
     
     # Only update the state if file was saved or we verified an existing file
     if success and (file_saved or not write_file):
@@ -495,7 +859,10 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
             "twitter_count": twitter_count,
             "score": score,
             "file_name": file_name,
+            "file_offset": file_offset,
+            "file_length": file_length,
             "file_hash": content_hash,  # Store the hash for future reference
+            "hash_alg": FILE_HASH_ALG,
             "completed": True,
             "errors": []
         })
@@ -504,7 +871,7 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
         # Update state with the error
         state_errors = state.get("errors", [])
         state_errors.append({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": end_time_iso,
             "error": error_message
         })
         state["errors"] = state_errors
@@ -516,7 +883,7 @@ def altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries=MAX_RET
         "item_num": item_num,
         "doi": doi,
         "start_time": start_time.isoformat(),
-        "end_time": end_time.isoformat(),
+        "end_time": end_time_iso,
         "duration_seconds": duration_seconds,
         "success": success,
         "error": error_message if not success else None,
@@ -534,34 +901,24 @@ def get_incomplete_dois(dois, load_id, state_dir=STATE_DIR):
     Args:
         dois (list): List of all DOIs
         load_id (str): Unique identifier for this processing batch
-        state_dir (str): Directory where state files are saved
+        state_dir (str): Directory where the state database is saved
         
     Returns:
         list: List of DOIs that need processing
     """
-    load_id_dir = os.path.join(state_dir, f"load_id_{load_id}")
-    
-    if not os.path.exists(load_id_dir):
-        logger.info(f"No state directory exists for load_id {load_id}. All DOIs need processing.")
-        return dois
-    
-    # Track DOIs with completed state
-    completed_dois = set()
+    # Fetch every DOI with a completed state for this load in one query
+    try:
+        with _state_lock:
+            flush_state(state_dir)
+            rows = _get_state_conn(state_dir).execute(
+                "SELECT doi FROM state WHERE load_id = ? AND completed = 1",
+                (load_id,)
+            ).fetchall()
+    except Exception as e:
+        logger.error(f"Error reading state for load_id {load_id}: {e}")
+        rows = []
     
-    # Check each DOI for a completed state
-    for doi in dois:
-        safe_doi = doi.replace('/', '_')
-        state_file = os.path.join(load_id_dir, f"doi_{safe_doi}_state.json")
-        
-        if os.path.exists(state_file):
-            try:
-                with open(state_file, 'r') as f:
-                    state = json.load(f)
-                    # If state is marked as completed, add to completed DOIs
-                    if state.get("completed", False):
-                        completed_dois.add(doi)
-            except Exception as e:
-                logger.error(f"Error reading state file for DOI {doi}: {e}")
+    completed_dois = {doi for (doi,) in rows}
     
     # DOIs that are not marked as completed need processing
     incomplete_dois = [doi for doi in dois if doi not in completed_dois]
@@ -569,10 +926,14 @@ def get_incomplete_dois(dois, load_id, state_dir=STATE_DIR):
     logger.info(f"Found {len(incomplete_dois)} out of {len(dois)} DOIs requiring processing.")
     return incomplete_dois
 
-def process_dois_sequentially(dois, output_dir, load_id, requests_per_second=REQUESTS_PER_SECOND, 
-                              max_retries=MAX_RETRIES, state_dir=STATE_DIR, force_reprocess=False):
+def process_dois_concurrently(dois, output_dir, load_id, requests_per_second=REQUESTS_PER_SECOND, 
+                              max_retries=MAX_RETRIES, state_dir=STATE_DIR, force_reprocess=False,
+                              deep_validate=False):
     """
-    Process DOIs one at a time with controlled request rate, state tracking, and idempotent storage.
+    Process DOIs with concurrent in-flight requests, controlled request rate, state tracking, and idempotent storage.
+    
+    Up to requests_per_second lookups run at once on worker threads, so throughput is
+    bound by the rate limit rather than by the round trip time of each request.
     
     Args:
         dois (list): List of DOIs to process
@@ -580,8 +941,9 @@ def process_dois_sequentially(dois, output_dir, load_id, requests_per_second=REQ
         load_id (str): Unique identifier for this processing batch
         requests_per_second (int): Number of requests to make per second
         max_retries (int): Maximum number of retry attempts
-        state_dir (str): Directory where state files are saved
+        state_dir (str): Directory where the state database is saved
         force_reprocess (bool): If True, reprocess all DOIs regardless of state
+        deep_validate (bool): If True, re-read existing files to verify their content hash
         
     Returns:
         list: List of processing results
@@ -597,51 +959,60 @@ def process_dois_sequentially(dois, output_dir, load_id, requests_per_second=REQ
     total_dois = len(dois)
     dois_to_process_count = len(dois_to_process)
     
-    logger.info(f"Processing {dois_to_process_count} of {total_dois} DOIs sequentially at {requests_per_second} requests per second")
+    logger.info(f"Processing {dois_to_process_count} of {total_dois} DOIs concurrently at {requests_per_second} requests per second")
+    
+    # Shared pacer so all worker threads together stay within the request rate
+    rate_limiter = RequestRateLimiter(requests_per_second)
+    
+    # Shared session so workers reuse kept-alive connections rather than reconnecting per DOI
+    session = create_session(requests_per_second)
     
-    # Calculate delay between requests
-    delay = 1.0 / requests_per_second
+    # Shared writer so raw responses land in a few shard files rather than one file per DOI
+    shard_writer = RawShardWriter(output_dir, load_id)
     
-    # Create a DOI to item_num mapping for all DOIs
+    # Pair each DOI to process with its item_num, its position in the full DOI list
     doi_to_item_num = {doi: i+1 for i, doi in enumerate(dois)}
+    items_to_process = [(doi_to_item_num[doi], doi) for doi in dois_to_process]
     
-    # Process DOIs that need processing
-    for i, doi in enumerate(dois_to_process):
-        item_num = doi_to_item_num[doi]
-        start_time = time.time()
-        
-        # Process the DOI
-        result = altmetric_doi_lookup(doi, output_dir, item_num, load_id, max_retries, state_dir)
-        results.append(result)
-        
-        # Calculate how long to wait before the next request
-        processing_time = time.time() - start_time
-        wait_time = max(0, delay - processing_time)
-        
-        # Progress reporting
-        if i % 100 == 0 or i == dois_to_process_count - 1:
-            logger.info(f"Processed {i+1}/{dois_to_process_count} DOIs ({((i+1)/dois_to_process_count*100):.1f}%)")
+    # Process DOIs that need processing, one worker per request allowed each second
+    try:
+        with ThreadPoolExecutor(max_workers=requests_per_second) as executor:
+            futures = [
+                executor.submit(altmetric_doi_lookup, doi, output_dir, item_num, load_id,
+                                max_retries, state_dir, rate_limiter, deep_validate, session, shard_writer)
+                for item_num, doi in items_to_process
+            ]
+            
+            for i, future in enumerate(as_completed(futures)):
+                results.append(future.result())
+                
+                # Progress reporting
+                if i % 100 == 0 or i == dois_to_process_count - 1:
+                    logger.info(f"Processed {i+1}/{dois_to_process_count} DOIs ({((i+1)/dois_to_process_count*100):.1f}%)")
+    finally:
+        session.close()
+        shard_writer.close()
         
-        # Only wait if this is not the last item
-        if i < dois_to_process_count - 1 and wait_time > 0:
-            time.sleep(wait_time)
+        # Persist the final partial batch even if processing was interrupted
+        flush_state(state_dir)
     
     # For a complete manifest, load data for DOIs that were already processed
     processed_dois = set(result["doi"] for result in results)
     
-    # Find DOIs that were already processed before this run
-    for doi in dois:
+    # Find DOIs that were already processed before this run, from one bulk read of the load's state
+    stored_states = load_state_records(load_id, state_dir)
+    output_files = list_output_files(output_dir)
+    rehydrated_at = datetime.now().isoformat()
+    for item_num, doi in enumerate(dois, 1):
         if doi not in processed_dois:
-            # Create temp state for rehydrating results (we don't need item_num here)
-            state = create_or_load_state_file(doi, 0, load_id, state_dir)
-            if state.get("completed", False) and validate_doi_file(doi, output_dir, load_id, state_dir):
-                item_num = doi_to_item_num[doi]
+            state = stored_states.get(doi)
+            if state and state.get("completed", False) and validate_doi_file(state, output_dir, deep_validate, output_files):
                 results.append({
                     "load_id": load_id,
                     "item_num": item_num,
                     "doi": doi,
-                    "start_time": state.get("last_updated", datetime.now().isoformat()),
-                    "end_time": state.get("last_updated", datetime.now().isoformat()),
+                    "start_time": state.get("last_updated") or rehydrated_at,
+                    "end_time": state.get("last_updated") or rehydrated_at,
                     "duration_seconds": 0,
                     "success": True,
                     "bluesky_count": state.get("bluesky_count", 0),
@@ -656,10 +1027,45 @@ def process_dois_sequentially(dois, output_dir, load_id, requests_per_second=REQ
     
     return results
 
+def _manifest_item_entry(result):
+    """
+    Build the manifest entry for one processed DOI.
+    
+    Args:
+        result (dict): Metadata from DOI processing
+    
+    Returns:
+        dict: Manifest item entry
+    """
+    item_entry = {
+        "item_number": result["item_num"],
+        "doi": result["doi"],
+        "timestamp": {
+            "start_time": result["start_time"],
+            "end_time": result["end_time"],
+            "duration_seconds": result["duration_seconds"]
+        },
+        "results": {
+            "success": result["success"],
+            "has_metrics": result.get("has_metrics", False),
+            "bluesky_count": result.get("bluesky_count", 0),
+            "twitter_count": result.get("twitter_count", 0),
+            "score": result.get("score", 0)
+        },
+        "file_name": result["file_name"]
+    }
+    
+    if not result["success"]:
+        item_entry["error"] = result.get("error", "Unknown error")
+    
+    return item_entry
+
 def generate_manifest(results, input_file, output_dir, manifest_dir=MANIFEST_DIR, load_id=None):
     """
     Generate and save a manifest file containing metadata about each DOI processed.
     
+    Item entries are serialized and written one at a time after the summary header.
+    
     Args:
         results: List of metadata dictionaries from DOI processing
         input_file: Path to the input file used
@@ -670,18 +1076,20 @@ def generate_manifest(results, input_file, output_dir, manifest_dir=MANIFEST_DIR
     Returns:
         str: Path to the generated manifest file
     """
+    # Take the time once so the partition, file name and timestamp always agree
+    now = datetime.now()
+    
     # Create date-partitioned directory for manifest file
-    current_year_month = datetime.now().strftime('%Y%m')
-    current_day = datetime.now().strftime('%d')
+    current_year_month = now.strftime('%Y%m')
+    current_day = now.strftime('%d')
     manifest_date_dir = os.path.join(manifest_dir, current_year_month, current_day)
     
     # Create directory if it doesn't exist
-    if not os.path.exists(manifest_date_dir):
-        os.makedirs(manifest_date_dir, exist_ok=True)
+    if _ensure_dir(manifest_date_dir):
         logger.info(f"Created manifest directory: {manifest_date_dir}")
     
     # Create filename with current date
-    manifest_file = os.path.join(manifest_date_dir, f"altmetric_manifest_{datetime.now().strftime('%Y%m%d')}.json")
+    manifest_file = os.path.join(manifest_date_dir, f"altmetric_manifest_{now.strftime('%Y%m%d')}.json")
     
     # Calculate overall metrics
     successful_requests = [r for r in results if r["success"]]
@@ -691,7 +1099,7 @@ def generate_manifest(results, input_file, output_dir, manifest_dir=MANIFEST_DIR
     total_twitter_mentions = sum(r.get("twitter_count", 0) for r in results)
     
     manifest = {
-        "manifest_generated": datetime.now().isoformat(),
+        "manifest_generated": now.isoformat(),
         "load_id": load_id,
         "total_dois_processed": total_dois,
         "successful_requests": len(successful_requests),
@@ -704,8 +1112,7 @@ def generate_manifest(results, input_file, output_dir, manifest_dir=MANIFEST_DIR
             "coverage_rate": round(dois_with_metrics / total_dois * 100, 2) if total_dois > 0 else 0,
             "total_bluesky_mentions": total_bluesky_mentions,
             "total_twitter_mentions": total_twitter_mentions
-        },
-        "items": []
+        }
     }
     
     # Calculate processing duration if we have both start and end times
@@ -715,34 +1122,19 @@ def generate_manifest(results, input_file, output_dir, manifest_dir=MANIFEST_DIR
         duration = (end - start).total_seconds()
         manifest["processing_summary"]["duration_seconds"] = duration
     
-    # Add item-specific metadata
-    for result in results:
-        item_entry = {
-            "item_number": result["item_num"],
-            "doi": result["doi"],
-            "timestamp": {
-                "start_time": result["start_time"],
-                "end_time": result["end_time"],
-                "duration_seconds": result["duration_seconds"]
-            },
-            "results": {
-                "success": result["success"],
-                "has_metrics": result.get("has_metrics", False),
-                "bluesky_count": result.get("bluesky_count", 0),
-                "twitter_count": result.get("twitter_count", 0),
-                "score": result.get("score", 0)
-            },
-            "file_name": result["file_name"]
-        }
-        
-        if not result["success"]:
-            item_entry["error"] = result.get("error", "Unknown error")
-        
-        manifest["items"].append(item_entry)
-    
     try:
-        with open(manifest_file, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        with open(manifest_file, 'wb') as f:
+            # Header fields first, leaving the document open for the items array
+            f.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2)[:-2])
+            f.write(b',\n  "items": [')
+            
+            # Stream each item entry rather than building the whole items list in memory
+            for i, result in enumerate(results):
+                item_bytes = orjson.dumps(_manifest_item_entry(result), option=orjson.OPT_INDENT_2)
+                f.write(b',\n    ' if i else b'\n    ')
+                f.write(item_bytes.replace(b'\n', b'\n    '))
+            
+            f.write(b'\n  ]\n}' if results else b']\n}')
         logger.info(f"Manifest file generated and saved to {manifest_file}")
         return manifest_file
     except Exception as e:
@@ -760,13 +1152,15 @@ def main():
     parser.add_argument("--manifest-dir", "-m", default=MANIFEST_DIR,
                         help=f"Base directory for manifest files (default: {MANIFEST_DIR})")
     parser.add_argument("--state-dir", "-s", default=STATE_DIR,
-                        help=f"Directory for state files (default: {STATE_DIR})")
+                        help=f"Directory for the state database (default: {STATE_DIR})")
     parser.add_argument("--retries", "-r", type=int, default=MAX_RETRIES,
                         help=f"Maximum number of retry attempts (default: {MAX_RETRIES})")
     parser.add_argument("--rate", type=int, default=REQUESTS_PER_SECOND,
                         help=f"Requests per second (default: {REQUESTS_PER_SECOND})")
     parser.add_argument("--force-reprocess", "-f", action="store_true",
                         help="Force reprocessing of all DOIs, ignoring existing state")
+    parser.add_argument("--deep-validate", action="store_true",
+                        help="Re-read existing raw files and verify their content hash instead of only checking they exist")
     parser.add_argument("--load-id", "-l", default=None,
                         help="Load ID to resume processing (if None, a new load_id will be generated)")
     args = parser.parse_args()
@@ -800,15 +1194,22 @@ def main():
     
     logger.info(f"Found {len(dois)} DOIs")
     
-    # Process DOIs sequentially with rate limiting, state tracking, and idempotent storage
-    results = process_dois_sequentially(
+    # Drop repeated DOIs, keeping first-seen order so item numbers stay stable across resumes
+    total_read = len(dois)
+    dois = list(dict.fromkeys(dois))
+    if len(dois) < total_read:
+        logger.info(f"Removed {total_read - len(dois)} duplicate DOIs, {len(dois)} unique DOIs remain")
+    
+    # Process DOIs concurrently with rate limiting, state tracking, and idempotent storage
+    results = process_dois_concurrently(
         dois, 
         output_dir, 
         load_id,
         requests_per_second=args.rate, 
         max_retries=args.retries,
         state_dir=args.state_dir,
-        force_reprocess=args.force_reprocess
+        force_reprocess=args.force_reprocess,
+        deep_validate=args.deep_validate
     )
     
     # Generate manifest file
@@ -836,8 +1237,10 @@ def main():
     logger.info(f"Total processing time: {script_duration:.2f} seconds")
     
     # Get manifest directory path for logging
-    manifest_date_dir = os.path.join(args.manifest_dir, datetime.now().strftime('%Y%m'), datetime.now().strftime('%d'))
+    manifest_date_dir = os.path.join(args.manifest_dir, script_end_time.strftime('%Y%m'), script_end_time.strftime('%d'))
     logger.info(f"Manifest file generated in: {manifest_date_dir}")
+    
+    close_state_connections()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,10 +7,11 @@ the Overton and Scival Publication Metrics Retrieval APIs.
 """
 
 import os
-import json
 import glob
 import logging
 import argparse
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Define paths consistent with the existing codebase
@@ -32,6 +33,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger("scopus_doi_and_pubid_extraction")
 
+# Key paths to the entry list, with the metadata wrapper first and the direct structure as fallback
+ENTRY_PATHS = (
+    ('raw_response', 'search-results', 'entry'),
+    ('search-results', 'entry')
+)
+
+# Path that matched the previous file in this process, tried first since files in a run share a layout
+_last_entry_path = ENTRY_PATHS[0]
+
+# Total input size below which files are parsed serially; orjson parses a few hundred MB per second,
+# so smaller runs finish before a worker pool has started and unpickled its tasks
+PARALLEL_MIN_BYTES = 128 * 1024 * 1024
+
 def find_json_files(directory, date=None):
     """
     Find all JSON files matching the pattern in the specified YYYYMM/DD directory structure.
@@ -55,10 +69,80 @@ def find_json_files(directory, date=None):
     logger.info(f"Found {len(files)} JSON files matching the pattern for date {date_string} in {directory}")
     return files
 
+def _find_entries(data):
+    """
+    Find the list of search result entries in a parsed Scopus response.
+    
+    Args:
+        data (dict): Parsed response
+        
+    Returns:
+        list: Entries, or None if no known layout matches
+    """
+    global _last_entry_path
+    
+    for path in (_last_entry_path,) + ENTRY_PATHS:
+        node = data
+        try:
+            for key in path:
+                node = node[key]
+        except (KeyError, TypeError):
+            continue
+        
+        _last_entry_path = path
+        return node
+    
+    return None
+
+def _parse_one(file_path):
+    """
+    Extract DOIs and EIDs from a single Scopus response file.
+    
+    Runs in a worker process, so it must stay a module-level function.
+    
+    Args:
+        file_path (str): Path of the file to process
+        
+    Returns:
+        tuple: Sets of DOIs and EIDs found, and whether the file was processed
+    """
+    dois = set()
+    eids = set()
+    
+    try:
+        with open(file_path, 'rb') as file:
+            data = orjson.loads(file.read())
+        
+        # Navigate to the entries with or without the metadata wrapper
+        entries = _find_entries(data)
+        if entries is None:
+            logger.warning(f"Could not find entry data in file {file_path}")
+            return dois, eids, False
+        
+        # Process each entry in the data
+        for entry in entries:
+            # Extract DOI (using the key found in the sample: 'prism:doi')
+            doi = entry.get('prism:doi')
+            if doi:
+                dois.add(doi)
+            
+            # Extract EID (using the key found in the sample: 'eid')
+            eid = entry.get('eid')
+            if eid:
+                eids.add(eid)
+    except Exception as e:
+        logger.error(f"Error processing file {file_path}: {e}")
+        return dois, eids, False
+    
+    return dois, eids, True
+
 def extract_identifiers(files):
     """
     Extract unique DOIs and EIDs from the JSON files.
     
+    Large inputs are parsed in parallel across a pool of worker processes, one per
+    CPU core; inputs under PARALLEL_MIN_BYTES, or single-core machines, parse serially.
+    
     Args:
         files (list): List of file paths to process
         
@@ -69,40 +153,32 @@ def extract_identifiers(files):
     unique_eids = set()
     processed_files = 0
     
-    for file_path in files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                
-                # Based on the sample JSON provided, navigate the structure
-                # First try the structure with metadata wrapper
-                if 'raw_response' in data and 'search-results' in data['raw_response'] and 'entry' in data['raw_response']['search-results']:
-                    entries = data['raw_response']['search-results']['entry']
-                # Fallback to direct structure without metadata wrapper
-                elif 'search-results' in data and 'entry' in data['search-results']:
-                    entries = data['search-results']['entry']
-                else:
-                    logger.warning(f"Could not find entry data in file {file_path}")
-                    continue
-                
-                # Process each entry in the data
-                for entry in entries:
-                    # Extract DOI (using the key found in the sample: 'prism:doi')
-                    doi = entry.get('prism:doi')
-                    if doi:
-                        unique_dois.add(doi)
-                    
-                    # Extract EID (using the key found in the sample: 'eid')
-                    eid = entry.get('eid')
-                    if eid:
-                        unique_eids.add(eid)
+    if not files:
+        return unique_dois, unique_eids
+    
+    max_workers = min(os.cpu_count() or 1, len(files))
+    total_bytes = sum(os.path.getsize(file_path) for file_path in files if os.path.isfile(file_path))
+    
+    if max_workers < 2 or total_bytes < PARALLEL_MIN_BYTES:
+        results = map(_parse_one, files)
+        executor = None
+    else:
+        logger.info(f"Parsing {total_bytes} bytes across {max_workers} worker processes")
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        results = executor.map(_parse_one, files, chunksize=8)
+    
+    try:
+        for dois, eids, processed in results:
+            unique_dois |= dois
+            unique_eids |= eids
             
-            processed_files += 1
-            if processed_files % 10 == 0:  # Log every 10 files for larger datasets
-                logger.info(f"Processed {processed_files}/{len(files)} files")
-                
-        except Exception as e:
-            logger.error(f"Error processing file {file_path}: {e}")
+            if processed:
+                processed_files += 1
+                if processed_files % 10 == 0:  # Log every 10 files for larger datasets
+                    logger.info(f"Processed {processed_files}/{len(files)} files")
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     logger.info(f"Successfully processed {processed_files} files")
     logger.info(f"Extracted {len(unique_dois)} unique DOIs and {len(unique_eids)} unique EIDs")
@@ -166,8 +242,9 @@ def write_to_file(items, file_path):
     """
     try:
         with open(file_path, 'w', encoding='utf-8') as file:
-            for item in sorted(items):
-                file.write(f"{item}\n")
+            # Join all lines and write once instead of one write call per item
+            if items:
+                file.write("\n".join(sorted(items)) + "\n")
         logger.info(f"Successfully wrote {len(items)} items to {file_path}")
     except Exception as e:
         logger.error(f"Error writing to file {file_path}: {e}")
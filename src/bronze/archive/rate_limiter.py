@@ -0,0 +1,127 @@
+"""
+Request Rate Limiter
+Thread-safe request pacing for the API ingestion scripts, adapting the request
+rate to throttling feedback from the API.
+"""
+
+import time
+import logging
+import threading
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger("rate_limiter")
+
+class RequestRateLimiter:
+    """
+    Thread-safe pacer that spaces request start times evenly across worker threads.
+    
+    Each caller reserves the next free slot under a lock and sleeps outside it,
+    so concurrent workers never exceed the current rate between them. The rate
+    adapts to the API's feedback: it is halved on throttling or server errors
+    and recovers additively on success (AIMD), and a Retry-After header pauses
+    every worker until the server is ready again.
+    
+    Many requests are in flight at once, so a single congestion event returns
+    a burst of throttled responses. Only the first one within each decrease
+    cooldown lowers the rate; the rest are part of the same event.
+    """
+    
+    # Multiplicative decrease factor, and additive increase in requests per second gained per second of success
+    RATE_DECREASE_FACTOR = 0.5
+    RATE_INCREASE_STEP = 0.5
+    
+    # Seconds after a decrease during which further throttled responses count as the same event
+    DECREASE_COOLDOWN_SECONDS = 1.0
+    
+    # Fraction of the X-RateLimit-Limit quota below which remaining requests count as throttling
+    LOW_REMAINING_FRACTION = 0.1
+    
+    def __init__(self, requests_per_second, min_requests_per_second=1):
+        self.max_rate = requests_per_second
+        self.min_rate = min(min_requests_per_second, requests_per_second)
+        self.rate = requests_per_second
+        self.interval = 1.0 / requests_per_second
+        self._next_slot = time.monotonic()
+        self._last_decrease = None
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Block until the caller's reserved request slot arrives."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def record_response(self, response):
+        """
+        Adapt the request rate to an API response.
+        
+        Args:
+            response (requests.Response): Response to a paced request
+        """
+        # Responses served from the request cache say nothing about the API's load
+        if getattr(response, 'from_cache', False):
+            return
+        
+        retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+        throttled = response.status_code == 429 or response.status_code >= 500 or self._quota_low(response.headers)
+        
+        decreased = False
+        with self._lock:
+            now = time.monotonic()
+            previous_rate = self.rate
+            if throttled:
+                if self._last_decrease is None or now - self._last_decrease >= self.DECREASE_COOLDOWN_SECONDS:
+                    self.rate = max(self.min_rate, self.rate * self.RATE_DECREASE_FACTOR)
+                    self._last_decrease = now
+                    decreased = True
+            else:
+                # About rate successes arrive each second, so each adds its share of the step
+                # and the rate grows linearly rather than in proportion to itself
+                self.rate = min(self.max_rate, self.rate + self.RATE_INCREASE_STEP / self.rate)
+            self.interval = 1.0 / self.rate
+            
+            if retry_after:
+                self._next_slot = max(self._next_slot, now + retry_after)
+        
+        if decreased:
+            logger.warning(f"API throttling (status {response.status_code}), request rate lowered "
+                           f"from {previous_rate:.1f} to {self.rate:.1f} per second")
+        if retry_after:
+            logger.warning(f"API asked to retry after {retry_after:.1f} seconds, pausing all requests")
+    
+    def _quota_low(self, headers):
+        """Check whether the X-RateLimit headers report a nearly exhausted quota."""
+        try:
+            limit = int(headers['X-RateLimit-Limit'])
+            remaining = int(headers['X-RateLimit-Remaining'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        
+        return remaining < limit * self.LOW_REMAINING_FRACTION
+    
+    @staticmethod
+    def _parse_retry_after(value):
+        """
+        Parse a Retry-After header given either in seconds or as an HTTP date.
+        
+        Returns:
+            float: Seconds to wait, or None if the header is absent or invalid
+        """
+        if not value:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
@@ -0,0 +1,102 @@
+import pytest
+import sys
+import os
+import threading
+from types import SimpleNamespace
+
+# Get the project root directory (4 levels up from this test file)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.bronze.archive import rate_limiter
+from src.bronze.archive.rate_limiter import RequestRateLimiter
+
+def _response(status_code, headers=None):
+    """Build a minimal uncached API response with the given status and headers"""
+    return SimpleNamespace(status_code=status_code, headers=headers or {}, from_cache=False)
+
+def test_record_response_with_concurrent_429_burst_decreases_rate_once():
+    """
+    Test that a burst of throttled responses from requests in flight at the
+    same time lowers the rate once rather than once per response.
+    """
+    # Arrange
+    limiter = RequestRateLimiter(50)
+    start = threading.Barrier(50)
+    
+    def record_throttled():
+        start.wait()
+        limiter.record_response(_response(429))
+    
+    threads = [threading.Thread(target=record_throttled) for _ in range(50)]
+    
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # Assert
+    assert limiter.rate == 25
+    assert limiter.interval == pytest.approx(1 / 25)
+
+def test_record_response_with_429_after_cooldown_decreases_rate_again(monkeypatch):
+    """
+    Test that throttling after the decrease cooldown counts as a new
+    congestion event and halves the rate again.
+    """
+    # Arrange
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', lambda: clock[0])
+    limiter = RequestRateLimiter(50)
+    limiter.record_response(_response(429))
+    limiter.record_response(_response(429))
+    
+    # Act
+    clock[0] += RequestRateLimiter.DECREASE_COOLDOWN_SECONDS
+    limiter.record_response(_response(429))
+    
+    # Assert
+    assert limiter.rate == 12.5
+
+def test_record_response_with_low_quota_burst_never_drops_below_minimum(monkeypatch):
+    """
+    Test that repeated congestion events stop lowering the rate at the
+    configured minimum.
+    """
+    # Arrange
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', lambda: clock[0])
+    limiter = RequestRateLimiter(50, min_requests_per_second=5)
+    low_quota = {'X-RateLimit-Limit': '1000', 'X-RateLimit-Remaining': '10'}
+    
+    # Act
+    for _ in range(10):
+        for _ in range(50):
+            limiter.record_response(_response(200, low_quota))
+        clock[0] += RequestRateLimiter.DECREASE_COOLDOWN_SECONDS
+    
+    # Assert
+    assert limiter.rate == 5
+
+def test_record_response_with_successes_recovers_rate_linearly(monkeypatch):
+    """
+    Test that after a decrease the rate recovers by about the increase step
+    per second of successful responses, rather than compounding.
+    """
+    # Arrange
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', lambda: clock[0])
+    limiter = RequestRateLimiter(50)
+    limiter.record_response(_response(429))
+    start_rate = limiter.rate
+    seconds = 10
+    
+    # Act - each simulated second returns as many successes as the current rate allows
+    for _ in range(seconds):
+        for _ in range(round(limiter.rate)):
+            limiter.record_response(_response(200))
+        clock[0] += 1
+    
+    # Assert
+    assert limiter.rate - start_rate == pytest.approx(RequestRateLimiter.RATE_INCREASE_STEP * seconds, rel=0.1)